@@ -0,0 +1,38 @@
+"""add posts.comment_count and backfill like_count/comment_count
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-01-07 00:00:00.000000
+
+"""
+from alembic import op
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # startup 훅(_ensure_posts_columns)이 먼저 추가했을 수 있으므로 IF NOT EXISTS
+    op.execute("ALTER TABLE posts ADD COLUMN IF NOT EXISTS comment_count INTEGER DEFAULT 0")
+    # 기존 데이터 기준으로 카운터 채우기 (이후로는 쓰기 시점에 증감)
+    op.execute("""
+        UPDATE posts p SET
+            like_count = COALESCE((SELECT COUNT(*) FROM post_likes l WHERE l.post_id = p.id), 0),
+            comment_count = COALESCE((SELECT COUNT(*) FROM comments c WHERE c.post_id = p.id), 0)
+    """)
+    # NULL이면 DESC 정렬 시 앞에 오므로 NOT NULL로 고정
+    op.execute("ALTER TABLE posts ALTER COLUMN like_count SET DEFAULT 0, ALTER COLUMN like_count SET NOT NULL")
+    op.execute("ALTER TABLE posts ALTER COLUMN comment_count SET DEFAULT 0, ALTER COLUMN comment_count SET NOT NULL")
+    # 인기 게시글(타입별 좋아요 순) 조회용
+    op.create_index(
+        'ix_posts_post_type_like_count', 'posts',
+        ['post_type', 'like_count', 'created_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_post_type_like_count', table_name='posts')
+    op.execute("ALTER TABLE posts ALTER COLUMN like_count DROP NOT NULL")
+    op.execute("ALTER TABLE posts DROP COLUMN IF EXISTS comment_count")
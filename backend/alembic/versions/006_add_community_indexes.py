@@ -0,0 +1,57 @@
+"""add composite indexes for community list/detail queries
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-01-08 00:00:00.000000
+
+"""
+from alembic import op
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 001을 stamp만 한 기존 DB(scripts/fix_alembic_and_posts.py)에는 uq_post_likes가 없을 수 있음
+    # → 중복 좋아요 제거 후 제약 추가, 제거된 만큼 like_count 재계산
+    op.execute("""
+        DELETE FROM post_likes a
+        USING post_likes b
+        WHERE a.post_id = b.post_id AND a.user_id = b.user_id AND a.id > b.id
+    """)
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_post_likes') THEN
+                ALTER TABLE post_likes ADD CONSTRAINT uq_post_likes UNIQUE (post_id, user_id);
+            END IF;
+        END $$;
+    """)
+    op.execute("""
+        UPDATE posts p SET like_count = COALESCE((SELECT COUNT(*) FROM post_likes l WHERE l.post_id = p.id), 0)
+        WHERE p.like_count IS DISTINCT FROM COALESCE((SELECT COUNT(*) FROM post_likes l WHERE l.post_id = p.id), 0)
+    """)
+
+    # 게시글 목록 정렬 (고정 먼저, 최신순) - 전체 / 타입별
+    op.create_index('ix_posts_is_pinned_created_at', 'posts', ['is_pinned', 'created_at'], unique=False)
+    op.create_index('ix_posts_post_type_is_pinned_created_at', 'posts', ['post_type', 'is_pinned', 'created_at'], unique=False)
+    # 댓글 목록 / 댓글 멘션 일괄 로드
+    op.create_index('ix_comments_post_id_created_at', 'comments', ['post_id', 'created_at'], unique=False)
+    op.create_index('ix_comment_mentions_comment_id', 'comment_mentions', ['comment_id'], unique=False)
+    # 게시글별 태그/멘션 일괄 로드, 태그 필터
+    op.create_index('ix_post_tags_post_id', 'post_tags', ['post_id'], unique=False)
+    op.create_index('ix_post_tags_tag_id_post_id', 'post_tags', ['tag_id', 'post_id'], unique=False)
+    op.create_index('ix_post_mentions_post_id', 'post_mentions', ['post_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_post_mentions_post_id', table_name='post_mentions')
+    op.drop_index('ix_post_tags_tag_id_post_id', table_name='post_tags')
+    op.drop_index('ix_post_tags_post_id', table_name='post_tags')
+    op.drop_index('ix_comment_mentions_comment_id', table_name='comment_mentions')
+    op.drop_index('ix_comments_post_id_created_at', table_name='comments')
+    op.drop_index('ix_posts_post_type_is_pinned_created_at', table_name='posts')
+    op.drop_index('ix_posts_is_pinned_created_at', table_name='posts')
+    # uq_post_likes는 001에서 생성되는 제약이므로 유지
@@ -0,0 +1,36 @@
+"""posts keyset pagination: NOT NULL sort columns and (…, id) indexes
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-01-09 00:00:00.000000
+
+"""
+from alembic import op
+
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 커서 비교 (is_pinned, created_at, id) < (...) 는 NULL이 있으면 행이 누락되므로 NOT NULL로 고정
+    op.execute("UPDATE posts SET is_pinned = false WHERE is_pinned IS NULL")
+    op.execute("UPDATE posts SET created_at = now() WHERE created_at IS NULL")
+    op.execute("ALTER TABLE posts ALTER COLUMN is_pinned SET DEFAULT false, ALTER COLUMN is_pinned SET NOT NULL")
+    op.execute("ALTER TABLE posts ALTER COLUMN created_at SET NOT NULL")
+
+    # 같은 created_at 내 순서를 id로 고정 (키셋 커서의 마지막 키)
+    op.create_index('ix_posts_is_pinned_created_at_id', 'posts', ['is_pinned', 'created_at', 'id'], unique=False)
+    op.create_index('ix_posts_post_type_is_pinned_created_at_id', 'posts', ['post_type', 'is_pinned', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_posts_post_type_is_pinned_created_at', table_name='posts')
+    op.drop_index('ix_posts_is_pinned_created_at', table_name='posts')
+
+
+def downgrade() -> None:
+    op.create_index('ix_posts_is_pinned_created_at', 'posts', ['is_pinned', 'created_at'], unique=False)
+    op.create_index('ix_posts_post_type_is_pinned_created_at', 'posts', ['post_type', 'is_pinned', 'created_at'], unique=False)
+    op.drop_index('ix_posts_post_type_is_pinned_created_at_id', table_name='posts')
+    op.drop_index('ix_posts_is_pinned_created_at_id', table_name='posts')
+    op.execute("ALTER TABLE posts ALTER COLUMN created_at DROP NOT NULL")
+    op.execute("ALTER TABLE posts ALTER COLUMN is_pinned DROP NOT NULL")
@@ -0,0 +1,43 @@
+"""posts full-text search: Hangul bigram tsvector column + GIN index
+
+Revision ID: 008
+Revises: 007
+Create Date: 2024-01-10 00:00:00.000000
+
+"""
+from alembic import op
+
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 한글 연속 구간을 2글자 단위(bigram)로 나눈 토큰 문자열. 예) '커뮤니티를' -> '커뮤 뮤니 니티 티를'
+    # 조사가 붙은 어절이나 복합어 중간의 단어도 검색되도록 원문 토큰과 함께 색인한다.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION hangul_bigrams(src text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT coalesce(string_agg(substr(m[1], i, 2), ' ' ORDER BY n, i), '')
+            FROM regexp_matches(coalesce(src, ''), '([가-힣]{2,})', 'g') WITH ORDINALITY AS t(m, n),
+                 generate_series(1, char_length(m[1]) - 1) AS i
+        $$
+    """)
+    # 제목(A) > 본문(B) 가중치, 'simple' 설정 (형태소 분석 없이 소문자화만)
+    op.execute("""
+        ALTER TABLE posts ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', hangul_bigrams(title)), 'A') ||
+            setweight(to_tsvector('simple', coalesce(content, '')), 'B') ||
+            setweight(to_tsvector('simple', hangul_bigrams(content)), 'B')
+        ) STORED
+    """)
+    op.execute("CREATE INDEX ix_posts_search_vector ON posts USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_posts_search_vector")
+    op.execute("ALTER TABLE posts DROP COLUMN IF EXISTS search_vector")
+    op.execute("DROP FUNCTION IF EXISTS hangul_bigrams(text)")
@@ -0,0 +1,66 @@
+"""mention_inbox: per-user mention inbox (fan-out on write) with read state
+
+Revision ID: 009
+Revises: 008
+Create Date: 2024-01-11 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'mention_inbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('mentioned_email', sa.String(), nullable=False),
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('comment_id', sa.Integer(), nullable=True),
+        sa.Column('actor_email', sa.String(), nullable=False),
+        sa.Column('actor_name', sa.String(), nullable=True),
+        sa.Column('is_read', sa.Boolean(), nullable=False, server_default='false'),
+        sa.Column('mentioned_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['comment_id'], ['comments.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('mentioned_email', 'post_id', name='uq_mention_inbox_email_post'),
+    )
+    op.create_index(op.f('ix_mention_inbox_id'), 'mention_inbox', ['id'], unique=False)
+    # 알림함 목록 (mentioned_at, id) 키셋 조회용
+    op.create_index(
+        'ix_mention_inbox_email_mentioned_at_id', 'mention_inbox',
+        ['mentioned_email', 'mentioned_at', 'id'], unique=False
+    )
+    # 안 읽은 멘션 수 (안 읽은 행만 색인)
+    op.create_index(
+        'ix_mention_inbox_email_unread', 'mention_inbox',
+        ['mentioned_email'], unique=False, postgresql_where=sa.text('NOT is_read')
+    )
+    # 기존 게시글/댓글 멘션으로 채우기 (게시글당 최신 멘션 하나). 이전 멘션은 읽음으로 두어 알림이 몰리지 않게 한다
+    op.execute("""
+        INSERT INTO mention_inbox (mentioned_email, post_id, comment_id, actor_email, actor_name, is_read, mentioned_at)
+        SELECT DISTINCT ON (m.mentioned_email, m.post_id)
+            m.mentioned_email, m.post_id, m.comment_id, m.actor_email, m.actor_name, true, m.mentioned_at
+        FROM (
+            SELECT pm.mentioned_email, pm.post_id, NULL::integer AS comment_id,
+                   p.author_email AS actor_email, p.author_name AS actor_name, p.created_at AS mentioned_at
+            FROM post_mentions pm JOIN posts p ON p.id = pm.post_id
+            UNION ALL
+            SELECT cm.mentioned_email, c.post_id, c.id,
+                   c.author_email, c.author_name, COALESCE(c.created_at, now())
+            FROM comment_mentions cm JOIN comments c ON c.id = cm.comment_id
+        ) m
+        ORDER BY m.mentioned_email, m.post_id, m.mentioned_at DESC
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_mention_inbox_email_unread', table_name='mention_inbox')
+    op.drop_index('ix_mention_inbox_email_mentioned_at_id', table_name='mention_inbox')
+    op.drop_index(op.f('ix_mention_inbox_id'), table_name='mention_inbox')
+    op.drop_table('mention_inbox')
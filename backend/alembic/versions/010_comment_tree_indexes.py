@@ -0,0 +1,32 @@
+"""comments: indexes for threaded comment tree (top-level keyset, replies by parent)
+
+Revision ID: 010
+Revises: 009
+Create Date: 2024-01-12 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 게시글의 최상위 댓글 (created_at, id) 키셋 페이지
+    op.create_index(
+        'ix_comments_post_id_top_level', 'comments',
+        ['post_id', 'created_at', 'id'], unique=False, postgresql_where=sa.text('parent_id IS NULL')
+    )
+    # 부모 댓글별 답글 (깊이 단위 일괄 조회, 답글 수)
+    op.create_index(
+        'ix_comments_parent_id_created_at_id', 'comments',
+        ['parent_id', 'created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_parent_id_created_at_id', table_name='comments')
+    op.drop_index('ix_comments_post_id_top_level', table_name='comments')
@@ -0,0 +1,33 @@
+"""upload_refs: per-file reference counts for uploaded images
+
+Revision ID: 011
+Revises: 010
+Create Date: 2024-01-13 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    upload_refs = op.create_table(
+        'upload_refs',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    # 기존 posts/banners/workspace_courses/page_sections 참조로 채우기 (이후로는 쓰기 시점에 증감).
+    # URL에서 파일명을 뽑는 규칙(JSON 리스트, URL 디코딩)이 앱과 같아야 하므로 앱 함수를 그대로 쓴다
+    from app.services.uploads import count_upload_refs
+    counts = count_upload_refs(op.get_bind())
+    if counts:
+        op.bulk_insert(upload_refs, [{'name': name, 'ref_count': n} for name, n in sorted(counts.items())])
+
+
+def downgrade() -> None:
+    op.drop_table('upload_refs')
@@ -1,48 +1,50 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
 from app.models.admin import Admin
 from app.schemas.admin import AdminLogin, AdminToken, AdminResponse
 from app.core.security import create_access_token
 from app.core.admin_auth import get_current_admin
 from app.core.config import settings
 from datetime import timedelta
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 @router.post("/login", response_model=AdminToken)
 async def admin_login(
     credentials: AdminLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """관리자 로그인 (username/password)"""
-    print(f"[ADMIN LOGIN] Request received username={credentials.username}")
     
-    admin = db.query(Admin).filter(Admin.username == credentials.username).first()
+    admin = await db.scalar(select(Admin).where(Admin.username == credentials.username))
     
     if not admin:
-        print(f"[ADMIN LOGIN] Admin not found: {credentials.username}")
+        logger.warning("Admin login failed: unknown username", extra={"username": credentials.username})
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
         )
     
     if not admin.is_active:
-        print(f"[ADMIN LOGIN] Inactive account: {credentials.username}")
+        logger.warning("Admin login failed: inactive account", extra={"username": credentials.username})
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Admin account is inactive"
         )
     
     pw_ok = admin.verify_password(credentials.password)
-    print(f"[ADMIN LOGIN] Password verification result: {pw_ok}")
     if not pw_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
         )
     
-    print(f"[ADMIN LOGIN] Success: {credentials.username}")
+    logger.info("Admin logged in", extra={"username": credentials.username})
     # 관리자 JWT 토큰 생성 (role: admin)
     access_token = create_access_token(
         data={"sub": str(admin.id), "role": "admin"},
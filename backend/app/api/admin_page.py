@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
 from app.models.page_section import PageSection
 from app.schemas.page_section import (
     PageSectionCreate,
@@ -8,6 +9,8 @@ from app.schemas.page_section import (
     PageSectionResponse
 )
 from app.core.admin_auth import require_admin_dep
+from app.services import public_cache
+from app.services.uploads import update_upload_refs
 from app.models.admin import Admin
 from typing import List
 
@@ -16,23 +19,25 @@ router = APIRouter(prefix="/admin/page-sections", tags=["admin"])
 @router.get("", response_model=List[PageSectionResponse])
 async def get_page_sections(
     admin: Admin = Depends(require_admin_dep),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """페이지 섹션 목록 조회 (관리자)"""
-    sections = db.query(PageSection).order_by(PageSection.order.asc()).all()
+    sections = (await db.scalars(select(PageSection).order_by(PageSection.order.asc()))).all()
     return sections
 
 @router.post("", response_model=PageSectionResponse)
 async def create_page_section(
     section: PageSectionCreate,
     admin: Admin = Depends(require_admin_dep),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """페이지 섹션 생성 (관리자)"""
     db_section = PageSection(**section.model_dump())
     db.add(db_section)
-    db.commit()
-    db.refresh(db_section)
+    await update_upload_refs(db, None, db_section.data)
+    await db.commit()
+    await public_cache.invalidate(public_cache.PAGE_SECTIONS)
+    await db.refresh(db_section)
     return db_section
 
 @router.put("/{section_id}", response_model=PageSectionResponse)
@@ -40,53 +45,59 @@ async def update_page_section(
     section_id: int,
     section: PageSectionUpdate,
     admin: Admin = Depends(require_admin_dep),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """페이지 섹션 수정 (관리자)"""
-    db_section = db.query(PageSection).filter(PageSection.id == section_id).first()
+    db_section = await db.scalar(select(PageSection).where(PageSection.id == section_id))
     if not db_section:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Page section not found"
         )
     
+    previous_data = db_section.data
     update_data = section.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_section, key, value)
+    await update_upload_refs(db, previous_data, db_section.data)
     
-    db.commit()
-    db.refresh(db_section)
+    await db.commit()
+    await public_cache.invalidate(public_cache.PAGE_SECTIONS)
+    await db.refresh(db_section)
     return db_section
 
 @router.delete("/{section_id}")
 async def delete_page_section(
     section_id: int,
     admin: Admin = Depends(require_admin_dep),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """페이지 섹션 삭제 (관리자)"""
-    db_section = db.query(PageSection).filter(PageSection.id == section_id).first()
+    db_section = await db.scalar(select(PageSection).where(PageSection.id == section_id))
     if not db_section:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Page section not found"
         )
     
-    db.delete(db_section)
-    db.commit()
+    await update_upload_refs(db, db_section.data, None)
+    await db.delete(db_section)
+    await db.commit()
+    await public_cache.invalidate(public_cache.PAGE_SECTIONS)
     return {"message": "Page section deleted successfully"}
 
 @router.post("/reorder")
 async def reorder_sections(
     section_orders: List[dict],  # [{"id": 1, "order": 0}, {"id": 2, "order": 1}, ...]
     admin: Admin = Depends(require_admin_dep),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """페이지 섹션 순서 변경 (관리자)"""
-    for item in section_orders:
-        db_section = db.query(PageSection).filter(PageSection.id == item["id"]).first()
-        if db_section:
-            db_section.order = item["order"]
+    orders = {item["id"]: item["order"] for item in section_orders}
+    sections = (await db.scalars(select(PageSection).where(PageSection.id.in_(orders.keys())))).all()
+    for db_section in sections:
+        db_section.order = orders[db_section.id]
     
-    db.commit()
+    await db.commit()
+    await public_cache.invalidate(public_cache.PAGE_SECTIONS)
     return {"message": "Sections reordered successfully"}
@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
 from app.core.admin_auth import require_admin_dep
 from app.models.admin import Admin
-from typing import List
+from app.services.uploads import (
+    save_upload_blob, resolve_upload_path, upload_file_response, InvalidUploadPathError, UploadTooLargeError
+)
+from app.services.image_variants import get_image_variant, IMMUTABLE_CACHE_CONTROL
+from typing import List, Optional
 import os
-import shutil
 from pathlib import Path
-import time
 
 router = APIRouter(prefix="/admin/upload", tags=["admin"])
 
@@ -28,7 +29,7 @@ def is_allowed_file(filename: str) -> bool:
 async def upload_image(
     file: UploadFile = File(...),
     admin: Admin = Depends(require_admin_dep),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """이미지 파일 업로드 (관리자)"""
     if not file.filename:
@@ -43,51 +44,50 @@ async def upload_image(
             detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
         )
     
-    # 파일 크기 확인
-    file_content = await file.read()
-    file_size = len(file_content)
-    
-    if file_size > MAX_FILE_SIZE:
+    try:
+        # 내용(sha256) 기준 저장: 같은 이미지를 다시 올리면 기존 파일 재사용
+        saved = await save_upload_blob(file, UPLOAD_DIR, Path(file.filename).suffix, MAX_FILE_SIZE)
+    except UploadTooLargeError:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"File size exceeds the limit of {MAX_FILE_SIZE_MB}MB"
         )
-    
-    # 파일 포인터를 처음으로 되돌림
-    await file.seek(0)
-    
-    # 타임스탬프를 사용하여 고유한 파일명 생성
-    timestamp = int(time.time() * 1000)
-    ext = Path(file.filename).suffix.lower()
-    safe_filename = f"{timestamp}_{file.filename}"
-    file_path = UPLOAD_DIR / safe_filename
-    
-    try:
-        # 파일 저장
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # URL 반환 (프론트엔드에서 사용할 수 있도록)
-        file_url = f"/admin/upload/image/{safe_filename}"
-        return {"url": file_url, "filename": safe_filename}
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save file: {str(e)}"
         )
+    
+    # URL 반환 (프론트엔드에서 사용할 수 있도록)
+    safe_filename = saved.path.name
+    file_url = f"/admin/upload/image/{safe_filename}"
+    return {"url": file_url, "filename": safe_filename}
 
 @router.get("/image/{filename:path}")
-async def get_image(filename: str):
-    """업로드된 이미지 조회"""
+async def get_image(
+    filename: str,
+    request: Request,
+    w: Optional[int] = Query(None, ge=1, le=4096, description="Resize to this width (snapped to a preset)")
+):
+    """업로드된 이미지 조회 (w 지정 시 축소 변형 제공)"""
     from urllib.parse import unquote
     # URL 디코딩 (한글 파일명 등 처리)
     decoded_filename = unquote(filename)
-    file_path = UPLOAD_DIR / decoded_filename
-    
-    if not file_path.exists():
+    try:
+        file_path = resolve_upload_path(UPLOAD_DIR, decoded_filename)
+    except InvalidUploadPathError:
+        file_path = None
+
+    # 업로드 루트 밖(../ 등)은 변형을 만들기 전에 404
+    if file_path is None or not file_path.is_file():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found"
         )
     
-    return FileResponse(file_path)
+    served = await get_image_variant(file_path, w, request.headers.get("accept"))
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if w:
+        headers["Vary"] = "Accept"
+    # 조회만 하고 전송은 nginx에 위임 (설정 시)
+    return upload_file_response(request, UPLOAD_DIR, served, headers=headers)
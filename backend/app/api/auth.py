@@ -1,14 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
 from authlib.integrations.starlette_client import OAuth
 from starlette.config import Config
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.models.user import User
 from app.models.oauth_state import OAuthState
 from app.schemas.user import Token, UserResponse
 from app.core.security import create_access_token
 from app.core.config import settings
+from app.services.google_api import invalidate_user_access_token
+from app.services.http_client import get_http_client
+from app.services.user_directory import invalidate_user_directory
 from app.core.validation import (
     validate_oauth_code,
     validate_state,
@@ -18,8 +22,9 @@ from app.core.validation import (
 )
 from datetime import timedelta
 from typing import Optional
-import httpx
-import traceback
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -45,7 +50,7 @@ async def login(
     request: Request, 
     email: Optional[str] = Query(None, description="User email to check for existing refresh token"),
     force_consent: bool = Query(False, description="Force consent screen to re-grant Classroom/Drive scopes"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Google OAuth 로그인 시작"""
     if not settings.GOOGLE_CLIENT_ID or not settings.GOOGLE_CLIENT_SECRET:
@@ -76,11 +81,10 @@ async def login(
     try:
         oauth_state = OAuthState(state=state)
         db.add(oauth_state)
-        db.commit()
-        print(f"[AUTH] State saved to database: {state}")
-    except Exception as e:
-        db.rollback()
-        print(f"[AUTH] Failed to save state to database: {e}")
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        logger.exception("Failed to save OAuth state")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to initialize login"
@@ -92,12 +96,12 @@ async def login(
     has_refresh_token = False
     if email:
         try:
-            user = db.query(User).filter(User.email == email).first()
+            user = await db.scalar(select(User).where(User.email == email))
             if user and user.google_refresh_token:
                 has_refresh_token = True
-                print(f"[AUTH] User {email} already has refresh_token, skipping consent prompt")
+                logger.debug("User already has refresh_token, skipping consent prompt", extra={"email": email})
         except Exception as e:
-            print(f"[AUTH] Error checking user refresh_token: {e}")
+            logger.warning("Error checking user refresh_token: %s", e)
     
     # prompt 파라미터 설정
     # - force_consent=true: 권한 재요청 (Classroom/Drive 403 시 새 scope로 refresh_token 갱신)
@@ -105,7 +109,7 @@ async def login(
     # - refresh_token이 없으면: select_account만 사용
     if force_consent:
         prompt_param = "prompt=consent&"
-        print(f"[AUTH] force_consent=true, will show consent screen for Classroom/Drive scopes")
+        logger.info("force_consent=true, showing consent screen for Classroom/Drive scopes")
     elif has_refresh_token:
         prompt_param = ""
     else:
@@ -122,7 +126,7 @@ async def login(
         f"state={state}"
     )
     
-    print(f"[AUTH] Generated OAuth URL with {'no prompt (auto login)' if has_refresh_token else 'prompt=select_account'} and access_type=offline")
+    logger.debug("Redirecting to Google OAuth", extra={"prompt": prompt_param.strip("&") or "none"})
     return RedirectResponse(url=auth_url)
 
 @router.get("/callback")
@@ -131,7 +135,7 @@ async def callback(
     code: Optional[str] = Query(None, description="OAuth authorization code from Google"),
     state: Optional[str] = Query(None, description="CSRF state"),
     error: Optional[str] = Query(None, description="OAuth error if user denied"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Google OAuth 콜백 처리 (보안 강화)"""
     frontend_base = settings.FRONTEND_URL.rstrip('/')
@@ -139,7 +143,7 @@ async def callback(
         # code 없이 접근한 경우 또는 OAuth 거부 → 프론트 홈으로
         url = f"{frontend_base}/?error={error}" if error else f"{frontend_base}/"
         return RedirectResponse(url=url)
-    print(f"[AUTH] Callback received - code: {code[:20]}..., state: {state}")
+    logger.info("OAuth callback received")
     
     if not settings.GOOGLE_CLIENT_ID or not settings.GOOGLE_CLIENT_SECRET:
         raise HTTPException(
@@ -149,25 +153,21 @@ async def callback(
     
     # 입력값 검증 (XSS 및 Injection 방지)
     try:
-        print(f"[AUTH] Validating input parameters...")
         code = validate_oauth_code(code)
         if state:
             state = validate_state(state)
-        print(f"[AUTH] Input validation passed")
     except ValueError as e:
-        print(f"[AUTH] Input validation failed: {e}")
-        print(f"[AUTH] Traceback: {traceback.format_exc()}")
+        logger.warning("OAuth callback input validation failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid request parameters"
         )
     
     # CSRF 검증 - 데이터베이스에서 확인
-    print(f"[AUTH] Checking CSRF state in database...")
-    oauth_state = db.query(OAuthState).filter(OAuthState.state == state).first()
+    oauth_state = await db.scalar(select(OAuthState).where(OAuthState.state == state))
     
     if not oauth_state:
-        print(f"[AUTH] CSRF validation failed. State not found in database: {state}")
+        logger.warning("CSRF validation failed: state not found")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid state parameter. Please try logging in again."
@@ -176,46 +176,43 @@ async def callback(
     # 오래된 state 삭제 (5분 이상 된 것)
     from datetime import datetime, timedelta, timezone
     expired_time = datetime.now(timezone.utc) - timedelta(minutes=5)
-    db.query(OAuthState).filter(OAuthState.created_at < expired_time).delete()
+    await db.execute(delete(OAuthState).where(OAuthState.created_at < expired_time))
     
     # state 사용 후 제거 (재사용 방지)
-    db.delete(oauth_state)
-    db.commit()
-    print(f"[AUTH] CSRF validation passed and state removed")
+    await db.delete(oauth_state)
+    await db.commit()
+    logger.debug("CSRF validation passed and state removed")
     
     try:
         # 직접 토큰 교환 (refresh_token을 확실히 받기 위해)
         redirect_uri = settings.GOOGLE_REDIRECT_URI
-        token_url = 'https://oauth2.googleapis.com/token'
+        token_url = settings.GOOGLE_TOKEN_URL
         
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
-                token_url,
-                data={
-                    'code': code,
-                    'client_id': settings.GOOGLE_CLIENT_ID,
-                    'client_secret': settings.GOOGLE_CLIENT_SECRET,
-                    'redirect_uri': redirect_uri,
-                    'grant_type': 'authorization_code'
-                }
+        client = get_http_client()
+        token_response = await client.post(
+            token_url,
+            data={
+                'code': code,
+                'client_id': settings.GOOGLE_CLIENT_ID,
+                'client_secret': settings.GOOGLE_CLIENT_SECRET,
+                'redirect_uri': redirect_uri,
+                'grant_type': 'authorization_code'
+            }
+        )
+        
+        if token_response.status_code != 200:
+            logger.warning("Token exchange failed", extra={"status_code": token_response.status_code, "body": token_response.text[:500]})
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Token exchange failed: {token_response.text}"
             )
-            
-            if token_response.status_code != 200:
-                print(f"[AUTH] Token exchange failed: {token_response.status_code} - {token_response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Token exchange failed: {token_response.text}"
-                )
-            
-            token_data = token_response.json()
-            print(f"[AUTH] Token exchange response keys: {list(token_data.keys())}")
-            print(f"[AUTH] Refresh token present: {'refresh_token' in token_data}")
+        
+        token_data = token_response.json()
         
         access_token = token_data.get('access_token')
         refresh_token = token_data.get('refresh_token')
         
-        print(f"[AUTH] Access token: {'present' if access_token else 'NOT PRESENT'}")
-        print(f"[AUTH] Refresh token: {'present' if refresh_token else 'NOT PRESENT'}")
+        logger.debug("Token exchange succeeded", extra={"has_access_token": bool(access_token), "has_refresh_token": bool(refresh_token)})
         
         if not access_token:
             raise HTTPException(
@@ -224,7 +221,6 @@ async def callback(
             )
         
         # 사용자 정보 가져오기 (id_token에서 먼저 시도, 없으면 userinfo API 사용)
-        print(f"[AUTH] Fetching user info from Google...")
         
         # id_token에서 사용자 정보 추출 시도
         google_id = None
@@ -250,59 +246,50 @@ async def callback(
                     # base64 디코딩
                     decoded = base64.urlsafe_b64decode(payload_part)
                     id_token_payload = json.loads(decoded)
-                    print(f"[AUTH] Decoded id_token payload keys: {list(id_token_payload.keys())}")
                     
                     google_id = id_token_payload.get('sub')
                     email = id_token_payload.get('email')
                     name = id_token_payload.get('name', '')
                     picture = id_token_payload.get('picture')
-                    print(f"[AUTH] User info from id_token: google_id={google_id}, email={email}")
             except Exception as e:
-                print(f"[AUTH] Failed to decode id_token: {e}")
+                logger.warning("Failed to decode id_token, falling back to userinfo API: %s", e)
         
         # id_token에서 정보를 못 가져왔으면 userinfo API 사용
         if not google_id or not email:
-            print(f"[AUTH] Fetching from userinfo API...")
-            async with httpx.AsyncClient() as client:
-                user_info_response = await client.get(
-                    'https://www.googleapis.com/oauth2/v3/userinfo',
-                    headers={'Authorization': f"Bearer {access_token}"}
+            client = get_http_client()
+            user_info_response = await client.get(
+                'https://www.googleapis.com/oauth2/v3/userinfo',
+                headers={'Authorization': f"Bearer {access_token}"}
+            )
+            if user_info_response.status_code != 200:
+                logger.warning("Failed to get user info", extra={"status_code": user_info_response.status_code, "body": user_info_response.text[:500]})
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Failed to get user information from Google"
                 )
-                if user_info_response.status_code != 200:
-                    print(f"[AUTH] Failed to get user info: {user_info_response.status_code} - {user_info_response.text}")
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Failed to get user information from Google"
-                    )
-                user_info = user_info_response.json()
-                print(f"[AUTH] User info API response keys: {list(user_info.keys())}")
-                print(f"[AUTH] User info API response: {user_info}")
-                
-                # userinfo API에서 가져오기
-                google_id = user_info.get('sub') or user_info.get('id')
-                email = user_info.get('email')
-                name = user_info.get('name', '')
-                picture = user_info.get('picture')
-                print(f"[AUTH] User info from API: google_id={google_id}, email={email}")
+            user_info = user_info_response.json()
+            
+            # userinfo API에서 가져오기
+            google_id = user_info.get('sub') or user_info.get('id')
+            email = user_info.get('email')
+            name = user_info.get('name', '')
+            picture = user_info.get('picture')
         
         if not google_id or not email:
-            print(f"[AUTH] Missing user info: google_id={google_id}, email={email}")
+            logger.warning("Missing user info from Google", extra={"has_google_id": bool(google_id), "has_email": bool(email)})
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Failed to get user information from Google"
             )
         
         # 입력값 검증 및 정리 (XSS 방지)
-        print(f"[AUTH] Validating user data...")
         try:
             google_id = validate_google_id(google_id)
             email = validate_email(email)
             name = sanitize_string(name, max_length=255) if name else ''
             picture = sanitize_string(picture, max_length=500) if picture else None
-            print(f"[AUTH] User data validation passed")
         except ValueError as e:
-            print(f"[AUTH] User data validation failed: {e}")
-            print(f"[AUTH] Traceback: {traceback.format_exc()}")
+            logger.warning("User data validation failed: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid user data received from Google"
@@ -311,11 +298,9 @@ async def callback(
         # Refresh token은 이미 위에서 가져옴
         
         # 사용자 조회 또는 생성 (SQL Injection 방지: SQLAlchemy ORM 사용)
-        print(f"[AUTH] Saving user to database...")
         try:
-            user = db.query(User).filter(User.google_id == google_id).first()
+            user = await db.scalar(select(User).where(User.google_id == google_id))
             if not user:
-                print(f"[AUTH] Creating new user: {email}")
                 user = User(
                     google_id=google_id,
                     email=email,
@@ -324,49 +309,44 @@ async def callback(
                     google_refresh_token=refresh_token
                 )
                 db.add(user)
-                db.commit()
-                db.refresh(user)
-                print(f"[AUTH] New user created with refresh_token: {'YES' if user.google_refresh_token else 'NO'}")
+                await db.commit()
+                await db.refresh(user)
+                invalidate_user_directory()
+                logger.info("New user created", extra={"user_id": user.id, "has_refresh_token": bool(user.google_refresh_token)})
             else:
-                print(f"[AUTH] Updating existing user: {email}")
-                print(f"[AUTH] Existing refresh_token: {'YES' if user.google_refresh_token else 'NO'}")
                 # 정보 업데이트
+                directory_changed = (user.email, user.name) != (email, name)
                 user.email = email
                 user.name = name
                 user.picture = picture
                 # refresh_token이 있으면 업데이트 (없으면 기존 것 유지)
                 if refresh_token:
-                    print(f"[AUTH] Updating refresh_token")
                     user.google_refresh_token = refresh_token
-                else:
-                    print(f"[AUTH] No refresh_token in response, keeping existing one if available")
-                db.commit()
-                db.refresh(user)
-                print(f"[AUTH] User updated, refresh_token: {'YES' if user.google_refresh_token else 'NO'}")
-        except Exception as db_error:
-            db.rollback()
-            print(f"[AUTH] Database error: {db_error}")
-            print(f"[AUTH] Error type: {type(db_error).__name__}")
-            print(f"[AUTH] Traceback: {traceback.format_exc()}")
+                    invalidate_user_access_token(user.id)
+                await db.commit()
+                await db.refresh(user)
+                if directory_changed:
+                    invalidate_user_directory()
+                logger.info("User logged in", extra={"user_id": user.id, "refresh_token_updated": bool(refresh_token), "has_refresh_token": bool(user.google_refresh_token)})
+        except Exception:
+            await db.rollback()
+            logger.exception("Failed to save user")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to save user information"
             )
         
         # JWT 토큰 생성
-        print(f"[AUTH] Creating JWT token...")
         access_token = create_access_token(
             data={"sub": str(user.id), "email": user.email},
             expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         )
-        print(f"[AUTH] JWT token created successfully")
         
         # 프론트엔드로 리다이렉트 (토큰 포함)
         # /auth/callback 대신 /?token= 사용: nginx가 /auth/* 를 백엔드로 보내서
         # /auth/callback?token= 이 다시 백엔드에 도달해 토큰이 유실되는 문제 방지
         frontend_base = settings.FRONTEND_URL.rstrip("/")
         frontend_url = f"{frontend_base}/?token={access_token}"
-        print(f"[AUTH] Redirecting to frontend...")
         return RedirectResponse(url=frontend_url)
         
     except HTTPException:
@@ -376,8 +356,7 @@ async def callback(
         # 상세한 에러 로깅 (서버 로그에만 기록)
         error_type = type(e).__name__
         error_message = str(e) if str(e) else "Unknown error"
-        print(f"[AUTH] Authentication error: {error_type}: {error_message}")
-        print(f"[AUTH] Traceback: {traceback.format_exc()}")
+        logger.exception("Authentication error: %s: %s", error_type, error_message)
         
         # 클라이언트에는 일반적인 메시지만 전달 (보안: 민감한 정보 노출 방지)
         raise HTTPException(
@@ -388,7 +367,7 @@ async def callback(
 @router.get("/me", response_model=UserResponse)
 async def get_current_user(
     token: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """현재 사용자 정보 조회 (보안 강화)"""
     from app.core.security import verify_token
@@ -416,7 +395,7 @@ async def get_current_user(
             raise ValueError("Invalid user ID")
         
         # SQLAlchemy ORM 사용 (SQL Injection 방지)
-        user = db.query(User).filter(User.id == user_id_int).first()
+        user = await db.scalar(select(User).where(User.id == user_id_int))
         
         if not user:
             raise HTTPException(
@@ -430,8 +409,8 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
-    except Exception as e:
-        print(f"[AUTH] Error getting user: {e}")
+    except Exception:
+        logger.exception("Error getting user")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve user information"
@@ -1,20 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
 from app.models.user import User
 from app.core.security import verify_token
 from app.core.validation import sanitize_string
 from app.services.google_api import (
-    get_access_token_from_refresh,
+    get_user_access_token,
+    call_with_user_access_token,
+    GoogleUnauthorizedError,
     get_google_classroom_courses,
     get_google_classroom_coursework
 )
 from typing import List, Dict, Any
 import re
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/classroom", tags=["classroom"])
 
-def get_current_user_from_token(token: str, db: Session) -> User:
+async def get_current_user_from_token(token: str, db: AsyncSession) -> User:
     """토큰에서 현재 사용자 가져오기 (보안 강화)"""
     payload = verify_token(token)
     if not payload:
@@ -37,7 +43,7 @@ def get_current_user_from_token(token: str, db: Session) -> User:
             raise ValueError("Invalid user ID")
         
         # SQLAlchemy ORM 사용 (SQL Injection 방지)
-        user = db.query(User).filter(User.id == user_id_int).first()
+        user = await db.scalar(select(User).where(User.id == user_id_int))
         
         if not user:
             raise HTTPException(
@@ -55,15 +61,13 @@ def get_current_user_from_token(token: str, db: Session) -> User:
 @router.get("/courses", response_model=List[Dict[str, Any]])
 async def get_courses(
     token: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Google Classroom 코스 목록 가져오기 (내가 수강 중인 클래스)"""
-    user = get_current_user_from_token(token, db)
-    
-    print(f"[CLASSROOM] Getting courses for user: {user.email} (ID: {user.id})")
+    user = await get_current_user_from_token(token, db)
     
     if not user.google_refresh_token:
-        print(f"[CLASSROOM] No refresh token found for user {user.email}")
+        logger.info("No refresh token, re-authentication required", extra={"user_id": user.id})
         # refresh_token이 없으면 에러 반환 (재인증 필요)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -71,30 +75,30 @@ async def get_courses(
         )
     
     # Access token 가져오기
-    print(f"[CLASSROOM] Getting access token from refresh token...")
-    access_token = await get_access_token_from_refresh(user.google_refresh_token)
+    access_token = await get_user_access_token(user.id, user.google_refresh_token)
     if not access_token:
-        print(f"[CLASSROOM] Failed to get access token from refresh token")
+        logger.warning("Failed to get access token from refresh token", extra={"user_id": user.id})
         # access token을 가져올 수 없으면 에러 반환 (재인증 필요)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Failed to get access token. Please re-authenticate to grant Classroom API permissions."
         )
     
-    print(f"[CLASSROOM] Successfully obtained access token")
-    
     # 코스 목록 가져오기
     try:
-        print(f"[CLASSROOM] Calling Google Classroom API...")
-        courses = await get_google_classroom_courses(access_token)
-        print(f"[CLASSROOM] Google Classroom API returned {len(courses)} courses")
-        if courses:
-            print(f"[CLASSROOM] Course names: {[c.get('name', 'N/A') for c in courses[:3]]}")
+        courses = await call_with_user_access_token(
+            user.id, user.google_refresh_token, access_token, get_google_classroom_courses
+        )
+        logger.debug("Google Classroom API returned %d courses", len(courses), extra={"user_id": user.id})
         return courses
+    except GoogleUnauthorizedError:
+        # 새로 교환한 토큰도 거부됨 (권한 철회 등)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Google rejected the access token. Please re-authenticate to grant Classroom API permissions."
+        )
     except Exception as e:
-        print(f"[CLASSROOM] Error fetching Google Classroom courses: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error fetching Google Classroom courses", extra={"user_id": user.id})
         # Google Classroom API 권한이 없는 경우 (403 에러 등)
         error_msg = str(e)
         if "403" in error_msg or "Forbidden" in error_msg or "permission" in error_msg.lower():
@@ -106,13 +110,13 @@ async def get_courses(
         return []
 
 @router.get("/workspace-courses", response_model=List[Dict[str, Any]])
-async def get_workspace_courses(db: Session = Depends(get_db)):
+async def get_workspace_courses(db: AsyncSession = Depends(get_async_db)):
     """워크스페이스 클래스 목록 가져오기 (공개 API)"""
     from app.models.workspace_course import WorkspaceCourse
     
-    courses = db.query(WorkspaceCourse).filter(
+    courses = (await db.scalars(select(WorkspaceCourse).where(
         WorkspaceCourse.is_active == True
-    ).order_by(WorkspaceCourse.order.asc()).all()
+    ).order_by(WorkspaceCourse.order.asc()))).all()
     
     # Course 인터페이스에 맞게 변환
     return [
@@ -133,7 +137,7 @@ async def get_workspace_courses(db: Session = Depends(get_db)):
 async def get_coursework(
     course_id: str,
     token: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """특정 코스의 과제 목록 가져오기 (보안 강화)"""
     # course_id 검증 (SQL Injection 및 XSS 방지)
@@ -156,7 +160,7 @@ async def get_coursework(
             detail="Course ID is too long"
         )
     
-    user = get_current_user_from_token(token, db)
+    user = await get_current_user_from_token(token, db)
     
     if not user.google_refresh_token:
         raise HTTPException(
@@ -165,7 +169,7 @@ async def get_coursework(
         )
     
     # Access token 가져오기
-    access_token = await get_access_token_from_refresh(user.google_refresh_token)
+    access_token = await get_user_access_token(user.id, user.google_refresh_token)
     if not access_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -173,5 +177,14 @@ async def get_coursework(
         )
     
     # 과제 목록 가져오기
-    coursework = await get_google_classroom_coursework(course_id, access_token)
+    try:
+        coursework = await call_with_user_access_token(
+            user.id, user.google_refresh_token, access_token,
+            lambda t: get_google_classroom_coursework(course_id, t)
+        )
+    except GoogleUnauthorizedError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Google rejected the access token. Please re-authenticate."
+        )
     return coursework
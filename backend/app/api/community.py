@@ -1,25 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func, desc
-from app.db.database import get_db
-from app.models.post import Post, Comment, Tag, PostTag, PostMention, CommentMention
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Request
+from sqlalchemy import or_, func, desc, select, delete, insert, update, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from app.db.database import get_async_db
+from app.models.post import Post, Comment, Tag, PostTag, PostMention, CommentMention, MentionInbox, PostLike
 from app.models.user import User
 from app.schemas.post import (
     PostCreate, PostUpdate, PostResponse, PostListResponse,
-    CommentCreate, CommentUpdate, CommentResponse
+    CommentCreate, CommentUpdate, CommentResponse, CommentTreeNode, CommentTreeResponse,
+    MentionedPostListResponse, MentionReadRequest, MentionUnreadCountResponse
 )
+from app.core.config import settings
 from app.core.security import verify_token
-from typing import List, Optional
+from app.services.view_counter import record_view, pending_views
+from app.services import public_cache
+from app.services.uploads import update_upload_refs
+from app.services.user_directory import MentionTarget, resolve_mentions
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 import re
-import traceback
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/community", tags=["community"])
 
+# 좋아요 토글 (한 문장, 한 번의 왕복): 좋아요가 있으면 지우고, 없으면 넣고, posts.like_count를 같은 문장에서 증감.
+# 같은 사용자의 동시 토글은 uq_post_likes 인덱스에서 직렬화되고(ON CONFLICT면 이미 좋아요 상태),
+# 다른 사용자의 토글은 posts 행 잠금에서 직렬화되므로 like_count는 항상 post_likes 행 수와 같다.
+# 게시글이 없으면 행이 반환되지 않는다.
+_TOGGLE_LIKE_SQL = text("""
+    WITH removed AS (
+        DELETE FROM post_likes
+        WHERE post_id = :post_id AND user_id = :user_id
+        RETURNING 1
+    ), added AS (
+        INSERT INTO post_likes (post_id, user_id, created_at)
+        SELECT p.id, :user_id, now() FROM posts p
+        WHERE p.id = :post_id AND NOT EXISTS (SELECT 1 FROM removed)
+        ON CONFLICT ON CONSTRAINT uq_post_likes DO NOTHING
+        RETURNING 1
+    )
+    UPDATE posts
+    SET like_count = GREATEST(
+        like_count + (SELECT count(*) FROM added) - (SELECT count(*) FROM removed), 0
+    )
+    WHERE id = :post_id
+    RETURNING NOT EXISTS (SELECT 1 FROM removed) AS liked, like_count
+""")
+
 def extract_mentions(text: str) -> List[str]:
     """텍스트에서 @mention 패턴 추출 (이메일 형식 및 사용자 이름 형식)"""
     # 입력 검증 (SQL Injection 방지)
@@ -124,6 +156,316 @@ def _image_sizes_for_response(url_count: int, raw_sizes: Optional[str]) -> List[
     return parsed[:url_count]
 
 
+_HANGUL_WORD = re.compile(r'^[가-힣]+$')
+SEARCH_SNIPPET_LENGTH = 160
+
+
+def _search_terms(search: str) -> List[str]:
+    """검색어를 단어 단위로 정리 (영문/숫자/한글과 . _ @ - 만 유지, 최대 10단어, 200자)"""
+    terms = []
+    for raw in re.findall(r'[\w.@-]+', search.strip()[:200].lower()):
+        term = raw.strip('._@-')
+        if term and term not in terms:
+            terms.append(term)
+    return terms[:10]
+
+
+def _ts_lexeme(word: str) -> str:
+    return "'" + word.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def _build_search_tsquery(terms: List[str]) -> Optional[str]:
+    """to_tsquery('simple', ...)용 문자열. 단어마다 접두어 매칭, 한글 단어는 2-gram 연속 구문도 허용 (모든 단어 AND)"""
+    parts = []
+    for term in terms:
+        alternatives = [f"{_ts_lexeme(term)}:*"]
+        if len(term) >= 2 and _HANGUL_WORD.match(term):
+            bigrams = [term[i:i + 2] for i in range(len(term) - 1)]
+            alternatives.append(" <-> ".join(_ts_lexeme(g) for g in bigrams))
+        parts.append("(" + " | ".join(alternatives) + ")")
+    return " & ".join(parts) or None
+
+
+def _search_snippet(content: str, terms: List[str]) -> str:
+    """본문에서 첫 매칭 위치 주변을 잘라 검색어를 <mark>로 감싼 HTML 조각 반환 (본문은 이스케이프)"""
+    import html
+    content = content or ""
+    pattern = re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    first = pattern.search(content)
+    start = max(0, first.start() - SEARCH_SNIPPET_LENGTH // 4) if first else 0
+    end = min(len(content), start + SEARCH_SNIPPET_LENGTH)
+    window = content[start:end]
+
+    out = []
+    pos = 0
+    for m in pattern.finditer(window):
+        out.append(html.escape(window[pos:m.start()]))
+        out.append(f"<mark>{html.escape(m.group(0))}</mark>")
+        pos = m.end()
+    out.append(html.escape(window[pos:]))
+    return ("…" if start > 0 else "") + "".join(out) + ("…" if end < len(content) else "")
+
+
+def _attach_search_snippets(post_responses: List[PostResponse], terms: List[str]) -> None:
+    if not terms:
+        return
+    for response in post_responses:
+        response.search_snippet = _search_snippet(response.content, terms)
+
+
+def _encode_post_cursor(post: Post) -> str:
+    """게시글 목록 키셋 커서 (is_pinned, created_at, id)를 불투명 문자열로 인코딩"""
+    import base64
+    import json
+    raw = json.dumps([bool(post.is_pinned), post.created_at.isoformat(), post.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_post_cursor(cursor: str) -> tuple:
+    """_encode_post_cursor의 역변환. 형식이 잘못되면 400"""
+    import base64
+    import json
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        is_pinned, created_at, post_id = json.loads(raw)
+        return bool(is_pinned), datetime.fromisoformat(created_at), int(post_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _encode_keyset_cursor(timestamp: datetime, row_id: int) -> str:
+    """(시각, id) 키셋 커서를 불투명 문자열로 인코딩 (멘션 알림함, 댓글 트리)"""
+    import base64
+    import json
+    raw = json.dumps([timestamp.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_keyset_cursor(cursor: str) -> tuple:
+    """_encode_keyset_cursor의 역변환. 형식이 잘못되면 400"""
+    import base64
+    import json
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+async def _estimate_count(db: AsyncSession, query) -> int:
+    """COUNT(*) 대신 플래너 추정 행 수 반환 (EXPLAIN, 테이블 크기와 무관하게 일정 비용)"""
+    from sqlalchemy.dialects import postgresql
+    compiled = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    plan = (await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))).scalar()
+    if isinstance(plan, str):
+        import json
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _client_ip_key(request: Request) -> Optional[str]:
+    """조회자 식별용 클라이언트 IP (nginx가 설정하는 X-Real-IP 우선, 없으면 X-Forwarded-For 첫 항목)"""
+    real_ip = request.headers.get("x-real-ip")
+    if real_ip:
+        return "ip:" + real_ip.strip()
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        return "ip:" + forwarded.split(",")[0].strip()
+    return f"ip:{request.client.host}" if request.client else None
+
+
+def _get_optional_user_id(token: Optional[str]) -> Optional[int]:
+    """토큰이 있으면 사용자 ID 반환 (없거나 유효하지 않으면 None)"""
+    if not token:
+        return None
+    try:
+        payload = verify_token(token)
+        if payload:
+            user_id = payload.get("sub")
+            if user_id:
+                return int(user_id)
+    except (ValueError, TypeError):
+        pass
+    return None
+
+
+async def _hydrate_posts(db: AsyncSession, posts: List[Post], current_user_id: Optional[int] = None) -> List[PostResponse]:
+    """게시글 목록을 PostResponse로 변환.
+    댓글 수/좋아요 수는 posts의 카운터 컬럼을 사용하고, 현재 사용자 좋아요 여부, 태그, 멘션은
+    게시글 수와 무관하게 고정 개수의 쿼리로 일괄 로드 (N+1 방지)
+    """
+    if not posts:
+        return []
+    post_ids = [p.id for p in posts]
+
+    liked_ids = set()
+    if current_user_id:
+        liked_ids = set((await db.scalars(
+            select(PostLike.post_id).where(
+                PostLike.post_id.in_(post_ids),
+                PostLike.user_id == current_user_id
+            )
+        )).all())
+
+    tags_by_post = {pid: [] for pid in post_ids}
+    tag_rows = (await db.execute(
+        select(PostTag.post_id, Tag.id, Tag.name)
+        .join(Tag, Tag.id == PostTag.tag_id)
+        .where(PostTag.post_id.in_(post_ids))
+        .order_by(PostTag.id)
+    )).all()
+    for post_id, tag_id, tag_name in tag_rows:
+        tags_by_post[post_id].append({"id": tag_id, "name": tag_name})
+
+    mentions_by_post = {pid: [] for pid in post_ids}
+    mention_rows = (await db.execute(
+        select(PostMention.post_id, PostMention.mentioned_email, PostMention.mentioned_name)
+        .where(PostMention.post_id.in_(post_ids))
+        .order_by(PostMention.id)
+    )).all()
+    for post_id, email, name in mention_rows:
+        mentions_by_post[post_id].append({"mentioned_email": email, "mentioned_name": name})
+
+    post_responses = []
+    for post in posts:
+        # Notice 타입인 경우 작성자명을 'Global Partnership Center'로 표시
+        author_name = post.author_name
+        if post.post_type == "notice":
+            author_name = "Global Partnership Center"
+
+        img_urls = _parse_image_urls(post.image_url)
+        img_sizes = _image_sizes_for_response(len(img_urls), getattr(post, "image_sizes", None)) if img_urls else None
+        post_dict = {
+            "id": post.id,
+            "post_type": post.post_type,
+            "title": post.title,
+            "content": post.content,
+            "author_email": post.author_email,
+            "author_name": author_name,
+            "is_pinned": post.is_pinned,
+            "view_count": post.view_count,
+            "image_url": img_urls[0] if img_urls else post.image_url,
+            "image_urls": img_urls if img_urls else None,
+            "image_sizes": img_sizes,
+            "like_count": post.like_count or 0,
+            "is_liked": post.id in liked_ids,
+            "is_resolved": bool(getattr(post, 'is_resolved', False)),
+            "created_at": post.created_at,
+            "updated_at": post.updated_at,
+            "comment_count": post.comment_count or 0,
+            "tags": tags_by_post[post.id],
+            "mentions": mentions_by_post[post.id]
+        }
+        post_responses.append(PostResponse(**post_dict))
+    return post_responses
+
+
+async def _hydrate_comments(db: AsyncSession, comments: List[Comment]) -> List[CommentResponse]:
+    """댓글 목록을 CommentResponse로 변환 (멘션은 한 번의 쿼리로 일괄 로드)"""
+    if not comments:
+        return []
+    mentions_by_comment = {c.id: [] for c in comments}
+    mention_rows = (await db.execute(
+        select(CommentMention.comment_id, CommentMention.mentioned_email, CommentMention.mentioned_name)
+        .where(CommentMention.comment_id.in_(mentions_by_comment.keys()))
+        .order_by(CommentMention.id)
+    )).all()
+    for comment_id, email, name in mention_rows:
+        mentions_by_comment[comment_id].append({"mentioned_email": email, "mentioned_name": name})
+
+    return [
+        CommentResponse(
+            id=c.id,
+            post_id=c.post_id,
+            content=c.content,
+            author_email=c.author_email,
+            author_name=c.author_name,
+            parent_id=c.parent_id,
+            created_at=c.created_at,
+            updated_at=c.updated_at,
+            mentions=mentions_by_comment[c.id]
+        )
+        for c in comments
+    ]
+
+
+async def _load_comment_tree(
+    db: AsyncSession,
+    roots_filter,
+    limit: int,
+    cursor: Optional[str],
+    depth: int,
+    max_replies: int,
+) -> tuple:
+    """roots_filter에 맞는 댓글을 (created_at, id) 순으로 limit개 읽고 답글 트리를 붙여 반환 (노드 목록, next_cursor).
+    답글은 깊이마다 한 번의 쿼리로 부모당 max_replies개까지, depth 단계까지만 펼치고
+    멘션은 _hydrate_comments에서 한 번에 로드한다. 댓글 수와 무관하게 쿼리 수는 depth + 4개 이하."""
+    query = select(Comment).where(roots_filter)
+    if cursor:
+        created_at, last_id = _decode_keyset_cursor(cursor)
+        query = query.where(tuple_(Comment.created_at, Comment.id) > tuple_(created_at, last_id))
+    roots = (await db.scalars(query.order_by(Comment.created_at, Comment.id).limit(limit + 1))).all()
+    next_cursor = _encode_keyset_cursor(roots[limit - 1].created_at, roots[limit - 1].id) if len(roots) > limit else None
+    roots = roots[:limit]
+
+    loaded: List[Comment] = list(roots)
+    children: Dict[int, List[Comment]] = {}
+    reply_counts: Dict[int, int] = {}
+    level = [c.id for c in roots]
+    for _ in range(depth if max_replies > 0 else 0):
+        if not level:
+            break
+        # 부모별 앞쪽 max_replies개 답글과 전체 답글 수 (ix_comments_parent_id_created_at_id)
+        ranked = select(
+            Comment,
+            func.row_number().over(partition_by=Comment.parent_id, order_by=(Comment.created_at, Comment.id)).label("rn"),
+            func.count().over(partition_by=Comment.parent_id).label("reply_count"),
+        ).where(Comment.parent_id.in_(level)).subquery()
+        reply = aliased(Comment, ranked)
+        rows = (await db.execute(
+            select(reply, ranked.c.reply_count)
+            .where(ranked.c.rn <= max_replies)
+            .order_by(ranked.c.parent_id, ranked.c.rn)
+        )).all()
+        level = []
+        for comment, reply_count in rows:
+            children.setdefault(comment.parent_id, []).append(comment)
+            reply_counts[comment.parent_id] = reply_count
+            loaded.append(comment)
+            level.append(comment.id)
+    if level:
+        # 펼치지 않은 마지막 깊이는 답글 수만
+        reply_counts.update((await db.execute(
+            select(Comment.parent_id, func.count())
+            .where(Comment.parent_id.in_(level))
+            .group_by(Comment.parent_id)
+        )).all())
+
+    responses = {r.id: r for r in await _hydrate_comments(db, loaded)}
+
+    def build(comment: Comment) -> CommentTreeNode:
+        replies = children.get(comment.id, [])
+        reply_count = reply_counts.get(comment.id, 0)
+        return CommentTreeNode(
+            **responses[comment.id].model_dump(),
+            reply_count=reply_count,
+            replies=[build(r) for r in replies],
+            replies_cursor=(
+                _encode_keyset_cursor(replies[-1].created_at, replies[-1].id)
+                if replies and reply_count > len(replies) else None
+            ),
+        )
+
+    return [build(c) for c in roots], next_cursor
+
+
 def _get_community_upload_dir() -> Path:
     """Docker에서는 /app/uploads/community, 로컬에서는 프로젝트/uploads/community 사용"""
     import os
@@ -136,45 +478,172 @@ def _get_community_upload_dir() -> Path:
     return project_root / "uploads" / "community"
 
 
-def _delete_post_image_files(image_url_value: Optional[str]) -> None:
-    """게시글에 연결된 Community 이미지 파일을 디스크에서 삭제 (URL이 /community/image/ 인 경우만)"""
+def _community_image_filenames(image_url_value: Optional[str]) -> List[str]:
+    """image_url 필드에서 Community 업로드 파일명만 추출 (URL이 /community/image/ 인 경우만)"""
     if not image_url_value or not image_url_value.strip():
-        return
-    urls = _parse_image_urls(image_url_value)
-    upload_dir = _get_community_upload_dir()
-    for url in urls:
-        if not url or "/community/image/" not in url:
+        return []
+    filenames = []
+    prefix = "/community/image/"
+    for url in _parse_image_urls(image_url_value):
+        if not url:
             continue
-        try:
-            # URL에서 파일명 추출: /community/image/123_filename.png -> 123_filename.png
-            prefix = "/community/image/"
-            idx = url.rfind(prefix)
-            if idx == -1:
-                continue
-            raw = url[idx + len(prefix):].strip()
-            filename = raw.split("?")[0].strip() if "?" in raw else raw
-            if not filename or ".." in filename or "/" in filename or "\\" in filename:
-                continue
-            path = upload_dir / filename
-            if path.exists() and path.is_file():
-                path.unlink()
-                logger.info("Deleted post image file: %s", path)
-        except Exception as e:
-            logger.warning("Failed to delete post image %s: %s", url, e)
+        # URL에서 파일명 추출: /community/image/{sha256}.png -> {sha256}.png
+        idx = url.rfind(prefix)
+        if idx == -1:
+            continue
+        raw = url[idx + len(prefix):].strip()
+        filename = raw.split("?")[0].strip() if "?" in raw else raw
+        if not filename or ".." in filename or "/" in filename or "\\" in filename:
+            continue
+        filenames.append(filename)
+    return filenames
+
+
+def _is_pinned_notice(post: Post) -> bool:
+    """홈페이지 고정 공지(/public/pinned-notices)에 노출되는 게시글인지"""
+    return bool(post.is_pinned) and post.post_type == "notice"
+
+
+async def _delete_post_image_files(db: AsyncSession, filenames: List[str]) -> None:
+    """게시글에서 빠진 Community 이미지 중 참조 수(upload_refs)가 0이 된 파일만 디스크에서 삭제 (커밋 후 호출)"""
+    if not filenames:
+        return
+    from app.services.uploads import delete_unreferenced_uploads
+    try:
+        for path in await delete_unreferenced_uploads(db, _get_community_upload_dir(), filenames):
+            logger.info("Deleted post image file: %s", path)
+    except Exception as e:
+        logger.warning("Failed to delete post images %s: %s", filenames, e)
+
+
+async def _get_or_create_tag_ids(db: AsyncSession, names: List[str]) -> dict:
+    """태그 이름 -> id. 없는 태그는 한 번의 INSERT ... ON CONFLICT (name) DO NOTHING RETURNING으로 생성.
+    동시에 같은 태그를 만드는 다른 요청이 이기면 RETURNING에 빠지므로 그 이름만 다시 조회한다."""
+    tag_ids = dict((await db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names)))).all())
+    missing = [name for name in names if name not in tag_ids]
+    if missing:
+        inserted = await db.execute(
+            pg_insert(Tag).values([{"name": name} for name in missing])
+            .on_conflict_do_nothing(index_elements=[Tag.name])
+            .returning(Tag.name, Tag.id)
+        )
+        tag_ids.update(inserted.all())
+        lost = [name for name in missing if name not in tag_ids]
+        if lost:
+            tag_ids.update((await db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(lost)))).all())
+    return tag_ids
+
+
+async def _set_post_tags(db: AsyncSession, post_id: int, tag_names: List[str], is_new_post: bool = False) -> None:
+    """게시글 태그를 tag_names(대소문자 무시, 중복 제거)로 맞춘다. 기존 연결과 비교해 추가/삭제할 것만 반영"""
+    names = list(dict.fromkeys(name.lower() for name in tag_names if name))
+    desired = set((await _get_or_create_tag_ids(db, names)).values()) if names else set()
+    current = set() if is_new_post else set(
+        await db.scalars(select(PostTag.tag_id).where(PostTag.post_id == post_id))
+    )
+    removed = current - desired
+    added = desired - current
+    if removed:
+        await db.execute(delete(PostTag).where(PostTag.post_id == post_id, PostTag.tag_id.in_(removed)))
+    if added:
+        await db.execute(insert(PostTag).values([{"post_id": post_id, "tag_id": tag_id} for tag_id in sorted(added)]))
+
+
+async def _fan_out_mentions(
+    db: AsyncSession,
+    post_id: int,
+    targets: List[MentionTarget],
+    actor_email: str,
+    actor_name: Optional[str],
+    comment_id: Optional[int] = None,
+) -> None:
+    """멘션 대상별 알림함 행 추가 (게시글당 한 행, INSERT 한 번).
+    게시글 본문 멘션은 이미 있으면 그대로 두고, 댓글 멘션은 최신 멘션으로 갱신해 다시 안 읽음으로 만든다.
+    자기 자신 멘션은 읽음으로 넣고 기존 행을 갱신하지 않는다."""
+    if not targets:
+        return
+    stmt = pg_insert(MentionInbox).values([
+        {
+            "mentioned_email": target.email,
+            "post_id": post_id,
+            "comment_id": comment_id,
+            "actor_email": actor_email,
+            "actor_name": actor_name,
+            "is_read": target.email == actor_email,
+        }
+        for target in targets
+    ])
+    conflict = ["mentioned_email", "post_id"]
+    if comment_id is None:
+        stmt = stmt.on_conflict_do_nothing(index_elements=conflict)
+    else:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict,
+            set_={
+                "comment_id": stmt.excluded.comment_id,
+                "actor_email": stmt.excluded.actor_email,
+                "actor_name": stmt.excluded.actor_name,
+                "is_read": False,
+                "mentioned_at": func.now(),
+            },
+            where=MentionInbox.mentioned_email != stmt.excluded.actor_email,
+        )
+    await db.execute(stmt)
+
+
+async def _current_user_id_email(db: AsyncSession, token: str) -> Tuple[int, str]:
+    """토큰의 (사용자 id, 이메일(멘션 알림함 키)). 토큰이 유효하지 않으면 401, 사용자가 없으면 404"""
+    payload = verify_token(token)
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token"
+        )
+    try:
+        user_id = int(payload.get("sub"))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
+    email = await db.scalar(select(User.email).where(User.id == user_id))
+    if not email:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return user_id, email
+
+
+async def _unread_mention_count(db: AsyncSession, email: str) -> int:
+    return await db.scalar(
+        select(func.count()).select_from(MentionInbox)
+        .where(MentionInbox.mentioned_email == email, MentionInbox.is_read.is_(False))
+    )
+
+
+async def load_popular_posts(db: AsyncSession, limit: int, current_user_id: Optional[int] = None) -> List[PostResponse]:
+    """인기 게시글 (/popular-posts, /public/home 공용)"""
+    # Forum 타입만 필터링하고 like_count 카운터 기준으로 정렬 (좋아요 수가 많은 순, 같으면 최신순)
+    posts = (await db.scalars(select(Post).where(
+        Post.post_type == 'forum'
+    ).order_by(
+        desc(Post.like_count), desc(Post.created_at)
+    ).limit(limit))).all()
+    return await _hydrate_posts(db, posts, current_user_id)
 
 
 @router.post("/upload-image")
 async def upload_community_image(
     file: UploadFile = File(...),
     token: str = Query(..., description="User authentication token"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """게시글용 이미지 업로드 (로그인 사용자, 최대 3개/글) - community 전용 폴더 사용"""
     payload = verify_token(token)
     if not payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    import shutil
-    import time
+    from app.services.uploads import save_upload_blob, UploadTooLargeError
     UPLOAD_DIR = _get_community_upload_dir()
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
     ALLOWED = {".png", ".jpg", ".jpeg", ".gif", ".webp"}
@@ -190,15 +659,12 @@ async def upload_community_image(
         filename = (filename or "image").rstrip(".") + ext
     if ext not in ALLOWED:
         raise HTTPException(status_code=400, detail=f"Allowed: {', '.join(ALLOWED)}")
-    content = await file.read()
-    if len(content) > MAX_MB * 1024 * 1024:
+    try:
+        # 내용(sha256) 기준 저장: 같은 이미지를 다시 올리면 기존 파일 재사용
+        saved = await save_upload_blob(file, UPLOAD_DIR, ext, MAX_MB * 1024 * 1024)
+    except UploadTooLargeError:
         raise HTTPException(status_code=413, detail=f"Max {MAX_MB}MB")
-    await file.seek(0)
-    ts = int(time.time() * 1000)
-    safe = f"{ts}_{filename}"
-    path = UPLOAD_DIR / safe
-    with open(path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+    safe = saved.path.name
     url = f"/community/image/{safe}"
     return {"url": url, "filename": safe}
 
@@ -210,16 +676,31 @@ def _get_media_type(ext: str) -> str:
 
 
 @router.get("/image/{filename:path}")
-async def get_community_image(filename: str):
-    """Community 게시글용 이미지 조회"""
+async def get_community_image(
+    filename: str,
+    request: Request,
+    w: Optional[int] = Query(None, ge=1, le=4096, description="Resize to this width (snapped to a preset)"),
+):
+    """Community 게시글용 이미지 조회 (w 지정 시 축소 변형 제공)"""
     from urllib.parse import unquote
-    from fastapi.responses import FileResponse
+    from app.services.image_variants import get_image_variant, IMMUTABLE_CACHE_CONTROL
+    from app.services.uploads import resolve_upload_path, upload_file_response, InvalidUploadPathError
     decoded = unquote(filename)
-    path = _get_community_upload_dir() / decoded
-    if not path.exists() or not path.is_file():
+    try:
+        path = resolve_upload_path(_get_community_upload_dir(), decoded)
+    except InvalidUploadPathError:
+        path = None
+    # 업로드 루트 밖(../ 등)은 변형을 만들기 전에 404
+    if path is None or not path.is_file():
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
-    ext = path.suffix
-    return FileResponse(path, media_type=_get_media_type(ext))
+    served = await get_image_variant(path, w, request.headers.get("accept"))
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if w:
+        headers["Vary"] = "Accept"
+    # 조회만 하고 전송은 nginx에 위임 (설정 시)
+    return upload_file_response(
+        request, _get_community_upload_dir(), served, media_type=_get_media_type(served.suffix), headers=headers
+    )
 
 
 @router.get("/posts", response_model=PostListResponse)
@@ -229,211 +710,123 @@ async def get_posts(
     search: Optional[str] = Query(None, description="Search in title and content"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor from the previous page)"),
+    use_cursor: bool = Query(False, description="Use keyset (cursor) pagination instead of page/offset"),
+    include_total: bool = Query(False, description="Cursor mode: include an estimated total"),
     token: Optional[str] = Query(None, description="User authentication token"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """게시글 목록 조회 (검색 및 필터링 지원)"""
+    """게시글 목록 조회 (검색 및 필터링 지원)
+    기본은 page/offset 방식. cursor 또는 use_cursor=true면 (is_pinned, created_at, id) 키셋 방식으로
+    페이지 깊이와 무관하게 일정 비용으로 조회하고, total은 include_total=true일 때 플래너 추정치로 반환."""
     try:
-        query = db.query(Post)
+        query = select(Post)
         
         # 타입 필터
         if post_type:
-            query = query.filter(Post.post_type == post_type)
+            query = query.where(Post.post_type == post_type)
         
         # 태그 필터
         if tag:
-            tag_obj = db.query(Tag).filter(Tag.name == tag.lower()).first()
+            tag_obj = await db.scalar(select(Tag).where(Tag.name == tag.lower()))
             if tag_obj:
-                query = query.join(PostTag).filter(PostTag.tag_id == tag_obj.id)
+                query = query.join(PostTag).where(PostTag.tag_id == tag_obj.id)
             else:
                 # 태그가 없으면 빈 결과 반환
                 return PostListResponse(posts=[], total=0, page=page, page_size=page_size)
         
-        # 검색 필터
+        # 검색 필터 (search_vector GIN 인덱스, 한글은 어절 접두어 + 2-gram 구문으로 매칭)
+        search_terms: List[str] = []
+        rank = None
         if search:
-            # 입력 검증 (SQL Injection 방지)
-            search_clean = search.strip()
-            if len(search_clean) > 200:  # 길이 제한
-                search_clean = search_clean[:200]
-            # 특수 문자 제한 (SQL Injection 방지)
-            if not re.match(r'^[a-zA-Z0-9\s._@#-]+$', search_clean):
-                # 유효하지 않은 문자가 있으면 빈 결과 반환
+            search_terms = _search_terms(search)
+            tsquery_text = _build_search_tsquery(search_terms)
+            if not tsquery_text:
                 return PostListResponse(posts=[], total=0, page=page, page_size=page_size)
-            search_term = f"%{search_clean}%"
-            query = query.filter(
-                or_(
-                    Post.title.ilike(search_term),
-                    Post.content.ilike(search_term)
+            ts_query = func.to_tsquery('simple', tsquery_text)
+            query = query.where(Post.search_vector.op('@@')(ts_query))
+            rank = func.ts_rank_cd(Post.search_vector, ts_query)
+        
+        # 정렬: 고정 게시글 먼저, 그 다음 최신순 (같은 시각은 id 역순)
+        # 검색(offset 모드)은 관련도순 → 최신순
+        if rank is not None and not (cursor or use_cursor):
+            query = query.order_by(desc(rank), desc(Post.created_at), desc(Post.id))
+        else:
+            query = query.order_by(desc(Post.is_pinned), desc(Post.created_at), desc(Post.id))
+
+        if cursor or use_cursor:
+            total = await _estimate_count(db, query.order_by(None)) if include_total else None
+            if cursor:
+                is_pinned, created_at, last_id = _decode_post_cursor(cursor)
+                query = query.where(
+                    tuple_(Post.is_pinned, Post.created_at, Post.id) < tuple_(is_pinned, created_at, last_id)
                 )
+            posts = (await db.scalars(query.limit(page_size + 1))).all()
+            next_cursor = _encode_post_cursor(posts[page_size - 1]) if len(posts) > page_size else None
+            posts = posts[:page_size]
+            post_responses = await _hydrate_posts(db, posts, _get_optional_user_id(token))
+            _attach_search_snippets(post_responses, search_terms)
+
+            return PostListResponse(
+                posts=post_responses,
+                total=total,
+                page=page,
+                page_size=page_size,
+                next_cursor=next_cursor,
+                total_is_estimate=total is not None
             )
         
-        # 정렬: 고정 게시글 먼저, 그 다음 최신순
-        query = query.order_by(desc(Post.is_pinned), desc(Post.created_at))
-        
         # 전체 개수
-        total = query.count()
+        total = await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
         
         # 페이지네이션
         offset = (page - 1) * page_size
-        posts = query.offset(offset).limit(page_size).all()
-        
-        # 댓글 개수 및 좋아요 정보 추가
-        from app.models.post import PostLike
-        from app.core.security import verify_token
-        post_responses = []
-        current_user_id = None
-        if token:
-            try:
-                payload = verify_token(token)
-                if payload:
-                    user_id = payload.get("sub")
-                    if user_id:
-                        current_user_id = int(user_id)
-            except:
-                pass
-        
-        for post in posts:
-            comment_count = db.query(Comment).filter(Comment.post_id == post.id).count()
-            tags = [{"id": pt.tag.id, "name": pt.tag.name} for pt in post.tags]
-            mentions = [{"mentioned_email": pm.mentioned_email, "mentioned_name": pm.mentioned_name} for pm in post.mentions]
-            
-            # 좋아요 수 및 현재 사용자가 좋아요를 눌렀는지 확인
-            like_count = db.query(PostLike).filter(PostLike.post_id == post.id).count()
-            is_liked = False
-            if current_user_id:
-                existing_like = db.query(PostLike).filter(
-                    PostLike.post_id == post.id,
-                    PostLike.user_id == current_user_id
-                ).first()
-                is_liked = existing_like is not None
-            
-            # Notice 타입인 경우 작성자명을 'Global Partnership Center'로 표시
-            author_name = post.author_name
-            if post.post_type == "notice":
-                author_name = "Global Partnership Center"
-            
-            try:
-                img_urls = _parse_image_urls(post.image_url)
-                img_sizes = _image_sizes_for_response(len(img_urls), getattr(post, "image_sizes", None)) if img_urls else None
-                post_dict = {
-                    "id": post.id,
-                    "post_type": post.post_type,
-                    "title": post.title,
-                    "content": post.content,
-                    "author_email": post.author_email,
-                    "author_name": author_name,
-                    "is_pinned": post.is_pinned,
-                    "view_count": post.view_count,
-                    "image_url": img_urls[0] if img_urls else post.image_url,
-                    "image_urls": img_urls if img_urls else None,
-                    "image_sizes": img_sizes,
-                    "like_count": like_count,
-                    "is_liked": is_liked,
-                    "is_resolved": getattr(post, 'is_resolved', False),
-                    "created_at": post.created_at,
-                    "updated_at": post.updated_at,
-                    "comment_count": comment_count,
-                    "tags": tags,
-                    "mentions": mentions
-                }
-                post_responses.append(PostResponse(**post_dict))
-            except Exception as e:
-                error_msg = f"Error creating PostResponse for post {post.id}: {e}"
-                logger.error(error_msg)
-                logger.error(traceback.format_exc())
-                print(error_msg)
-                print(traceback.format_exc())
-                raise
-        
+        posts = (await db.scalars(query.offset(offset).limit(page_size))).all()
+
+        # 댓글 개수, 좋아요 정보, 태그, 멘션 일괄 로드
+        post_responses = await _hydrate_posts(db, posts, _get_optional_user_id(token))
+        _attach_search_snippets(post_responses, search_terms)
+
         return PostListResponse(
             posts=post_responses,
             total=total,
             page=page,
             page_size=page_size
         )
-    except Exception as e:
-        error_msg = f"Error in get_posts: {e}"
-        logger.error(error_msg)
-        logger.error(traceback.format_exc())
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error in get_posts")
         raise
 
 @router.get("/posts/{post_id}", response_model=PostResponse)
 async def get_post(
     post_id: int,
+    request: Request,
     token: Optional[str] = Query(None, description="User authentication token"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """게시글 상세 조회"""
-    post = db.query(Post).filter(Post.id == post_id).first()
+    """게시글 상세 조회 (조회수는 view_counter가 모아서 일괄 반영하므로 읽기 전용)"""
+    post = await db.scalar(select(Post).where(Post.id == post_id))
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found"
         )
     
-    # 조회수 증가
-    post.view_count += 1
-    db.commit()
-    db.refresh(post)
-    
-    comment_count = db.query(Comment).filter(Comment.post_id == post.id).count()
-    tags = [{"id": pt.tag.id, "name": pt.tag.name} for pt in post.tags]
-    mentions = [{"mentioned_email": pm.mentioned_email, "mentioned_name": pm.mentioned_name} for pm in post.mentions]
-    
-    # 좋아요 수 및 현재 사용자가 좋아요를 눌렀는지 확인
-    from app.models.post import PostLike
-    like_count = db.query(PostLike).filter(PostLike.post_id == post.id).count()
-    is_liked = False
-    if token:
-        try:
-            payload = verify_token(token)
-            if payload:
-                user_id = payload.get("sub")
-                if user_id:
-                    user_id_int = int(user_id)
-                    existing_like = db.query(PostLike).filter(
-                        PostLike.post_id == post.id,
-                        PostLike.user_id == user_id_int
-                    ).first()
-                    is_liked = existing_like is not None
-        except:
-            pass
-    
-    # Notice 타입인 경우 작성자명을 'Global Partnership Center'로 표시
-    author_name = post.author_name
-    if post.post_type == "notice":
-        author_name = "Global Partnership Center"
-    
-    img_urls = _parse_image_urls(post.image_url)
-    img_sizes = _image_sizes_for_response(len(img_urls), getattr(post, "image_sizes", None)) if img_urls else None
-    post_dict = {
-        "id": post.id,
-        "post_type": post.post_type,
-        "title": post.title,
-        "content": post.content,
-        "author_email": post.author_email,
-        "author_name": author_name,
-        "is_pinned": post.is_pinned,
-        "view_count": post.view_count,
-        "image_url": img_urls[0] if img_urls else post.image_url,
-        "image_urls": img_urls if img_urls else None,
-        "image_sizes": img_sizes,
-        "like_count": like_count,
-        "is_liked": is_liked,
-        "is_resolved": getattr(post, 'is_resolved', False),
-        "created_at": post.created_at,
-        "updated_at": post.updated_at,
-        "comment_count": comment_count,
-        "tags": tags,
-        "mentions": mentions
-    }
-    return PostResponse(**post_dict)
+    # 조회수 증가 (write-behind). 로그인 사용자는 ID, 비로그인은 클라이언트 IP로 중복 조회 제거
+    current_user_id = _get_optional_user_id(token)
+    record_view(post_id, f"u:{current_user_id}" if current_user_id else _client_ip_key(request))
+
+    response = (await _hydrate_posts(db, [post], current_user_id))[0]
+    response.view_count = (response.view_count or 0) + pending_views(post_id)
+    return response
 
 @router.post("/posts", response_model=PostResponse)
 async def create_post(
     post: PostCreate,
     token: str = Query(..., description="User authentication token"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """게시글 생성"""
     from app.core.security import verify_token
@@ -455,16 +848,16 @@ async def create_post(
     is_admin = payload.get("role") == "admin"
     if post.post_type == "notice" and is_admin:
         admin_id_token = payload.get("sub")
-        admin = db.query(Admin).filter(Admin.id == int(admin_id_token)).first()
+        admin = await db.scalar(select(Admin).where(Admin.id == int(admin_id_token)))
         if not admin:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin not found")
         author_name = "Global Partnership Center"
         author_email = admin.email or f"{admin.username}@admin.local"
-        admin_user = db.query(User).filter(User.email == admin.email).first() if admin.email else None
+        admin_user = await db.scalar(select(User).where(User.email == admin.email)) if admin.email else None
         if admin_user:
             author_id = admin_user.id
         else:
-            fallback = db.query(User).order_by(User.id.asc()).first()
+            fallback = await db.scalar(select(User).order_by(User.id.asc()).limit(1))
             if not fallback:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -477,7 +870,7 @@ async def create_post(
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
         try:
             user_id_int = int(user_id)
-            user = db.query(User).filter(User.id == user_id_int).first()
+            user = await db.scalar(select(User).where(User.id == user_id_int))
         except (ValueError, TypeError):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid user ID in token")
         if not user:
@@ -486,7 +879,7 @@ async def create_post(
         author_name = user.name
         author_id = user.id
         if post.post_type == "notice":
-            admin = db.query(Admin).filter(Admin.email == user.email).first()
+            admin = await db.scalar(select(Admin).where(Admin.email == user.email))
             if not admin:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
@@ -519,91 +912,42 @@ async def create_post(
         image_sizes=stored_sizes,
     )
     db.add(db_post)
-    db.flush()
+    await db.flush()
+    await update_upload_refs(db, None, stored_url)
     
     # 태그 처리
     if post.tags:
-        for tag_name in post.tags:
-            tag = db.query(Tag).filter(Tag.name == tag_name.lower()).first()
-            if not tag:
-                tag = Tag(name=tag_name.lower())
-                db.add(tag)
-                db.flush()
-            
-            post_tag = PostTag(post_id=db_post.id, tag_id=tag.id)
-            db.add(post_tag)
+        await _set_post_tags(db, db_post.id, post.tags, is_new_post=True)
     
     # 언급 처리 (content에서도 추출)
     mentions_from_content = extract_mentions(post.content)
     all_mentions = list(set((post.mentions or []) + mentions_from_content))
     
-    for mention_text in all_mentions:
-        # 이메일 형식인지 확인
-        if '@' in mention_text and '.' in mention_text.split('@')[1]:
-            # 이메일 형식
-            email = mention_text
-            mentioned_user = db.query(User).filter(User.email == email).first()
-        else:
-            # 사용자 이름 형식 (언더스코어를 공백으로 변환)
-            name = mention_text.replace('_', ' ')
-            mentioned_user = db.query(User).filter(User.name == name).first()
-            if not mentioned_user:
-                # 이름으로 찾지 못하면 이메일의 앞부분으로도 시도
-                # SQL Injection 방지: mention_text 검증 (알파벳, 숫자, 언더스코어만 허용)
-                if re.match(r'^[a-zA-Z0-9_]+$', mention_text) and len(mention_text) <= 100:
-                    mentioned_user = db.query(User).filter(User.email.like(f"{mention_text}@%")).first()
-                else:
-                    mentioned_user = None
-            email = mentioned_user.email if mentioned_user else None
-        
-        if email:
-            mention = PostMention(
-                post_id=db_post.id,
-                mentioned_email=email,
-                mentioned_name=mentioned_user.name if mentioned_user else None
-            )
-            db.add(mention)
-    
-    db.commit()
-    db.refresh(db_post)
-    
-    comment_count = 0
-    tags = [{"id": pt.tag.id, "name": pt.tag.name} for pt in db_post.tags]
-    mentions = [{"mentioned_email": pm.mentioned_email, "mentioned_name": pm.mentioned_name} for pm in db_post.mentions]
-    
-    img_urls = _parse_image_urls(db_post.image_url)
-    img_sizes = _image_sizes_for_response(len(img_urls), getattr(db_post, "image_sizes", None)) if img_urls else None
-    post_dict = {
-        "id": db_post.id,
-        "post_type": db_post.post_type,
-        "title": db_post.title,
-        "content": db_post.content,
-        "author_email": db_post.author_email,
-        "author_name": db_post.author_name,
-        "is_pinned": db_post.is_pinned,
-        "view_count": db_post.view_count,
-        "image_url": img_urls[0] if img_urls else db_post.image_url,
-        "image_urls": img_urls if img_urls else None,
-        "image_sizes": img_sizes,
-        "like_count": db_post.like_count or 0,
-        "is_liked": False,
-        "created_at": db_post.created_at,
-        "updated_at": db_post.updated_at,
-        "comment_count": comment_count,
-        "tags": tags,
-        "mentions": mentions
-    }
-    return PostResponse(**post_dict)
+    targets = await resolve_mentions(db, all_mentions)
+    for target in targets:
+        db.add(PostMention(
+            post_id=db_post.id,
+            mentioned_email=target.email,
+            mentioned_name=target.name
+        ))
+    await _fan_out_mentions(db, db_post.id, targets, author_email, author_name)
+    
+    await db.commit()
+    await db.refresh(db_post)
+    if _is_pinned_notice(db_post):
+        await public_cache.invalidate(public_cache.PINNED_NOTICES)
+
+    return (await _hydrate_posts(db, [db_post]))[0]
 
 @router.put("/posts/{post_id}", response_model=PostResponse)
 async def update_post(
     post_id: int,
     post: PostUpdate,
     token: str = Query(..., description="User authentication token"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """게시글 수정"""
-    db_post = db.query(Post).filter(Post.id == post_id).first()
+    db_post = await db.scalar(select(Post).where(Post.id == post_id))
     if not db_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -628,7 +972,7 @@ async def update_post(
     
     try:
         user_id_int = int(user_id)
-        user = db.query(User).filter(User.id == user_id_int).first()
+        user = await db.scalar(select(User).where(User.id == user_id_int))
     except (ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -640,7 +984,7 @@ async def update_post(
     if is_admin and db_post.post_type == "notice":
         from app.models.admin import Admin
         try:
-            admin_obj = db.query(Admin).filter(Admin.id == int(user_id)).first()
+            admin_obj = await db.scalar(select(Admin).where(Admin.id == int(user_id)))
             is_admin = admin_obj is not None
         except (ValueError, TypeError):
             is_admin = False
@@ -651,14 +995,21 @@ async def update_post(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to update this post"
         )
+    was_pinned_notice = _is_pinned_notice(db_post)
     
     # 업데이트
     if post.title is not None:
         db_post.title = post.title
     if post.content is not None:
         db_post.content = post.content
+    removed_image_filenames: List[str] = []
     if post.image_urls is not None:
+        previous_image_url = db_post.image_url
+        previous_filenames = _community_image_filenames(previous_image_url)
         db_post.image_url = _serialize_image_urls(post.image_urls[:3]) if post.image_urls else None
+        kept = set(_community_image_filenames(db_post.image_url))
+        removed_image_filenames = [f for f in previous_filenames if f not in kept]
+        await update_upload_refs(db, previous_image_url, db_post.image_url)
     if post.image_sizes is not None:
         urls_now = _parse_image_urls(db_post.image_url)
         sizes = [s if s in VALID_IMAGE_SIZES else "full" for s in post.image_sizes[:3]]
@@ -672,112 +1023,58 @@ async def update_post(
         if db_post.post_type == "request":
             db_post.is_resolved = post.is_resolved
     
-    # 태그 업데이트
+    # 태그 업데이트 (바뀐 것만 반영)
     if post.tags is not None:
-        # 기존 태그 삭제
-        db.query(PostTag).filter(PostTag.post_id == post_id).delete()
-        
-        # 새 태그 추가
-        for tag_name in post.tags:
-            tag = db.query(Tag).filter(Tag.name == tag_name.lower()).first()
-            if not tag:
-                tag = Tag(name=tag_name.lower())
-                db.add(tag)
-                db.flush()
-            
-            post_tag = PostTag(post_id=post_id, tag_id=tag.id)
-            db.add(post_tag)
+        await _set_post_tags(db, post_id, post.tags)
     
     # 언급 업데이트
     if post.mentions is not None or post.content:
         # 기존 언급 삭제
-        db.query(PostMention).filter(PostMention.post_id == post_id).delete()
+        await db.execute(delete(PostMention).where(PostMention.post_id == post_id))
         
         # 새 언급 추가
         mentions_from_content = extract_mentions(post.content or db_post.content)
         all_mentions = list(set((post.mentions or []) + mentions_from_content))
         
-        for mention_text in all_mentions:
-            # 이메일 형식인지 확인
-            if '@' in mention_text and '.' in mention_text.split('@')[1]:
-                # 이메일 형식
-                email = mention_text
-                mentioned_user = db.query(User).filter(User.email == email).first()
-            else:
-                # 사용자 이름 형식 (언더스코어를 공백으로 변환)
-                name = mention_text.replace('_', ' ')
-                mentioned_user = db.query(User).filter(User.name == name).first()
-                if not mentioned_user:
-                    # 이름으로 찾지 못하면 이메일의 앞부분으로도 시도
-                    mentioned_user = db.query(User).filter(User.email.like(f"{mention_text}@%")).first()
-                email = mentioned_user.email if mentioned_user else None
-            
-            if email:
-                mention = PostMention(
-                    post_id=post_id,
-                    mentioned_email=email,
-                    mentioned_name=mentioned_user.name if mentioned_user else None
-                )
-                db.add(mention)
-    
-    db.commit()
-    db.refresh(db_post)
-    
-    comment_count = db.query(Comment).filter(Comment.post_id == post_id).count()
-    tags = [{"id": pt.tag.id, "name": pt.tag.name} for pt in db_post.tags]
-    mentions = [{"mentioned_email": pm.mentioned_email, "mentioned_name": pm.mentioned_name} for pm in db_post.mentions]
-    
-    # 좋아요 수 및 현재 사용자가 좋아요를 눌렀는지 확인
-    from app.models.post import PostLike
-    like_count = db.query(PostLike).filter(PostLike.post_id == post_id).count()
-    is_liked = False
-    if token:
-        try:
-            payload = verify_token(token)
-            if payload:
-                user_id = payload.get("sub")
-                if user_id:
-                    user_id_int = int(user_id)
-                    existing_like = db.query(PostLike).filter(
-                        PostLike.post_id == post_id,
-                        PostLike.user_id == user_id_int
-                    ).first()
-                    is_liked = existing_like is not None
-        except:
-            pass
+        targets = await resolve_mentions(db, all_mentions)
+        for target in targets:
+            db.add(PostMention(
+                post_id=post_id,
+                mentioned_email=target.email,
+                mentioned_name=target.name
+            ))
+
+        # 알림함: 새로 멘션된 사용자만 추가, 본문에서 빠진 멘션은 제거 (이후 댓글에서 멘션된 행은 유지)
+        await _fan_out_mentions(db, post_id, targets, db_post.author_email, db_post.author_name)
+        await db.execute(
+            delete(MentionInbox)
+            .where(
+                MentionInbox.post_id == post_id,
+                MentionInbox.comment_id.is_(None),
+                MentionInbox.mentioned_email.not_in([target.email for target in targets]),
+            )
+            .execution_options(synchronize_session=False)
+        )
     
-    img_urls = _parse_image_urls(db_post.image_url)
-    img_sizes = _image_sizes_for_response(len(img_urls), getattr(db_post, "image_sizes", None)) if img_urls else None
-    post_dict = {
-        "id": db_post.id,
-        "post_type": db_post.post_type,
-        "title": db_post.title,
-        "content": db_post.content,
-        "author_email": db_post.author_email,
-        "author_name": db_post.author_name,
-        "is_pinned": db_post.is_pinned,
-        "view_count": db_post.view_count,
-        "image_url": img_urls[0] if img_urls else db_post.image_url,
-        "image_urls": img_urls if img_urls else None,
-        "image_sizes": img_sizes,
-        "like_count": like_count,
-        "is_liked": is_liked,
-        "created_at": db_post.created_at,
-        "updated_at": db_post.updated_at,
-        "comment_count": comment_count,
-        "tags": tags,
-        "mentions": mentions
-    }
-    return PostResponse(**post_dict)
+    await db.commit()
+    await db.refresh(db_post)
+    if was_pinned_notice or _is_pinned_notice(db_post):
+        # 홈페이지 고정 공지(제목/내용 미리보기) 캐시 갱신
+        await public_cache.invalidate(public_cache.PINNED_NOTICES)
+
+    # 수정으로 빠진 이미지 중 참조 수가 0이 된 파일 정리
+    await _delete_post_image_files(db, removed_image_filenames)
+
+    return (await _hydrate_posts(db, [db_post], _get_optional_user_id(token)))[0]
 
 @router.delete("/posts/{post_id}")
 async def delete_post(
     post_id: int,
     token: str = Query(..., description="User authentication token"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """게시글 삭제"""
-    db_post = db.query(Post).filter(Post.id == post_id).first()
+    db_post = await db.scalar(select(Post).where(Post.id == post_id))
     if not db_post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -802,7 +1099,7 @@ async def delete_post(
     
     try:
         user_id_int = int(user_id)
-        user = db.query(User).filter(User.id == user_id_int).first()
+        user = await db.scalar(select(User).where(User.id == user_id_int))
     except (ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -814,14 +1111,14 @@ async def delete_post(
     if is_admin and db_post.post_type == "notice":
         from app.models.admin import Admin
         try:
-            admin_obj = db.query(Admin).filter(Admin.id == int(user_id)).first()
+            admin_obj = await db.scalar(select(Admin).where(Admin.id == int(user_id)))
             is_admin = admin_obj is not None
         except (ValueError, TypeError):
             is_admin = False
     elif user and db_post.post_type == "notice":
         # 일반 사용자 토큰인 경우, 이메일로 관리자 확인
         from app.models.admin import Admin
-        admin = db.query(Admin).filter(Admin.email == user.email).first()
+        admin = await db.scalar(select(Admin).where(Admin.email == user.email))
         if admin:
             is_admin = True
 
@@ -832,41 +1129,84 @@ async def delete_post(
             detail="Not authorized to delete this post"
         )
 
-    # 게시글에 첨부된 이미지 파일 삭제 (/community/image/ 로 저장된 파일만)
-    _delete_post_image_files(db_post.image_url)
+    image_filenames = _community_image_filenames(db_post.image_url)
+    was_pinned_notice = _is_pinned_notice(db_post)
+    await update_upload_refs(db, db_post.image_url, None)
+    await db.delete(db_post)
+    await db.commit()
+    # 삭제된 글이 홈 인기 게시글에 TTL 동안 남지 않도록
+    if was_pinned_notice:
+        await public_cache.invalidate(public_cache.PINNED_NOTICES, public_cache.POPULAR_POSTS)
+    else:
+        await public_cache.invalidate(public_cache.POPULAR_POSTS)
 
-    db.delete(db_post)
-    db.commit()
+    # 게시글에 첨부된 이미지 파일 삭제 (/community/image/ 로 저장됐고 참조 수가 0이 된 파일만)
+    await _delete_post_image_files(db, image_filenames)
     return {"message": "Post deleted successfully"}
 
 @router.get("/posts/{post_id}/comments", response_model=List[CommentResponse])
 async def get_comments(
     post_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """게시글의 댓글 목록 조회"""
-    comments = db.query(Comment).filter(Comment.post_id == post_id).order_by(Comment.created_at.asc()).all()
-    
-    comment_responses = []
-    for comment in comments:
-        mentions = [{"mentioned_email": cm.mentioned_email, "mentioned_name": cm.mentioned_name} for cm in comment.mentions]
-        comment_dict = {
-            **comment.__dict__,
-            "mentions": mentions
-        }
-        comment_responses.append(CommentResponse(**comment_dict))
-    
-    return comment_responses
+    comments = (await db.scalars(
+        select(Comment).where(Comment.post_id == post_id).order_by(Comment.created_at.asc())
+    )).all()
+
+    return await _hydrate_comments(db, comments)
+
+@router.get("/posts/{post_id}/comments/tree", response_model=CommentTreeResponse)
+async def get_comment_tree(
+    post_id: int,
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor from the previous page)"),
+    limit: int = Query(20, ge=1, le=100, description="Top-level comments per page"),
+    depth: int = Query(settings.COMMENT_TREE_MAX_DEPTH, ge=0, le=10, description="Reply levels to expand"),
+    replies: int = Query(settings.COMMENT_TREE_MAX_REPLIES, ge=0, le=100, description="Replies to expand per comment"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """게시글 댓글 트리 (최상위 댓글은 오래된 순 커서 페이지, 답글은 depth/replies까지 펼침)
+    더 깊거나 많은 답글은 각 노드의 reply_count/replies_cursor로 /comments/{id}/replies에서 이어서 조회."""
+    total = await db.scalar(select(Post.comment_count).where(Post.id == post_id))
+    if total is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    comments, next_cursor = await _load_comment_tree(
+        db, (Comment.post_id == post_id) & Comment.parent_id.is_(None), limit, cursor, depth, replies
+    )
+    return CommentTreeResponse(comments=comments, next_cursor=next_cursor, total=total)
+
+@router.get("/comments/{comment_id}/replies", response_model=CommentTreeResponse)
+async def get_comment_replies(
+    comment_id: int,
+    cursor: Optional[str] = Query(None, description="Keyset cursor (replies_cursor of the parent, or next_cursor)"),
+    limit: int = Query(20, ge=1, le=100, description="Replies per page"),
+    depth: int = Query(settings.COMMENT_TREE_MAX_DEPTH, ge=0, le=10, description="Reply levels to expand below each reply"),
+    replies: int = Query(settings.COMMENT_TREE_MAX_REPLIES, ge=0, le=100, description="Replies to expand per comment"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """댓글의 답글 (댓글 트리에서 펼치지 않은 부분 지연 로드)"""
+    if not await db.scalar(select(Comment.id).where(Comment.id == comment_id)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Comment not found"
+        )
+    total = await db.scalar(select(func.count()).select_from(Comment).where(Comment.parent_id == comment_id))
+    comments, next_cursor = await _load_comment_tree(
+        db, Comment.parent_id == comment_id, limit, cursor, depth, replies
+    )
+    return CommentTreeResponse(comments=comments, next_cursor=next_cursor, total=total)
 
 @router.post("/posts/{post_id}/like")
 async def toggle_like(
     post_id: int,
     token: str = Query(..., description="User authentication token"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """게시글 좋아요 토글"""
+    """게시글 좋아요 토글 (_TOGGLE_LIKE_SQL 한 문장으로 처리)"""
     from app.core.security import verify_token
-    from app.models.post import PostLike
     
     payload = verify_token(token)
     if not payload:
@@ -890,42 +1230,34 @@ async def toggle_like(
             detail="Invalid user ID in token"
         )
     
-    # 게시글 확인
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
+    try:
+        row = (await db.execute(_TOGGLE_LIKE_SQL, {"post_id": post_id, "user_id": user_id_int})).first()
+    except IntegrityError:
+        # post_likes.user_id FK: 토큰의 사용자가 삭제됨
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    if row is None:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found"
         )
-    
-    # 기존 좋아요 확인
-    existing_like = db.query(PostLike).filter(
-        PostLike.post_id == post_id,
-        PostLike.user_id == user_id_int
-    ).first()
-    
-    if existing_like:
-        # 좋아요 취소
-        db.delete(existing_like)
-        db.commit()
-        return {"liked": False, "like_count": db.query(PostLike).filter(PostLike.post_id == post_id).count()}
-    else:
-        # 좋아요 추가
-        new_like = PostLike(post_id=post_id, user_id=user_id_int)
-        db.add(new_like)
-        db.commit()
-        return {"liked": True, "like_count": db.query(PostLike).filter(PostLike.post_id == post_id).count()}
+    await db.commit()
+    return {"liked": row.liked, "like_count": row.like_count}
 
 @router.post("/posts/{post_id}/comments", response_model=CommentResponse)
 async def create_comment(
     post_id: int,
     comment: CommentCreate,
     token: str = Query(..., description="User authentication token"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """댓글 생성"""
     # 게시글 확인
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.scalar(select(Post).where(Post.id == post_id))
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -950,7 +1282,7 @@ async def create_comment(
     
     try:
         user_id_int = int(user_id)
-        user = db.query(User).filter(User.id == user_id_int).first()
+        user = await db.scalar(select(User).where(User.id == user_id_int))
     except (ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -973,59 +1305,43 @@ async def create_comment(
         parent_id=comment.parent_id
     )
     db.add(db_comment)
-    db.flush()
+    await db.flush()
     
     # 언급 처리
     mentions_from_content = extract_mentions(comment.content)
     all_mentions = list(set((comment.mentions or []) + mentions_from_content))
     
-    for mention_text in all_mentions:
-        # 이메일 형식인지 확인
-        if '@' in mention_text and '.' in mention_text.split('@')[1]:
-            # 이메일 형식
-            email = mention_text
-            mentioned_user = db.query(User).filter(User.email == email).first()
-        else:
-            # 사용자 이름 형식 (언더스코어를 공백으로 변환)
-            name = mention_text.replace('_', ' ')
-            mentioned_user = db.query(User).filter(User.name == name).first()
-            if not mentioned_user:
-                # 이름으로 찾지 못하면 이메일의 앞부분으로도 시도
-                # SQL Injection 방지: mention_text 검증 (알파벳, 숫자, 언더스코어만 허용)
-                if re.match(r'^[a-zA-Z0-9_]+$', mention_text) and len(mention_text) <= 100:
-                    mentioned_user = db.query(User).filter(User.email.like(f"{mention_text}@%")).first()
-                else:
-                    mentioned_user = None
-            email = mentioned_user.email if mentioned_user else None
-        
-        if email:
-            mention = CommentMention(
-                comment_id=db_comment.id,
-                mentioned_email=email,
-                mentioned_name=mentioned_user.name if mentioned_user else None
-            )
-            db.add(mention)
-    
-    db.commit()
-    db.refresh(db_comment)
-    
-    mentions = [{"mentioned_email": cm.mentioned_email, "mentioned_name": cm.mentioned_name} for cm in db_comment.mentions]
-    comment_dict = {
-        **db_comment.__dict__,
-        "mentions": mentions
-    }
-    return CommentResponse(**comment_dict)
+    targets = await resolve_mentions(db, all_mentions)
+    for target in targets:
+        db.add(CommentMention(
+            comment_id=db_comment.id,
+            mentioned_email=target.email,
+            mentioned_name=target.name
+        ))
+    await _fan_out_mentions(db, post_id, targets, user.email, user.name, comment_id=db_comment.id)
+    
+    # 댓글 수 카운터 증가 (댓글 INSERT와 같은 트랜잭션)
+    await db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(comment_count=Post.comment_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    await db.refresh(db_comment)
+
+    return (await _hydrate_comments(db, [db_comment]))[0]
 
 @router.get("/tags", response_model=List[dict])
 async def get_tags(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """인기 태그 목록 조회"""
-    tags = db.query(
+    tags = (await db.execute(select(
         Tag.id,
         Tag.name,
         func.count(PostTag.post_id).label("post_count")
-    ).join(PostTag).group_by(Tag.id, Tag.name).order_by(desc("post_count")).limit(50).all()
+    ).join(PostTag).group_by(Tag.id, Tag.name).order_by(desc("post_count")).limit(50))).all()
     
     return [{"id": tag.id, "name": tag.name, "post_count": tag.post_count} for tag in tags]
 
@@ -1033,82 +1349,17 @@ async def get_tags(
 async def get_popular_posts(
     limit: int = Query(3, ge=1, le=20, description="Number of popular posts to return"),
     token: Optional[str] = Query(None, description="User authentication token"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """인기 게시글 목록 조회 (좋아요 수 기준, Forum 타입만)"""
-    from app.models.post import PostLike
-    from app.core.security import verify_token
-    
-    # Forum 타입만 필터링하고 좋아요 수 기준으로 정렬 (좋아요 수가 많은 순, 같으면 최신순)
-    posts = db.query(Post).filter(
-        Post.post_type == 'forum'
-    ).outerjoin(
-        PostLike, Post.id == PostLike.post_id
-    ).group_by(Post.id).order_by(
-        desc(func.count(PostLike.post_id)), desc(Post.created_at)
-    ).limit(limit).all()
-    
-    post_responses = []
-    current_user_id = None
-    if token:
-        try:
-            payload = verify_token(token)
-            if payload:
-                user_id = payload.get("sub")
-                if user_id:
-                    current_user_id = int(user_id)
-        except:
-            pass
-    
-    for post in posts:
-        comment_count = db.query(Comment).filter(Comment.post_id == post.id).count()
-        tags = [{"id": pt.tag.id, "name": pt.tag.name} for pt in post.tags]
-        mentions = [{"mentioned_email": pm.mentioned_email, "mentioned_name": pm.mentioned_name} for pm in post.mentions]
-        
-        # 좋아요 수 계산
-        like_count = db.query(PostLike).filter(PostLike.post_id == post.id).count()
-        
-        # 현재 사용자가 좋아요를 눌렀는지 확인
-        is_liked = False
-        if current_user_id:
-            existing_like = db.query(PostLike).filter(
-                PostLike.post_id == post.id,
-                PostLike.user_id == current_user_id
-            ).first()
-            is_liked = existing_like is not None
-        
-        img_urls = _parse_image_urls(post.image_url)
-        img_sizes = _image_sizes_for_response(len(img_urls), getattr(post, "image_sizes", None)) if img_urls else None
-        post_dict = {
-            "id": post.id,
-            "post_type": post.post_type,
-            "title": post.title,
-            "content": post.content,
-            "author_email": post.author_email,
-            "author_name": post.author_name,
-            "is_pinned": post.is_pinned,
-            "view_count": post.view_count,
-            "image_url": img_urls[0] if img_urls else post.image_url,
-            "image_urls": img_urls if img_urls else None,
-            "image_sizes": img_sizes,
-            "like_count": like_count,
-            "is_liked": is_liked,
-            "created_at": post.created_at,
-            "updated_at": post.updated_at,
-            "comment_count": comment_count,
-            "tags": tags,
-            "mentions": mentions
-        }
-        post_responses.append(PostResponse(**post_dict))
-    
-    return post_responses
+    return await load_popular_posts(db, limit, _get_optional_user_id(token))
 
 @router.get("/users", response_model=List[dict])
 async def get_users(
     search: Optional[str] = Query(None, description="Search users by name or email"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of users to return"),
     token: Optional[str] = Query(None, description="User authentication token"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """사용자 목록 조회 (멘션 자동완성용)"""
     # 토큰 검증 (선택적)
@@ -1124,7 +1375,7 @@ async def get_users(
             pass
     
     # 사용자 쿼리
-    query = db.query(User).filter(User.is_active == True)
+    query = select(User).where(User.is_active == True)
     
     # 검색어가 있으면 이름이나 이메일로 필터링
     if search:
@@ -1137,7 +1388,7 @@ async def get_users(
             # 유효하지 않은 문자가 있으면 빈 결과 반환
             return []
         search_term = f"%{search_clean}%"
-        query = query.filter(
+        query = query.where(
             or_(
                 User.name.ilike(search_term),
                 User.email.ilike(search_term)
@@ -1145,7 +1396,7 @@ async def get_users(
         )
     
     # 활성 사용자만, 이름 순으로 정렬
-    users = query.order_by(User.name).limit(limit).all()
+    users = (await db.scalars(query.order_by(User.name).limit(limit))).all()
     
     # 응답 형식: {email, name, picture}
     return [
@@ -1157,123 +1408,84 @@ async def get_users(
         for user in users
     ]
 
-@router.get("/mentioned-posts", response_model=PostListResponse)
+@router.get("/mentioned-posts", response_model=MentionedPostListResponse)
 async def get_mentioned_posts(
     token: str = Query(..., description="User authentication token"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Keyset cursor (next_cursor from the previous page)"),
+    use_cursor: bool = Query(False, description="Use keyset (cursor) pagination instead of page/offset"),
+    unread_only: bool = Query(False, description="Only posts with unread mentions"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """현재 사용자가 멘션된 게시글 목록 조회"""
-    # 토큰 검증
-    payload = verify_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token"
-        )
-    
-    # 현재 사용자 정보 가져오기
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
-    # 현재 사용자가 멘션된 게시글 조회 (중복 제거, 모든 게시글 포함)
-    # distinct()와 group_by를 사용하여 중복 완전 제거
-    mentioned_post_ids = db.query(PostMention.post_id).filter(
-        PostMention.mentioned_email == user.email
-    ).distinct().all()
-    
-    # Set을 사용하여 중복 완전 제거
-    mentioned_post_ids_set = set([row[0] for row in mentioned_post_ids])
-    mentioned_post_ids_list = list(mentioned_post_ids_set)
-    
-    if not mentioned_post_ids_list:
-        mentioned_posts = []
+    """현재 사용자가 게시글 또는 댓글에서 멘션된 게시글 목록 (최근 멘션순)
+    멘션 알림함(mention_inbox)에서 (mentioned_at, id) 인덱스로 한 페이지만 읽는다.
+    cursor 또는 use_cursor=true면 키셋 방식(total 없음)으로 멘션 수와 무관하게 일정 비용."""
+    user_id, email = await _current_user_id_email(db, token)
+
+    query = select(MentionInbox.id, MentionInbox.post_id, MentionInbox.is_read, MentionInbox.mentioned_at).where(
+        MentionInbox.mentioned_email == email
+    )
+    if unread_only:
+        query = query.where(MentionInbox.is_read.is_(False))
+
+    total = None
+    next_cursor = None
+    if cursor or use_cursor:
+        if cursor:
+            mentioned_at, last_id = _decode_keyset_cursor(cursor)
+            query = query.where(tuple_(MentionInbox.mentioned_at, MentionInbox.id) < tuple_(mentioned_at, last_id))
+        rows = (await db.execute(
+            query.order_by(desc(MentionInbox.mentioned_at), desc(MentionInbox.id)).limit(page_size + 1)
+        )).all()
+        if len(rows) > page_size:
+            next_cursor = _encode_keyset_cursor(rows[page_size - 1].mentioned_at, rows[page_size - 1].id)
+        rows = rows[:page_size]
     else:
-        # Post를 조회하고 Set을 사용하여 중복 완전 제거
-        all_posts = db.query(Post).filter(
-            Post.id.in_(mentioned_post_ids_list)
-        ).order_by(desc(Post.created_at)).all()
-        
-        # 추가 안전장치: Set을 사용하여 중복 완전 제거
-        seen_ids = set()
-        unique_posts = []
-        for post in all_posts:
-            if post.id not in seen_ids:
-                seen_ids.add(post.id)
-                unique_posts.append(post)
-        mentioned_posts = unique_posts
-    
-    # 페이지네이션
-    total = len(mentioned_posts)
-    start = (page - 1) * page_size
-    end = start + page_size
-    posts = mentioned_posts[start:end]
-    
-    # 응답 형식 구성
-    from app.models.post import PostLike
-    post_responses = []
-    seen_post_ids = set()  # 응답에서도 중복 제거
-    
-    for post in posts:
-        # 이미 처리한 post_id는 건너뛰기
-        if post.id in seen_post_ids:
-            continue
-        seen_post_ids.add(post.id)
-        
-        comment_count = db.query(Comment).filter(Comment.post_id == post.id).count()
-        tags = [{"id": pt.tag.id, "name": pt.tag.name} for pt in post.tags]
-        mentions = [{"mentioned_email": pm.mentioned_email, "mentioned_name": pm.mentioned_name} for pm in post.mentions]
-        
-        # 좋아요 수 계산
-        like_count = db.query(PostLike).filter(PostLike.post_id == post.id).count()
-        
-        # 현재 사용자가 좋아요를 눌렀는지 확인
-        existing_like = db.query(PostLike).filter(
-            PostLike.post_id == post.id,
-            PostLike.user_id == int(user_id)
-        ).first()
-        is_liked = existing_like is not None
-        
-        img_urls = _parse_image_urls(post.image_url)
-        img_sizes = _image_sizes_for_response(len(img_urls), getattr(post, "image_sizes", None)) if img_urls else None
-        post_dict = {
-            "id": post.id,
-            "post_type": post.post_type,
-            "title": post.title,
-            "content": post.content,
-            "author_email": post.author_email,
-            "author_name": post.author_name,
-            "is_pinned": post.is_pinned,
-            "view_count": post.view_count,
-            "image_url": img_urls[0] if img_urls else post.image_url,
-            "image_urls": img_urls if img_urls else None,
-            "image_sizes": img_sizes,
-            "like_count": like_count,
-            "is_liked": is_liked,
-            "is_resolved": getattr(post, 'is_resolved', False),
-            "created_at": post.created_at,
-            "updated_at": post.updated_at,
-            "comment_count": comment_count,
-            "tags": tags,
-            "mentions": mentions
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
+        rows = (await db.execute(
+            query.order_by(desc(MentionInbox.mentioned_at), desc(MentionInbox.id))
+            .offset((page - 1) * page_size).limit(page_size)
+        )).all()
+
+    posts_by_id = {}
+    if rows:
+        posts_by_id = {
+            post.id: post
+            for post in (await db.scalars(select(Post).where(Post.id.in_([row.post_id for row in rows])))).all()
         }
-        post_responses.append(PostResponse(**post_dict))
-    
-    return PostListResponse(
+    posts = [posts_by_id[row.post_id] for row in rows if row.post_id in posts_by_id]
+    post_responses = await _hydrate_posts(db, posts, user_id)
+
+    return MentionedPostListResponse(
         posts=post_responses,
         total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=next_cursor,
+        unread_post_ids=[row.post_id for row in rows if not row.is_read]
     )
+
+@router.get("/mentions/unread-count", response_model=MentionUnreadCountResponse)
+async def get_mention_unread_count(
+    token: str = Query(..., description="User authentication token"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """안 읽은 멘션이 있는 게시글 수 (알림 배지용, 안 읽은 행만 담은 부분 인덱스로 계산)"""
+    _, email = await _current_user_id_email(db, token)
+    return MentionUnreadCountResponse(unread_count=await _unread_mention_count(db, email))
+
+@router.post("/mentions/read", response_model=MentionUnreadCountResponse)
+async def mark_mentions_read(
+    body: MentionReadRequest,
+    token: str = Query(..., description="User authentication token"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """멘션 읽음 처리 (post_ids를 생략하면 전체). 남은 안 읽은 수 반환"""
+    _, email = await _current_user_id_email(db, token)
+    query = update(MentionInbox).where(MentionInbox.mentioned_email == email, MentionInbox.is_read.is_(False))
+    if body.post_ids is not None:
+        query = query.where(MentionInbox.post_id.in_(body.post_ids))
+    await db.execute(query.values(is_read=True).execution_options(synchronize_session=False))
+    await db.commit()
+    return MentionUnreadCountResponse(unread_count=await _unread_mention_count(db, email))
@@ -1,17 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
 from app.models.user import User
 from app.core.security import verify_token
-from app.services.google_api import get_access_token_from_refresh
+from app.services.google_api import get_user_access_token
+from app.services.http_client import get_http_client, UPLOAD_TIMEOUT
 from app.core.config import settings
 from typing import List, Dict, Any
 import httpx
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/drive", tags=["drive"])
 
-def get_current_user_from_token(token: str, db: Session) -> User:
+async def get_current_user_from_token(token: str, db: AsyncSession) -> User:
     """토큰에서 현재 사용자 가져오기"""
     payload = verify_token(token)
     if not payload:
@@ -21,7 +26,7 @@ def get_current_user_from_token(token: str, db: Session) -> User:
         )
     
     user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = await db.scalar(select(User).where(User.id == int(user_id)))
     
     if not user:
         raise HTTPException(
@@ -35,15 +40,15 @@ def get_current_user_from_token(token: str, db: Session) -> User:
 async def get_folder_contents(
     folder_id: str,
     token: str = Query(..., description="User authentication token"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Google Drive 폴더 내용 가져오기 (로그인한 사용자 계정 사용)"""
-    user = get_current_user_from_token(token, db)
+    user = await get_current_user_from_token(token, db)
 
     # 로그인한 사용자의 refresh token 사용 (Service Account 사용 안 함)
     access_token = None
     if user.google_refresh_token:
-        access_token = await get_access_token_from_refresh(user.google_refresh_token)
+        access_token = await get_user_access_token(user.id, user.google_refresh_token)
 
     if not access_token:
         raise HTTPException(
@@ -52,56 +57,56 @@ async def get_folder_contents(
         )
     
     try:
-        async with httpx.AsyncClient() as client:
-            # 폴더 정보 가져오기
-            folder_response = await client.get(
-                f'https://www.googleapis.com/drive/v3/files/{folder_id}',
-                headers={'Authorization': f'Bearer {access_token}'},
-                params={'fields': 'id,name,mimeType,parents,driveId', 'supportsAllDrives': 'true'}
+        client = get_http_client()
+        # 폴더 정보 가져오기
+        folder_response = await client.get(
+            f'https://www.googleapis.com/drive/v3/files/{folder_id}',
+            headers={'Authorization': f'Bearer {access_token}'},
+            params={'fields': 'id,name,mimeType,parents,driveId', 'supportsAllDrives': 'true'}
+        )
+        
+        if folder_response.status_code != 200:
+            raise HTTPException(
+                status_code=folder_response.status_code,
+                detail="Failed to get folder info"
             )
-            
-            if folder_response.status_code != 200:
-                raise HTTPException(
-                    status_code=folder_response.status_code,
-                    detail="Failed to get folder info"
-                )
-            
-            folder_info = folder_response.json()
-            drive_id = folder_info.get('driveId') or (folder_id if folder_id.startswith('0A') else None)
+        
+        folder_info = folder_response.json()
+        drive_id = folder_info.get('driveId') or (folder_id if folder_id.startswith('0A') else None)
 
-            # 폴더 내 파일 및 하위 폴더 목록 (공유 드라이브 루트 지원)
-            files_params = {
-                'q': f"'{folder_id}' in parents and trashed=false",
-                'fields': 'files(id,name,mimeType,size,modifiedTime,webViewLink,thumbnailLink)',
-                'orderBy': 'folder,name',
-                'supportsAllDrives': 'true',
-                'includeItemsFromAllDrives': 'true'
-            }
-            if drive_id:
-                files_params['driveId'] = drive_id
-                files_params['corpora'] = 'drive'
+        # 폴더 내 파일 및 하위 폴더 목록 (공유 드라이브 루트 지원)
+        files_params = {
+            'q': f"'{folder_id}' in parents and trashed=false",
+            'fields': 'files(id,name,mimeType,size,modifiedTime,webViewLink,thumbnailLink)',
+            'orderBy': 'folder,name',
+            'supportsAllDrives': 'true',
+            'includeItemsFromAllDrives': 'true'
+        }
+        if drive_id:
+            files_params['driveId'] = drive_id
+            files_params['corpora'] = 'drive'
 
-            files_response = await client.get(
-                'https://www.googleapis.com/drive/v3/files',
-                headers={'Authorization': f'Bearer {access_token}'},
-                params=files_params
+        files_response = await client.get(
+            'https://www.googleapis.com/drive/v3/files',
+            headers={'Authorization': f'Bearer {access_token}'},
+            params=files_params
+        )
+        
+        if files_response.status_code != 200:
+            error_text = files_response.text
+            logger.warning("Failed to get folder contents", extra={"status_code": files_response.status_code, "body": error_text[:500]})
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to get folder contents: {error_text}"
             )
-            
-            if files_response.status_code != 200:
-                error_text = files_response.text
-                print(f"[DRIVE] Failed to get folder contents: {files_response.status_code} - {error_text}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Failed to get folder contents: {error_text}"
-                )
-            
-            files_data = files_response.json()
-            
-            return {
-                "folder": folder_info,
-                "contents": files_data.get("files", []),
-                "parent_id": folder_info.get("parents", [None])[0] if folder_info.get("parents") else None
-            }
+        
+        files_data = files_response.json()
+        
+        return {
+            "folder": folder_info,
+            "contents": files_data.get("files", []),
+            "parent_id": folder_info.get("parents", [None])[0] if folder_info.get("parents") else None
+        }
     except httpx.HTTPStatusError as e:
         raise HTTPException(
             status_code=e.response.status_code,
@@ -119,15 +124,15 @@ async def upload_file_to_folder(
     folder_id: str,
     file: UploadFile = File(...),
     token: str = Query(..., description="User authentication token"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """파일을 Google Drive 폴더에 업로드 (로그인한 사용자 계정 사용)"""
-    user = get_current_user_from_token(token, db)
+    user = await get_current_user_from_token(token, db)
 
     # 로그인한 사용자의 refresh token 사용
     access_token = None
     if user.google_refresh_token:
-        access_token = await get_access_token_from_refresh(user.google_refresh_token)
+        access_token = await get_user_access_token(user.id, user.google_refresh_token)
 
     if not access_token:
         raise HTTPException(
@@ -147,17 +152,18 @@ async def upload_file_to_folder(
             f"Content-Type: {file.content_type or 'application/octet-stream'}\r\n\r\n"
         ).encode("utf-8") + content + f"\r\n--{boundary}--".encode("utf-8")
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            r = await client.post(
-                "https://www.googleapis.com/upload/drive/v3/files?uploadType=multipart&supportsAllDrives=true",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Content-Type": f"multipart/related; boundary={boundary}",
-                },
-                content=body,
-            )
+        client = get_http_client()
+        r = await client.post(
+            "https://www.googleapis.com/upload/drive/v3/files?uploadType=multipart&supportsAllDrives=true",
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": f"multipart/related; boundary={boundary}",
+            },
+            content=body,
+            timeout=UPLOAD_TIMEOUT,
+        )
         if r.status_code not in (200, 201):
-            print(f"[DRIVE] Upload error: {r.status_code} - {r.text}")
+            logger.warning("Drive upload failed", extra={"status_code": r.status_code, "body": r.text[:500]})
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Upload failed: {r.text}"
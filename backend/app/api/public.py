@@ -1,23 +1,40 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.db.database import get_db
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.banner import Banner
 from app.models.workspace_course import WorkspaceCourse
 from app.models.post import Post
 from app.schemas.workspace_course import WorkspaceCourseResponse
-from typing import List
+from app.core.config import settings
+from app.services.calendar_feed import get_calendar_dates, calendar_dates_verified_at, ICAL_CACHE_CONTROL
+from app.services import public_cache
+from app.api.public_page import build_public_page_sections
+from datetime import datetime, timezone
+from typing import List, Optional
+import asyncio
+import gzip
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/public", tags=["public"])
 
+# /public/home에 포함할 인기 게시글 수 (커뮤니티 페이지와 동일)
+HOME_POPULAR_POSTS_LIMIT = 3
 @router.get("/banners")
-async def get_public_banners(db: Session = Depends(get_db)):
-    """공개 배너 목록 조회 (활성화된 것만). 이미지 URL은 상대 경로로 반환 (프론트엔드가 same-origin 처리)."""
+async def get_public_banners(request: Request):
+    """공개 배너 목록 조회 (활성화된 것만). 이미지 URL은 상대 경로로 반환 (프론트엔드가 same-origin 처리).
+    관리자 수정 전까지 캐시된 응답을 사용 (ETag/304)."""
+    return await public_cache.cached_json_response(request, public_cache.BANNERS, _build_banners)
+
+
+async def _build_banners(db: AsyncSession) -> list:
     from urllib.parse import quote
 
-    banners = db.query(Banner).filter(
+    banners = (await db.scalars(select(Banner).where(
         Banner.is_active == True
-    ).order_by(Banner.order.asc()).all()
+    ).order_by(Banner.order.asc()))).all()
 
     result = []
     for b in banners:
@@ -37,15 +54,21 @@ async def get_public_banners(db: Session = Depends(get_db)):
             "is_active": b.is_active,
         })
     return result
+
+
 @router.get("/workspace-courses")
-async def get_public_workspace_courses(db: Session = Depends(get_db)):
-    """공개 워크스페이스 클래스 목록 조회 (활성화된 것만)"""
-    courses = db.query(WorkspaceCourse).filter(
+async def get_public_workspace_courses(request: Request):
+    """공개 워크스페이스 클래스 목록 조회 (활성화된 것만, 캐시)"""
+    return await public_cache.cached_json_response(request, public_cache.WORKSPACE_COURSES, _build_workspace_courses)
+
+
+async def _build_workspace_courses(db: AsyncSession) -> list:
+    courses = (await db.scalars(select(WorkspaceCourse).where(
         WorkspaceCourse.is_active == True
     ).order_by(
         WorkspaceCourse.start_date.desc().nullslast(),
         WorkspaceCourse.order.asc()
-    ).all()
+    ))).all()
     
     from urllib.parse import quote
     
@@ -71,56 +94,32 @@ async def get_public_workspace_courses(db: Session = Depends(get_db)):
             "start_date": course.start_date.isoformat() if course.start_date else None,
         })
     
-    print(f"[PUBLIC API] Returning {len(result)} workspace courses")
+    logger.debug("Returning %d workspace courses", len(result), extra={"sample_rate": 0.01})
     return result
 
 
-# GPC 공개 캘린더 ID (Remarkable 섹션용)
-GPC_CALENDAR_ID = "c_ed59ae41705238343c6d33009246ce0b3497cef9136701a502cd17fe42b03e5a@group.calendar.google.com"
-ICAL_URL = f"https://calendar.google.com/calendar/ical/{GPC_CALENDAR_ID.replace('@', '%40')}/public/basic.ics"
-
-
 @router.get("/calendar-event-dates")
-async def get_calendar_event_dates():
-    """공개 Google 캘린더에서 이벤트가 있는 날짜 목록 반환 (YYYY-MM-DD). CORS 우회용."""
-    import httpx
-    import re
-    from datetime import datetime
-
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            r = await client.get(ICAL_URL)
-            r.raise_for_status()
-            text = r.text
-    except Exception as e:
-        print(f"[PUBLIC] Failed to fetch ical: {e}")
-        return {"dates": []}
-
-    dates = set()
-    # DTSTART 값 파싱 (날짜만)
-    for m in re.finditer(r"DTSTART(?:;.*?)?:(\d{8})", text):
-        dstr = m.group(1)
-        try:
-            dt = datetime.strptime(dstr, "%Y%m%d")
-            dates.add(dt.strftime("%Y-%m-%d"))
-        except ValueError:
-            pass
-    for m in re.finditer(r"DTSTART(?:;.*?)?:(\d{4}-\d{2}-\d{2})", text):
-        dates.add(m.group(1))
-    # DTSTART with time: 20250115T090000
-    for m in re.finditer(r"DTSTART(?:;.*?)?:(\d{4})(\d{2})(\d{2})T", text):
-        dates.add(f"{m.group(1)}-{m.group(2)}-{m.group(3)}")
-
-    return {"dates": sorted(dates)}
+async def get_calendar_event_dates(request: Request):
+    """공개 Google 캘린더에서 이벤트가 있는 날짜 목록 반환 (YYYY-MM-DD). CORS 우회용.
+    백그라운드에서 갱신되는 캐시를 사용하며, ETag로 재검증 시 304 반환."""
+    dates, etag = await get_calendar_dates()
+    headers = {"ETag": etag, "Cache-Control": ICAL_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse({"dates": dates}, headers=headers)
 
 
 @router.get("/pinned-notices")
-async def get_pinned_notices(db: Session = Depends(get_db)):
-    """고정된 Notice 게시글 목록 조회 (메인 페이지 배너 밑 노출용)"""
-    posts = db.query(Post).filter(
+async def get_pinned_notices(request: Request):
+    """고정된 Notice 게시글 목록 조회 (메인 페이지 배너 밑 노출용, 캐시)"""
+    return await public_cache.cached_json_response(request, public_cache.PINNED_NOTICES, _build_pinned_notices)
+
+
+async def _build_pinned_notices(db: AsyncSession) -> list:
+    posts = (await db.scalars(select(Post).where(
         Post.post_type == "notice",
         Post.is_pinned == True
-    ).order_by(desc(Post.created_at)).limit(10).all()
+    ).order_by(desc(Post.created_at)).limit(10))).all()
 
     result = []
     for p in posts:
@@ -132,3 +131,57 @@ async def get_pinned_notices(db: Session = Depends(get_db)):
             "created_at": p.created_at,
         })
     return result
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat() if ts else None
+
+
+async def _build_home_popular_posts(db: AsyncSession):
+    """인기 게시글 (비로그인 기준이라 is_liked 없음). 순위가 자주 바뀌므로 PUBLIC_POPULAR_POSTS_TTL 동안만 캐시"""
+    from app.api.community import load_popular_posts
+
+    return await load_popular_posts(db, HOME_POPULAR_POSTS_LIMIT)
+
+
+@router.get("/home")
+async def get_public_home(request: Request):
+    """홈 화면 데이터를 한 번에 반환 (배너, 워크스페이스 클래스, 페이지 섹션, 고정 공지, 캘린더 날짜, 인기 게시글).
+    각 섹션은 개별 엔드포인트와 같은 형식이며 공개 캐시에서 동시에 조회한다 (캐시 미스는 섹션마다 별도 세션).
+    meta에 섹션별 ETag와 갱신 시각을 담는다. 전체 ETag로 재검증 시 304, Accept-Encoding이 gzip을 허용하면(q>0) 압축."""
+    cached_sections = (
+        ("banners", public_cache.BANNERS, _build_banners, None),
+        ("workspace_courses", public_cache.WORKSPACE_COURSES, _build_workspace_courses, None),
+        ("page_sections", public_cache.PAGE_SECTIONS, build_public_page_sections, None),
+        ("pinned_notices", public_cache.PINNED_NOTICES, _build_pinned_notices, None),
+        ("popular_posts", public_cache.POPULAR_POSTS, _build_home_popular_posts, settings.PUBLIC_POPULAR_POSTS_TTL),
+    )
+    *entries, (dates, calendar_etag) = await asyncio.gather(
+        *(public_cache.get_cached(key, build, ttl) for _, key, build, ttl in cached_sections),
+        get_calendar_dates(),
+    )
+    # (이름, JSON 바이트, ETag, 갱신 시각)
+    sections = [(name, e.body, e.etag, e.built_at) for (name, _, _, _), e in zip(cached_sections, entries)]
+    sections.insert(4, ("calendar_event_dates", public_cache.dump_json(dates), calendar_etag, calendar_dates_verified_at()))
+
+    etag = public_cache.body_etag("".join(tag for _, _, tag, _ in sections).encode())
+    # 압축본은 다른 표현이므로 ETag를 구분 (재검증은 어느 쪽이든 일치하면 304)
+    gzip_etag = etag[:-1] + '-gzip"'
+    use_gzip = public_cache.accepts_gzip(request.headers.get("accept-encoding"))
+    headers = {"Cache-Control": public_cache.PUBLIC_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match")
+    if public_cache.etag_matches(if_none_match, etag) or public_cache.etag_matches(if_none_match, gzip_etag):
+        headers["ETag"] = gzip_etag if use_gzip else etag
+        return Response(status_code=304, headers=headers)
+
+    meta = {name: {"etag": tag, "updated_at": _iso(ts)} for name, _, tag, ts in sections}
+    # 캐시된 섹션 JSON 바이트를 다시 파싱하지 않고 그대로 이어 붙인다
+    body = b"{" + b",".join(b'"%s":%s' % (name.encode(), data) for name, data, _, _ in sections)
+    body += b',"meta":' + public_cache.dump_json(meta) + b"}"
+    if use_gzip:
+        body = gzip.compress(body, compresslevel=6, mtime=0)
+        headers["Content-Encoding"] = "gzip"
+        headers["ETag"] = gzip_etag
+    else:
+        headers["ETag"] = etag
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,16 +1,21 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from fastapi import APIRouter, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.page_section import PageSection
 from app.schemas.page_section import PageSectionResponse
+from app.services import public_cache
 from typing import List
 
 router = APIRouter(prefix="/public/page-sections", tags=["public"])
 
 @router.get("", response_model=List[PageSectionResponse])
-async def get_public_page_sections(db: Session = Depends(get_db)):
-    """공개 페이지 섹션 조회 (활성화된 섹션만)"""
-    sections = db.query(PageSection).filter(
+async def get_public_page_sections(request: Request):
+    """공개 페이지 섹션 조회 (활성화된 섹션만, 캐시)"""
+    return await public_cache.cached_json_response(request, public_cache.PAGE_SECTIONS, build_public_page_sections)
+
+
+async def build_public_page_sections(db: AsyncSession) -> list:
+    sections = (await db.scalars(select(PageSection).where(
         PageSection.is_active == True
-    ).order_by(PageSection.order.asc()).all()
-    return sections
+    ).order_by(PageSection.order.asc()))).all()
+    return [PageSectionResponse.model_validate(s) for s in sections]
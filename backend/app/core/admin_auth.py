@@ -1,7 +1,8 @@
 """관리자 인증 유틸리티"""
 from fastapi import Depends, HTTPException, status, Header
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
 from app.models.admin import Admin
 from app.core.security import create_access_token
 from datetime import timedelta
@@ -21,9 +22,9 @@ def verify_admin_token(token: str) -> dict:
     
     return payload
 
-def get_current_admin(
+async def get_current_admin(
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Admin:
     """현재 관리자 가져오기 (Header에서 토큰 추출)"""
     if not authorization:
@@ -51,7 +52,7 @@ def get_current_admin(
         )
     
     admin_id = payload.get("sub")
-    admin = db.query(Admin).filter(Admin.id == int(admin_id)).first()
+    admin = await db.scalar(select(Admin).where(Admin.id == int(admin_id)))
     
     if not admin or not admin.is_active:
         raise HTTPException(
@@ -61,9 +62,9 @@ def get_current_admin(
     
     return admin
 
-def require_admin_dep(
+async def require_admin_dep(
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Admin:
     """관리자 권한이 필요한 엔드포인트용 의존성"""
-    return get_current_admin(authorization, db)
+    return await get_current_admin(authorization, db)
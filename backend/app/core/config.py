@@ -8,15 +8,58 @@ env_path = Path(__file__).parent.parent.parent / ".env"
 
 class Settings(BaseSettings):
     DATABASE_URL: str = os.getenv("DATABASE_URL", "postgresql://user:password@db:5432/insighthub")
+    # 비동기(asyncpg) URL. 비어 있으면 DATABASE_URL에서 자동 변환
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+    # 커넥션 풀 (워커 프로세스마다 별도. gunicorn.conf.py 참고)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # 유휴 커넥션이 방화벽/DB 쪽에서 끊기기 전에 교체 (초), 체크아웃 시 살아있는지 확인
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
     SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
+    # 게시글 조회수: 메모리에 모아 두었다가 주기적으로 일괄 반영 (초), 같은 조회자 재조회 무시 창 (초, 0=비활성)
+    VIEW_COUNT_FLUSH_INTERVAL: float = float(os.getenv("VIEW_COUNT_FLUSH_INTERVAL", "10"))
+    VIEW_COUNT_DEDUPE_SECONDS: int = int(os.getenv("VIEW_COUNT_DEDUPE_SECONDS", "600"))
+
+    # @멘션 해석용 사용자 디렉토리(app/services/user_directory.py) 재조회 주기 (초)
+    USER_DIRECTORY_TTL: int = int(os.getenv("USER_DIRECTORY_TTL", "300"))
+
+    # 댓글 트리 (GET /community/posts/{id}/comments/tree): 기본으로 펼칠 답글 깊이와 부모당 답글 수.
+    # 넘는 답글은 /community/comments/{id}/replies로 지연 로드
+    COMMENT_TREE_MAX_DEPTH: int = int(os.getenv("COMMENT_TREE_MAX_DEPTH", "3"))
+    COMMENT_TREE_MAX_REPLIES: int = int(os.getenv("COMMENT_TREE_MAX_REPLIES", "5"))
+
+    # 업로드 이미지 전송을 nginx에 위임 (X-Accel-Redirect 내부 location 접두사, 예: /_uploads/).
+    # 비어 있으면 백엔드가 직접 파일을 전송 (nginx 없이 실행하는 개발 환경)
+    UPLOADS_X_ACCEL_PREFIX: str = os.getenv("UPLOADS_X_ACCEL_PREFIX", "")
+    # 위 내부 location이 alias로 가리키는 디렉토리 (컨테이너 경로)
+    UPLOADS_ROOT: str = os.getenv("UPLOADS_ROOT", "/app/uploads")
+
+    # 공개 홈페이지 API 응답 캐시 (app/services/public_cache.py): 최대 보관 시간 (초),
+    # 워커 간 무효화 표시 파일 디렉토리, 여러 인스턴스가 공유할 Redis (비어 있으면 프로세스 메모리)
+    PUBLIC_CACHE_TTL: int = int(os.getenv("PUBLIC_CACHE_TTL", "300"))
+    # /public/home 인기 게시글 섹션은 좋아요/댓글 수로 순위가 계속 바뀌므로 짧게만 보관 (초)
+    PUBLIC_POPULAR_POSTS_TTL: int = int(os.getenv("PUBLIC_POPULAR_POSTS_TTL", "30"))
+    PUBLIC_CACHE_DIR: str = os.getenv("PUBLIC_CACHE_DIR", "/tmp/public_cache")
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
+
+    # 로깅: 기본 레벨, 모듈별 레벨("app.api.auth=DEBUG,sqlalchemy.engine=WARNING"), 형식(json|text),
+    # DEBUG 로그 샘플링 비율 (1.0=전부)
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")
+    LOG_DEBUG_SAMPLE_RATE: float = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+
     # Google OAuth Settings
     GOOGLE_CLIENT_ID: str = os.getenv("GOOGLE_CLIENT_ID", "")
     GOOGLE_CLIENT_SECRET: str = os.getenv("GOOGLE_CLIENT_SECRET", "")
     GOOGLE_REDIRECT_URI: str = os.getenv("GOOGLE_REDIRECT_URI", "http://localhost:8000/auth/callback")
+    GOOGLE_TOKEN_URL: str = os.getenv("GOOGLE_TOKEN_URL", "https://oauth2.googleapis.com/token")
 
     # Service account for Drive (share folder with service account email to fix 403)
     GOOGLE_SERVICE_ACCOUNT_JSON: Optional[str] = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON", "")  # Path or JSON string
@@ -0,0 +1,155 @@
+"""
+구조화(JSON) 로깅 설정
+
+- 모든 로그는 QueueHandler로 큐에 넣고 별도 스레드(QueueListener)가 stdout에 쓴다.
+  요청 처리 중(이벤트 루프) 로그 호출이 stdout 쓰기 때문에 블로킹되지 않는다.
+- 한 줄에 JSON 하나: ts, level, logger, message, request_id, (exc_info), extra로 넘긴 필드.
+- 요청 ID: RequestIdMiddleware가 X-Request-ID(없으면 새로 생성)를 contextvar에 넣고 응답 헤더로 돌려준다.
+- 모듈별 레벨: LOG_LEVELS="app.api.auth=DEBUG,sqlalchemy.engine=WARNING"
+- 샘플링: DEBUG 로그는 LOG_DEBUG_SAMPLE_RATE 비율만 남긴다. 개별 로그는 extra={"sample_rate": 0.01}로 지정.
+
+사용: 모듈에서 `logger = logging.getLogger(__name__)` 후 logger.info("...", extra={...})
+"""
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.config import settings
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# LogRecord 기본 속성 (이 외의 속성은 extra로 넘긴 필드로 보고 JSON에 포함)
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id", "sample_rate"}
+
+# 외부 호출마다 INFO를 남기는 라이브러리 (LOG_LEVELS로 덮어쓸 수 있음)
+_QUIET_LOGGERS = {"httpx": "WARNING", "httpcore": "WARNING"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _ContextFilter(logging.Filter):
+    """호출한 쪽(요청 컨텍스트)에서 요청 ID를 붙이고 DEBUG 로그를 샘플링"""
+
+    def __init__(self, debug_sample_rate: float):
+        super().__init__()
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = getattr(record, "sample_rate", None)
+        if rate is None and record.levelno <= logging.DEBUG:
+            rate = self.debug_sample_rate
+        if rate is not None and rate < 1.0 and random.random() >= rate:
+            return False
+        record.request_id = request_id_var.get()
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지/예외는 호출 시점에 문자열로 만들어 두고 포맷(JSON)은 리스너 스레드에서
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+def _parse_levels(spec: str) -> dict:
+    levels = {}
+    for item in spec.split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging() -> None:
+    """루트 로거를 큐 기반 JSON(또는 LOG_FORMAT=text) 출력으로 설정. 여러 번 호출해도 한 번만 적용"""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "text":
+        stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] [%(request_id)s] %(message)s"))
+    else:
+        stream.setFormatter(JsonFormatter())
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(_ContextFilter(settings.LOG_DEBUG_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+    for name, level in {**_QUIET_LOGGERS, **_parse_levels(settings.LOG_LEVELS)}.items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=False)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """남은 로그를 모두 쓰고 리스너 스레드 종료 (앱 shutdown 훅)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """X-Request-ID를 요청 컨텍스트에 설정하고 응답 헤더로 돌려준다 (nginx $request_id 등 상위 값 우선)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = None
+        for key, value in scope.get("headers", ()):
+            if key == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"].append((b"x-request-id", request_id.encode("latin-1")))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,202 @@
+"""
+요청 단위 성능 지표 (Prometheus)
+
+- HTTP: 라우트(경로 템플릿)별 지연시간 히스토그램, 진행 중 요청 수
+- SQL: 요청 하나에서 실행한 쿼리 수/총 실행 시간 (SQLAlchemy 엔진 이벤트 + contextvar로 요청에 귀속)
+- Google API: 공유 httpx 클라이언트의 외부 호출 지연시간/상태 (엔드포인트는 ID를 {id}로 치환)
+- 공개 홈페이지 API 응답 캐시 적중/미스/304
+
+gunicorn 다중 워커에서는 PROMETHEUS_MULTIPROC_DIR(gunicorn.conf.py에서 설정)에 워커별 값을 쓰고
+/metrics가 모든 워커 값을 합쳐서 보여준다. 환경변수가 없으면(단일 프로세스) 기본 레지스트리를 쓴다.
+"""
+import os
+import re
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+import httpx
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from starlette.responses import Response
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route", "status"], buckets=_LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests currently being handled",
+    multiprocess_mode="livesum",
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "SQL statements executed while handling one request",
+    ["route"], buckets=_QUERY_COUNT_BUCKETS,
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_query_seconds_per_request", "Total SQL execution time while handling one request",
+    ["route"], buckets=_LATENCY_BUCKETS,
+)
+DB_QUERIES_TOTAL = Counter(
+    "db_queries_total", "SQL statements executed, by route (background tasks use route=\"-\")",
+    ["route"],
+)
+GOOGLE_API_DURATION = Histogram(
+    "google_api_request_duration_seconds", "Outbound Google API latency (until response headers)",
+    ["method", "host", "endpoint", "status"], buckets=_LATENCY_BUCKETS,
+)
+PUBLIC_CACHE_REQUESTS = Counter(
+    "public_cache_requests_total", "Public homepage API cache lookups (hit, miss) and 304 replies (not_modified)",
+    ["key", "result"],
+)
+
+
+class _RequestStats:
+    __slots__ = ("queries", "query_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+# 현재 요청의 SQL 통계. 미들웨어가 요청마다 새 객체를 넣고, 엔진 이벤트가 여기에 누적
+_request_stats: ContextVar[Optional[_RequestStats]] = ContextVar("request_stats", default=None)
+
+
+# --- SQL (engine events) ---
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = _request_stats.get()
+    if stats is None:
+        DB_QUERIES_TOTAL.labels(route="-").inc()
+        return
+    stats.queries += 1
+    stats.query_seconds += elapsed
+
+
+def _handle_error(exception_context):
+    # 실패한 쿼리는 after_cursor_execute가 호출되지 않으므로 시작 시각만 정리
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def instrument_engine(sync_engine) -> None:
+    """SQLAlchemy (동기) 엔진에 쿼리 계측 이벤트 등록. 비동기 엔진은 .sync_engine을 넘긴다"""
+    if getattr(sync_engine, "_metrics_instrumented", False):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+    sync_engine._metrics_instrumented = True
+
+
+# --- HTTP (ASGI middleware) ---
+
+class MetricsMiddleware:
+    """라우트별 지연시간과 요청당 SQL 수/시간 기록 (순수 ASGI 미들웨어: 응답 스트리밍에 끼어들지 않음)"""
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Dict[object, str] = {}
+
+    def _route_template(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            # 엔드포인트 함수 -> 경로 템플릿 (/community/posts/{post_id}). 라벨 수를 라우트 수로 제한
+            for route in scope["app"].routes:
+                if getattr(route, "endpoint", None) is endpoint:
+                    path = route.path
+                    break
+            path = path or getattr(endpoint, "__name__", "unknown")
+            self._route_paths[endpoint] = path
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        stats = _RequestStats()
+        token = _request_stats.set(stats)
+        status_holder = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            _request_stats.reset(token)
+            route = self._route_template(scope)
+            HTTP_REQUEST_DURATION.labels(scope["method"], route, str(status_holder["status"])).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(route).observe(stats.queries)
+            DB_TIME_PER_REQUEST.labels(route).observe(stats.query_seconds)
+            if stats.queries:
+                DB_QUERIES_TOTAL.labels(route).inc(stats.queries)
+
+
+# --- Google API (httpx transport) ---
+
+_ID_SEGMENT_RE = re.compile(r"^(?=.*\d)[\w.\-@%]{6,}$|^[\w\-]{20,}$|@|%40")
+
+
+def _endpoint_template(path: str) -> str:
+    """/v1/courses/123456/courseWork -> /v1/courses/{id}/courseWork"""
+    parts = [("{id}" if _ID_SEGMENT_RE.search(p) else p) for p in path.split("/")]
+    return "/".join(parts)
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """외부 호출 지연시간/상태 기록. 타임아웃/연결 실패도 status="error"로 남긴다"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._transport.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            GOOGLE_API_DURATION.labels(
+                request.method, request.url.host, _endpoint_template(request.url.path), status
+            ).observe(time.perf_counter() - start)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+# --- /metrics ---
+
+def metrics_response() -> Response:
+    """Prometheus 텍스트 형식 응답 (다중 워커면 모든 워커 값을 합산)"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        data = generate_latest(registry)
+    else:
+        data = generate_latest()
+    return Response(content=data, media_type=CONTENT_TYPE_LATEST)
@@ -1,21 +1,56 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
+import logging
 from sqlalchemy import text
 from app.core.config import settings
-from app.db.database import engine
+from app.db.database import engine, async_engine
+from app.core.logging_config import RequestIdMiddleware, setup_logging, shutdown_logging
+from app.core.metrics import MetricsMiddleware, instrument_engine, metrics_response
+from app.services.http_client import start_http_client, close_http_client
+from app.services.calendar_feed import start_calendar_refresher, stop_calendar_refresher
+from app.services.view_counter import start_view_counter, stop_view_counter
+from app.services.public_cache import close_public_cache
 from app.api import auth, classroom, calendar, admin_auth, admin_banner, admin_course, admin_upload, admin_page, public, public_page, community, drive
 
 
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# 여러 워커/컨테이너가 동시에 시작할 때 스키마 보정을 한 곳에서만 하도록 쓰는 advisory lock 키
+_STARTUP_LOCK_KEY = 7_301_001
+
+
 def _ensure_posts_columns():
-    """Ensure posts table has is_resolved and like_count (for DBs created before these columns existed)."""
+    """Ensure posts table has is_resolved, like_count and comment_count (for DBs created before these columns existed).
+    Counters added here start at 0; run scripts/reconcile_post_counters.py to backfill them.
+    Runs under a blocking transaction-level advisory lock and only ALTERs missing columns: the other workers
+    wait for the first one to commit and then find the columns already there, so none serves requests
+    before the columns exist and starting N workers does not take N exclusive locks on posts."""
+    columns = {
+        "is_resolved": "BOOLEAN DEFAULT false",
+        "like_count": "INTEGER DEFAULT 0",
+        "comment_count": "INTEGER DEFAULT 0",
+    }
     try:
         with engine.begin() as conn:
-            conn.execute(text("ALTER TABLE posts ADD COLUMN IF NOT EXISTS is_resolved BOOLEAN DEFAULT false"))
-            conn.execute(text("ALTER TABLE posts ADD COLUMN IF NOT EXISTS like_count INTEGER DEFAULT 0"))
+            # 다른 워커가 진행 중이면 커밋될 때까지 대기
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _STARTUP_LOCK_KEY})
+            existing = set(conn.execute(text(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_schema = current_schema() AND table_name = 'posts'"
+            )).scalars())
+            if not existing:
+                # Table might not exist yet (migrations not run)
+                return
+            for name, ddl in columns.items():
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE posts ADD COLUMN IF NOT EXISTS {name} {ddl}"))
     except Exception:
-        # Table might not exist yet (migrations not run)
-        pass
+        logger.exception("Failed to ensure posts columns")
+    finally:
+        # 워커는 이후 비동기 엔진만 사용하므로 동기 풀에 남은 커넥션 반환
+        engine.dispose()
 
 
 app = FastAPI(
@@ -42,6 +77,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청별 지연시간/SQL 수 계측 (가장 바깥 미들웨어로 등록해 전체 처리 시간을 잰다)
+instrument_engine(async_engine.sync_engine)
+app.add_middleware(MetricsMiddleware)
+# 요청 ID는 그보다 바깥에서 설정 (지표 미들웨어/핸들러의 로그에도 request_id가 붙는다)
+app.add_middleware(RequestIdMiddleware)
+
 # 라우터 등록
 app.include_router(auth.router)
 app.include_router(classroom.router)
@@ -61,6 +102,22 @@ def startup():
     _ensure_posts_columns()
 
 
+@app.on_event("startup")
+async def startup_services():
+    await start_http_client()
+    await start_calendar_refresher()
+    await start_view_counter()
+
+
+@app.on_event("shutdown")
+async def shutdown_services():
+    await stop_view_counter()
+    await stop_calendar_refresher()
+    await close_http_client()
+    await close_public_cache()
+    shutdown_logging()
+
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to GF Lab API"}
@@ -68,3 +125,8 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 지표 (nginx에서는 외부 노출 차단, 내부 네트워크에서 backend:8000/metrics로 수집)"""
+    return metrics_response()
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Enum as SQLEnum
-from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Enum as SQLEnum, Index, UniqueConstraint, Computed
+from sqlalchemy.sql import func, text
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from app.db.database import Base
 import enum
 
@@ -12,6 +13,12 @@ class PostType(str, enum.Enum):
 class Post(Base):
     """게시글 모델"""
     __tablename__ = "posts"
+    __table_args__ = (
+        Index("ix_posts_is_pinned_created_at_id", "is_pinned", "created_at", "id"),
+        Index("ix_posts_post_type_is_pinned_created_at_id", "post_type", "is_pinned", "created_at", "id"),
+        Index("ix_posts_post_type_like_count", "post_type", "like_count", "created_at"),
+        Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     post_type = Column(SQLEnum(PostType), nullable=False)  # notice, forum, request
@@ -20,14 +27,23 @@ class Post(Base):
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     author_email = Column(String, nullable=False)  # 작성자 이메일 (사용자 정보 조회용)
     author_name = Column(String, nullable=True)  # 작성자 이름
-    is_pinned = Column(Boolean, default=False)  # 공지사항 고정
+    is_pinned = Column(Boolean, default=False, nullable=False)  # 공지사항 고정
     view_count = Column(Integer, default=0)  # 조회수
     image_url = Column(String, nullable=True)  # 첨부 이미지 URL
     image_sizes = Column(String, nullable=True)  # 이미지별 표시 크기 (full/original/small) JSON 배열
-    like_count = Column(Integer, default=0)  # 좋아요 수
+    like_count = Column(Integer, default=0, nullable=False)  # 좋아요 수 (좋아요 토글 시 증감)
+    comment_count = Column(Integer, default=0, nullable=False)  # 댓글 수 (댓글 작성 시 증가)
     is_resolved = Column(Boolean, default=False)  # Request 해결 여부
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # 검색용 tsvector (DB 생성 컬럼, alembic 008의 hangul_bigrams 함수 사용). 목록 조회 시 로드하지 않음
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', hangul_bigrams(title)), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(content, '')), 'B') || "
+        "setweight(to_tsvector('simple', hangul_bigrams(content)), 'B')",
+        persisted=True
+    )))
     
     # 관계
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
@@ -38,6 +54,12 @@ class Post(Base):
 class Comment(Base):
     """댓글 모델"""
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_post_id_created_at", "post_id", "created_at"),
+        # 댓글 트리: 최상위 댓글 키셋, 부모별 답글 조회
+        Index("ix_comments_post_id_top_level", "post_id", "created_at", "id", postgresql_where=text("parent_id IS NULL")),
+        Index("ix_comments_parent_id_created_at_id", "parent_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)
@@ -68,6 +90,10 @@ class Tag(Base):
 class PostTag(Base):
     """게시글-태그 연결 테이블"""
     __tablename__ = "post_tags"
+    __table_args__ = (
+        Index("ix_post_tags_post_id", "post_id"),
+        Index("ix_post_tags_tag_id_post_id", "tag_id", "post_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)
@@ -80,6 +106,9 @@ class PostTag(Base):
 class PostMention(Base):
     """게시글에서 사용자 언급"""
     __tablename__ = "post_mentions"
+    __table_args__ = (
+        Index("ix_post_mentions_post_id", "post_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)
@@ -92,6 +121,9 @@ class PostMention(Base):
 class CommentMention(Base):
     """댓글에서 사용자 언급"""
     __tablename__ = "comment_mentions"
+    __table_args__ = (
+        Index("ix_comment_mentions_comment_id", "comment_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     comment_id = Column(Integer, ForeignKey("comments.id"), nullable=False)
@@ -101,9 +133,31 @@ class CommentMention(Base):
     # 관계
     comment = relationship("Comment", back_populates="mentions")
 
+class MentionInbox(Base):
+    """사용자별 멘션 알림함 (멘션된 게시글당 한 행, 게시글/댓글 작성 시 채움)
+    댓글에서 다시 멘션되면 mentioned_at/comment_id/actor를 최신 멘션으로 갱신하고 안 읽음으로 되돌린다."""
+    __tablename__ = "mention_inbox"
+    __table_args__ = (
+        UniqueConstraint("mentioned_email", "post_id", name="uq_mention_inbox_email_post"),
+        Index("ix_mention_inbox_email_mentioned_at_id", "mentioned_email", "mentioned_at", "id"),
+        Index("ix_mention_inbox_email_unread", "mentioned_email", postgresql_where=text("NOT is_read")),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    mentioned_email = Column(String, nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
+    comment_id = Column(Integer, ForeignKey("comments.id", ondelete="SET NULL"), nullable=True)  # 최신 멘션이 댓글이면 해당 댓글
+    actor_email = Column(String, nullable=False)  # 최신 멘션 작성자
+    actor_name = Column(String, nullable=True)
+    is_read = Column(Boolean, default=False, server_default="false", nullable=False)
+    mentioned_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
 class PostLike(Base):
     """게시글 좋아요"""
     __tablename__ = "post_likes"
+    __table_args__ = (
+        UniqueConstraint("post_id", "user_id", name="uq_post_likes"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String
+from app.db.database import Base
+
+class UploadRef(Base):
+    """업로드 파일 참조 수 (posts/banners/workspace_courses/page_sections 행 중 URL로 이 파일을 가리키는 수).
+    행을 쓰는 트랜잭션에서 app.services.uploads.update_upload_refs로 증감하고, 0이 된 파일만 삭제한다."""
+    __tablename__ = "upload_refs"
+
+    # URL의 파일명 (blob은 `{sha256}{ext}`, 예전 파일은 `{timestamp}_{filename}`, URL 디코딩된 형태)
+    name = Column(String, primary_key=True)
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
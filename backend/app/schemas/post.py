@@ -65,6 +65,18 @@ class CommentResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class CommentTreeNode(CommentResponse):
+    reply_count: int = 0  # 직접 답글 수 (replies에 모두 담기지 않았을 수 있음)
+    replies: List["CommentTreeNode"] = []
+    # reply_count > len(replies)면 나머지는 /community/comments/{id}/replies?cursor=replies_cursor로
+    # (깊이 제한으로 replies가 비어 있으면 cursor 없이)
+    replies_cursor: Optional[str] = None
+
+class CommentTreeResponse(BaseModel):
+    comments: List[CommentTreeNode]
+    next_cursor: Optional[str] = None  # 다음 페이지 요청 시 cursor로 전달 (마지막 페이지면 None)
+    total: int  # 게시글: 답글 포함 전체 댓글 수, 답글 조회: 직접 답글 수
+
 class PostResponse(BaseModel):
     id: int
     post_type: PostType
@@ -85,12 +97,24 @@ class PostResponse(BaseModel):
     tags: List[TagResponse] = []
     mentions: List[MentionResponse] = []
     comment_count: int = 0
+    search_snippet: Optional[str] = None  # 검색 시 본문 발췌 (HTML 이스케이프 + 검색어 <mark> 강조)
     
     class Config:
         from_attributes = True
 
 class PostListResponse(BaseModel):
     posts: List[PostResponse]
-    total: int
+    total: Optional[int] = None  # 커서 모드에서는 include_total=true일 때만 (추정치)
     page: int
     page_size: int
+    next_cursor: Optional[str] = None  # 커서 모드: 다음 페이지 요청 시 cursor로 전달 (마지막 페이지면 None)
+    total_is_estimate: bool = False
+
+class MentionedPostListResponse(PostListResponse):
+    unread_post_ids: List[int] = []  # 이 페이지 중 안 읽은 멘션이 있는 게시글
+
+class MentionReadRequest(BaseModel):
+    post_ids: Optional[List[int]] = None  # 생략하면 전체 읽음 처리
+
+class MentionUnreadCountResponse(BaseModel):
+    unread_count: int
@@ -0,0 +1,146 @@
+"""
+GPC 공개 캘린더(iCal) 이벤트 날짜 캐시
+
+홈페이지 요청마다 basic.ics 전체를 내려받아 파싱하지 않도록, 파싱된 날짜 목록을 메모리에 두고
+백그라운드 태스크가 주기적으로 조건부 GET(ETag / Last-Modified)으로 갱신한다.
+업스트림이 느리거나 실패하면 마지막으로 받은 데이터를 그대로 제공한다.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from app.services.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# GPC 공개 캘린더 ID (Remarkable 섹션용)
+GPC_CALENDAR_ID = "c_ed59ae41705238343c6d33009246ce0b3497cef9136701a502cd17fe42b03e5a@group.calendar.google.com"
+ICAL_URL = f"https://calendar.google.com/calendar/ical/{GPC_CALENDAR_ID.replace('@', '%40')}/public/basic.ics"
+
+ICAL_REFRESH_INTERVAL = 300  # 백그라운드 갱신 주기 (초)
+ICAL_FETCH_TIMEOUT = 10.0
+# 브라우저/nginx 캐시 정책: 갱신 주기만큼 fresh, 이후에는 재검증하는 동안 stale 허용
+ICAL_CACHE_CONTROL = f"public, max-age={ICAL_REFRESH_INTERVAL}, stale-while-revalidate={ICAL_REFRESH_INTERVAL * 2}"
+
+
+def _dates_etag(dates: List[str]) -> str:
+    digest = hashlib.sha1(json.dumps(dates).encode("utf-8")).hexdigest()[:16]
+    return f'"{digest}"'
+
+
+class _CalendarDatesCache:
+    def __init__(self):
+        self.dates: List[str] = []
+        self.etag: str = _dates_etag([])
+        self.loaded = False
+        # 마지막 업스트림 요청 시각 (성공/실패 무관, monotonic). 장애 중에도 갱신 주기마다 한 번만 재시도
+        self.attempted_at: float = 0.0
+        # 업스트림과 마지막으로 일치를 확인한 시각 (epoch 초, 홈 응답의 freshness 메타데이터용)
+        self.verified_at: Optional[float] = None
+        self.upstream_etag: Optional[str] = None
+        self.upstream_last_modified: Optional[str] = None
+        self.lock = asyncio.Lock()
+
+
+_cache = _CalendarDatesCache()
+_refresh_task: Optional[asyncio.Task] = None
+
+
+def _parse_event_dates(text: str) -> List[str]:
+    """iCal 본문에서 DTSTART 날짜만 뽑아 YYYY-MM-DD 목록으로 반환"""
+    dates = set()
+    # DTSTART 값 파싱 (날짜만)
+    for m in re.finditer(r"DTSTART(?:;.*?)?:(\d{8})", text):
+        dstr = m.group(1)
+        try:
+            dt = datetime.strptime(dstr, "%Y%m%d")
+            dates.add(dt.strftime("%Y-%m-%d"))
+        except ValueError:
+            pass
+    for m in re.finditer(r"DTSTART(?:;.*?)?:(\d{4}-\d{2}-\d{2})", text):
+        dates.add(m.group(1))
+    # DTSTART with time: 20250115T090000
+    for m in re.finditer(r"DTSTART(?:;.*?)?:(\d{4})(\d{2})(\d{2})T", text):
+        dates.add(f"{m.group(1)}-{m.group(2)}-{m.group(3)}")
+    return sorted(dates)
+
+
+async def refresh_calendar_dates(max_age: Optional[float] = None) -> None:
+    """업스트림 iCal 조건부 GET. 실패 시 기존 데이터 유지.
+    max_age를 주면 그 시간 안에 이미 시도한 경우(락 대기 중 다른 태스크가 갱신, 또는 실패 직후) 건너뛴다."""
+    async with _cache.lock:
+        if max_age is not None and _cache.attempted_at and time.monotonic() - _cache.attempted_at < max_age:
+            return
+        _cache.attempted_at = time.monotonic()
+        headers = {}
+        if _cache.loaded:
+            if _cache.upstream_etag:
+                headers["If-None-Match"] = _cache.upstream_etag
+            if _cache.upstream_last_modified:
+                headers["If-Modified-Since"] = _cache.upstream_last_modified
+        try:
+            client = get_http_client()
+            r = await client.get(ICAL_URL, headers=headers, timeout=ICAL_FETCH_TIMEOUT)
+            if r.status_code == 304:
+                _cache.verified_at = time.time()
+                return
+            r.raise_for_status()
+            text = r.text
+        except Exception as e:
+            logger.warning("Failed to fetch ical (serving cached dates): %s", e)
+            return
+
+        dates = await asyncio.to_thread(_parse_event_dates, text)
+        _cache.dates = dates
+        _cache.etag = _dates_etag(dates)
+        _cache.upstream_etag = r.headers.get("ETag")
+        _cache.upstream_last_modified = r.headers.get("Last-Modified")
+        _cache.verified_at = time.time()
+        _cache.loaded = True
+
+
+async def get_calendar_dates() -> tuple:
+    """(날짜 목록, 응답용 ETag) 반환. 최초 1회만 요청 경로에서 업스트림을 기다린다."""
+    if _cache.attempted_at == 0.0:
+        # 업스트림 실패 시에는 attempted_at이 남으므로 다음 주기까지 빈 목록 제공 (요청마다 재시도하지 않음)
+        await refresh_calendar_dates(max_age=ICAL_REFRESH_INTERVAL)
+    elif time.monotonic() - _cache.attempted_at > ICAL_REFRESH_INTERVAL * 2 and not _cache.lock.locked():
+        # 백그라운드 갱신이 멈춘 경우 대비: 응답은 stale 데이터로 바로 하고 갱신만 예약.
+        # 실패한 시도도 attempted_at을 갱신하므로 업스트림 장애 중에는 주기당 한 번만 예약된다
+        asyncio.ensure_future(refresh_calendar_dates(max_age=ICAL_REFRESH_INTERVAL))
+    return _cache.dates, _cache.etag
+
+
+def calendar_dates_verified_at() -> Optional[float]:
+    """캐시된 날짜 목록을 업스트림과 마지막으로 확인한 시각 (epoch 초). 한 번도 못 받았으면 None"""
+    return _cache.verified_at
+
+
+async def _refresh_loop() -> None:
+    while True:
+        await refresh_calendar_dates()
+        await asyncio.sleep(ICAL_REFRESH_INTERVAL)
+
+
+async def start_calendar_refresher() -> None:
+    """앱 startup 훅에서 호출"""
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_refresh_loop())
+
+
+async def stop_calendar_refresher() -> None:
+    """앱 shutdown 훅에서 호출"""
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
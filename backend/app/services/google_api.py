@@ -1,8 +1,21 @@
-import httpx
+import asyncio
+import hashlib
 import json
+import logging
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable, TypeVar
 from app.core.config import settings
+from app.services.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class GoogleUnauthorizedError(Exception):
+    """Google API가 access token을 거부함 (401: 만료 전 폐기/교체된 토큰)"""
+
 
 # Service account credentials (lazy load)
 _service_account_credentials = None
@@ -28,114 +41,217 @@ def _get_service_account_access_token(write: bool = False) -> Optional[str]:
         creds.refresh(Request())
         return creds.token
     except Exception as e:
-        print(f"[GOOGLE_API] Service account token error: {e}")
+        logger.warning("Service account token error: %s", e)
         return None
 
 
-async def get_access_token_from_refresh(refresh_token: str) -> Optional[str]:
-    """Refresh token을 사용하여 새로운 access token 가져오기"""
+async def _request_access_token(refresh_token: str) -> Optional[Dict[str, Any]]:
+    """토큰 엔드포인트에 refresh token 교환 요청 (응답 JSON 전체 반환)"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                'https://oauth2.googleapis.com/token',
-                data={
-                    'client_id': settings.GOOGLE_CLIENT_ID,
-                    'client_secret': settings.GOOGLE_CLIENT_SECRET,
-                    'refresh_token': refresh_token,
-                    'grant_type': 'refresh_token'
-                }
-            )
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('access_token')
+        client = get_http_client()
+        response = await client.post(
+            settings.GOOGLE_TOKEN_URL,
+            data={
+                'client_id': settings.GOOGLE_CLIENT_ID,
+                'client_secret': settings.GOOGLE_CLIENT_SECRET,
+                'refresh_token': refresh_token,
+                'grant_type': 'refresh_token'
+            }
+        )
+        if response.status_code == 200:
+            return response.json()
+        logger.warning("Token refresh failed", extra={"status_code": response.status_code, "body": response.text[:200]})
     except Exception as e:
-        print(f"Error refreshing token: {e}")
+        logger.warning("Error refreshing token: %s", e)
     return None
 
+
+async def get_access_token_from_refresh(refresh_token: str) -> Optional[str]:
+    """Refresh token을 사용하여 새로운 access token 가져오기 (캐시 없음)"""
+    data = await _request_access_token(refresh_token)
+    return data.get('access_token') if data else None
+
+
+# 사용자별 access token 캐시: (user_id, refresh token 해시) -> (access_token, 만료 시각(monotonic))
+# refresh token까지 키에 넣어, 교체된 새 refresh token을 가진 요청이 예전(폐기된) 토큰으로 받은 결과를 공유하지 않게 한다
+_TOKEN_REFRESH_SKEW = 120  # 만료 2분 전부터 미리 갱신
+_DEFAULT_EXPIRES_IN = 3600
+_TokenKey = Tuple[int, str]
+_user_token_cache: Dict[_TokenKey, Tuple[str, float]] = {}
+# 진행 중인 갱신 요청: 같은 사용자·같은 refresh token의 동시 요청은 하나의 토큰 요청을 공유
+_user_token_inflight: Dict[_TokenKey, "asyncio.Task[Optional[str]]"] = {}
+
+
+def _token_key(user_id: int, refresh_token: str) -> _TokenKey:
+    return user_id, hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+async def _refresh_user_access_token(key: _TokenKey, refresh_token: str) -> Optional[str]:
+    data = await _request_access_token(refresh_token)
+    if not data or not data.get('access_token'):
+        _user_token_cache.pop(key, None)
+        return None
+    try:
+        expires_in = int(data.get('expires_in') or _DEFAULT_EXPIRES_IN)
+    except (TypeError, ValueError):
+        expires_in = _DEFAULT_EXPIRES_IN
+    access_token = data['access_token']
+    _user_token_cache[key] = (access_token, time.monotonic() + expires_in)
+    return access_token
+
+
+async def get_user_access_token(user_id: int, refresh_token: str) -> Optional[str]:
+    """사용자별 캐시된 access token 반환 (만료 임박 시에만 refresh token 교환)"""
+    key = _token_key(user_id, refresh_token)
+    cached = _user_token_cache.get(key)
+    if cached and cached[1] - _TOKEN_REFRESH_SKEW > time.monotonic():
+        return cached[0]
+
+    task = _user_token_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_refresh_user_access_token(key, refresh_token))
+        _user_token_inflight[key] = task
+        task.add_done_callback(lambda _t, k=key: _user_token_inflight.pop(k, None))
+    # 한 요청이 취소되어도 공유 중인 갱신 작업은 계속 진행
+    return await asyncio.shield(task)
+
+
+def invalidate_user_access_token(user_id: int) -> None:
+    """재인증 등으로 refresh token이 바뀌었거나 Google이 토큰을 거부했을 때 해당 사용자의 캐시 제거"""
+    for key in [k for k in _user_token_cache if k[0] == user_id]:
+        _user_token_cache.pop(key, None)
+
+
+async def call_with_user_access_token(
+    user_id: int, refresh_token: str, access_token: str, call: Callable[[str], Awaitable[T]]
+) -> T:
+    """call(access_token) 실행. Google이 401(GoogleUnauthorizedError)이면 캐시된 토큰을 버리고
+    refresh token으로 새로 교환한 토큰으로 한 번만 재시도 (새 토큰도 못 받으면 원래 예외)"""
+    try:
+        return await call(access_token)
+    except GoogleUnauthorizedError:
+        invalidate_user_access_token(user_id)
+        fresh_token = await get_user_access_token(user_id, refresh_token)
+        if not fresh_token or fresh_token == access_token:
+            raise
+        logger.info("Google rejected cached access token, retrying with a refreshed one", extra={"user_id": user_id})
+        return await call(fresh_token)
+
+# Classroom 코스 목록 조회 시 동시에 보낼 최대 요청 수 (학생/교사/fallback 스트림 합산)
+_CLASSROOM_FETCH_CONCURRENCY = 4
+
+
 async def get_google_classroom_courses(access_token: str) -> List[Dict[str, Any]]:
     """Google Classroom 코스 목록 가져오기 (학생 + 교사 클래스)"""
     try:
-        async with httpx.AsyncClient() as client:
-            seen_ids = set()
-            courses: List[Dict[str, Any]] = []
-            headers = {'Authorization': f'Bearer {access_token}'}
-
-            async def fetch_page(params: dict, page_token: str = None) -> tuple:
-                p = dict(params)
-                if page_token:
-                    p['pageToken'] = page_token
+        client = get_http_client()
+        seen_ids = set()
+        courses: List[Dict[str, Any]] = []
+        headers = {'Authorization': f'Bearer {access_token}'}
+
+        semaphore = asyncio.Semaphore(_CLASSROOM_FETCH_CONCURRENCY)
+
+        async def fetch_page(params: dict, page_token: str = None) -> tuple:
+            p = dict(params)
+            if page_token:
+                p['pageToken'] = page_token
+            async with semaphore:
                 resp = await client.get(
                     'https://classroom.googleapis.com/v1/courses',
                     headers=headers,
                     params=p
                 )
-                if resp.status_code == 403:
-                    raise Exception("403 Forbidden - Google Classroom API permission is required. Please re-authenticate.")
-                if resp.status_code != 200:
-                    print(f"[GOOGLE_API] Classroom API non-200: {resp.status_code} - {resp.text[:200]}")
-                    return [], None
-                data = resp.json()
-                return data.get('courses') or [], data.get('nextPageToken')
-
-            def merge(new_list: List[Dict[str, Any]]):
-                for c in new_list:
-                    cid = c.get('id')
-                    if cid and cid not in seen_ids:
-                        seen_ids.add(cid)
-                        courses.append(c)
-
-            # 1) 학생 클래스 (courseStates 없음 = 모든 상태)
-            page_token = None
-            for _ in range(10):  # max 10 pages
-                batch, page_token = await fetch_page({'studentId': 'me'}, page_token)
-                merge(batch)
-                if not page_token:
-                    break
-            print(f"[GOOGLE_API] Student courses: {len(courses)}")
+            if resp.status_code == 401:
+                raise GoogleUnauthorizedError("Classroom API rejected the access token")
+            if resp.status_code == 403:
+                raise Exception("403 Forbidden - Google Classroom API permission is required. Please re-authenticate.")
+            if resp.status_code != 200:
+                logger.warning("Classroom API error", extra={"status_code": resp.status_code, "body": resp.text[:200]})
+                return [], None
+            data = resp.json()
+            return data.get('courses') or [], data.get('nextPageToken')
 
-            # 2) 교사 클래스
+        async def fetch_stream(params: dict, on_first_page=None) -> List[Dict[str, Any]]:
+            items: List[Dict[str, Any]] = []
             page_token = None
-            for _ in range(10):
-                batch, page_token = await fetch_page({'teacherId': 'me'}, page_token)
-                merge(batch)
+            for i in range(10):  # max 10 pages
+                batch, page_token = await fetch_page(params, page_token)
+                items.extend(batch)
+                if i == 0 and on_first_page:
+                    on_first_page(bool(batch))
                 if not page_token:
                     break
+            return items
+
+        def merge(new_list: List[Dict[str, Any]]):
+            for c in new_list:
+                cid = c.get('id')
+                if cid and cid not in seen_ids:
+                    seen_ids.add(cid)
+                    courses.append(c)
+
+        # 3) fallback: filter 없이 조회 (학생/교사 모두 포함될 수 있음)
+        #    학생/교사 첫 페이지가 둘 다 비면 나머지 페이지를 기다리지 않고 바로 시작
+        fallback_task = None
+        first_pages_empty: List[bool] = []
+
+        def on_first_page(has_items: bool):
+            nonlocal fallback_task
+            first_pages_empty.append(not has_items)
+            if len(first_pages_empty) == 2 and all(first_pages_empty) and fallback_task is None:
+                logger.debug("No courses with studentId/teacherId, trying without filter")
+                fallback_task = asyncio.ensure_future(fetch_stream({}))
+
+        # 1) 학생 클래스 (courseStates 없음 = 모든 상태), 2) 교사 클래스 - 서로 독립이므로 동시에 조회
+        stream_tasks = [
+            asyncio.ensure_future(fetch_stream({'studentId': 'me'}, on_first_page)),
+            asyncio.ensure_future(fetch_stream({'teacherId': 'me'}, on_first_page)),
+        ]
+        try:
+            student_courses, teacher_courses = await asyncio.gather(*stream_tasks)
+            merge(student_courses)
+            merge(teacher_courses)
 
-            # 3) fallback: filter 없이 조회 (학생/교사 모두 포함될 수 있음)
             if not courses:
-                print(f"[GOOGLE_API] No courses with studentId/teacherId, trying without filter...")
-                page_token = None
-                for _ in range(10):
-                    batch, page_token = await fetch_page({}, page_token)
-                    merge(batch)
-                    if not page_token:
-                        break
-
-            print(f"[GOOGLE_API] Total (students+teachers): {len(courses)}")
-            for c in courses[:3]:
-                print(f"[GOOGLE_API] Course: {c.get('name', 'N/A')} (ID: {c.get('id')}, State: {c.get('courseState')})")
-            return courses
+                if fallback_task is None:
+                    logger.debug("No courses with studentId/teacherId, trying without filter")
+                    fallback_task = asyncio.ensure_future(fetch_stream({}))
+                merge(await fallback_task)
+            elif fallback_task is not None:
+                fallback_task.cancel()
+        except BaseException:
+            for t in stream_tasks + [fallback_task]:
+                if t is not None and not t.done():
+                    t.cancel()
+            raise
+
+        logger.debug("Fetched %d classroom courses (students+teachers)", len(courses))
+        return courses
+    except GoogleUnauthorizedError:
+        raise
     except Exception as e:
-        print(f"[GOOGLE_API] Error fetching courses: {e}")
-        import traceback
-        traceback.print_exc()
         if "403" in str(e) or "Forbidden" in str(e):
             raise
+        logger.exception("Error fetching courses")
         return []
 
 async def get_google_classroom_coursework(course_id: str, access_token: str) -> List[Dict[str, Any]]:
     """특정 코스의 과제 목록 가져오기"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f'https://classroom.googleapis.com/v1/courses/{course_id}/courseWork',
-                headers={'Authorization': f'Bearer {access_token}'}
-            )
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('courseWork', [])
+        client = get_http_client()
+        response = await client.get(
+            f'https://classroom.googleapis.com/v1/courses/{course_id}/courseWork',
+            headers={'Authorization': f'Bearer {access_token}'}
+        )
+        if response.status_code == 200:
+            data = response.json()
+            return data.get('courseWork', [])
+        if response.status_code == 401:
+            raise GoogleUnauthorizedError("Classroom API rejected the access token")
+    except GoogleUnauthorizedError:
+        raise
     except Exception as e:
-        print(f"Error fetching coursework: {e}")
+        logger.warning("Error fetching coursework: %s", e, extra={"course_id": course_id})
     return []
 
 async def get_google_calendar_events(access_token: str, max_results: int = 10) -> List[Dict[str, Any]]:
@@ -145,36 +261,34 @@ async def get_google_calendar_events(access_token: str, max_results: int = 10) -
         time_min = datetime.utcnow().isoformat() + 'Z'
         time_max = (datetime.utcnow() + timedelta(days=30)).isoformat() + 'Z'
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                'https://www.googleapis.com/calendar/v3/calendars/primary/events',
-                headers={'Authorization': f'Bearer {access_token}'},
-                params={
-                    'timeMin': time_min,
-                    'timeMax': time_max,
-                    'maxResults': max_results,
-                    'singleEvents': True,
-                    'orderBy': 'startTime'
-                }
-            )
-            
-            print(f"[GOOGLE_API] Calendar API response status: {response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                events = data.get('items', [])
-                print(f"[GOOGLE_API] Found {len(events)} calendar events")
-                return events
-            elif response.status_code == 403:
-                print(f"[GOOGLE_API] 403 Forbidden - Calendar API permission denied")
-                print(f"[GOOGLE_API] Response: {response.text}")
-                # 403 에러는 권한 문제이므로 빈 배열 반환
-                return []
-            else:
-                print(f"[GOOGLE_API] Calendar API error response: {response.status_code} - {response.text}")
-                return []
-    except Exception as e:
-        print(f"[GOOGLE_API] Error fetching calendar events: {e}")
-        import traceback
-        traceback.print_exc()
+        client = get_http_client()
+        response = await client.get(
+            'https://www.googleapis.com/calendar/v3/calendars/primary/events',
+            headers={'Authorization': f'Bearer {access_token}'},
+            params={
+                'timeMin': time_min,
+                'timeMax': time_max,
+                'maxResults': max_results,
+                'singleEvents': True,
+                'orderBy': 'startTime'
+            }
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            events = data.get('items', [])
+            return events
+        elif response.status_code == 401:
+            raise GoogleUnauthorizedError("Calendar API rejected the access token")
+        elif response.status_code == 403:
+            logger.info("Calendar API permission denied (403)")
+            # 403 에러는 권한 문제이므로 빈 배열 반환
+            return []
+        else:
+            logger.warning("Calendar API error", extra={"status_code": response.status_code, "body": response.text[:500]})
+            return []
+    except GoogleUnauthorizedError:
+        raise
+    except Exception:
+        logger.exception("Error fetching calendar events")
     return []
@@ -0,0 +1,52 @@
+"""
+Google API 호출용 공유 httpx.AsyncClient
+
+앱 시작 시 한 번 만들고 종료 시 닫는다. 요청마다 클라이언트를 새로 만들면
+googleapis.com으로 매번 TCP+TLS 핸드셰이크가 발생하므로, 커넥션 풀/keep-alive/HTTP2를 재사용한다.
+"""
+from typing import Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (httpx[http2])
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# 기본 타임아웃: 연결 5초, 읽기/쓰기 15초. 업로드 등은 요청 단위로 timeout= 지정
+DEFAULT_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+UPLOAD_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    from app.core.metrics import InstrumentedTransport
+    # 외부 호출 지연시간/상태를 /metrics에 기록하도록 전송 계층을 감쌈
+    transport = InstrumentedTransport(httpx.AsyncHTTPTransport(http2=_HTTP2_AVAILABLE, limits=_LIMITS))
+    return httpx.AsyncClient(transport=transport, timeout=DEFAULT_TIMEOUT)
+
+
+async def start_http_client() -> None:
+    """앱 startup 훅에서 호출"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+
+
+async def close_http_client() -> None:
+    """앱 shutdown 훅에서 호출"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """공유 클라이언트 반환 (startup 전 호출 시(스크립트 등) 지연 생성)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
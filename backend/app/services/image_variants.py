@@ -0,0 +1,140 @@
+"""
+업로드 이미지 리사이즈 변형(variant) 생성/캐시
+
+`/community/image/{filename}?w=640`처럼 너비를 지정하면 원본 대신 축소된 WebP(브라우저가 지원하지 않으면
+JPEG/PNG)를 돌려준다. 변형은 첫 요청 시 스레드에서 만들어 업로드 디렉토리의 `.variants/`에 저장하고
+이후에는 디스크 캐시를 그대로 사용한다. 업로드 파일명은 업로드마다 고유하므로 immutable 캐시를 건다.
+Pillow가 없으면 항상 원본을 제공한다.
+"""
+import asyncio
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+try:
+    from PIL import Image, ImageOps
+    _PIL_AVAILABLE = True
+except ImportError:
+    _PIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 허용 너비. 임의의 w는 가장 가까운 상위 너비로 맞춰 캐시 파일 수를 제한
+VARIANT_WIDTHS = (320, 640, 1280, 1920)
+VARIANT_DIR_NAME = ".variants"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_WEBP_QUALITY = 80
+_JPEG_QUALITY = 82
+_MAX_SOURCE_PIXELS = 60_000_000
+
+# 같은 변형을 동시에 여러 요청이 만들지 않도록 진행 중인 생성 작업 공유
+_inflight: Dict[Path, asyncio.Task] = {}
+# 축소가 필요 없는(원본이 더 작거나 애니메이션) (원본, 너비) 조합
+_passthrough: Set[Tuple[Path, int]] = set()
+
+if _PIL_AVAILABLE:
+    Image.MAX_IMAGE_PIXELS = _MAX_SOURCE_PIXELS
+
+
+def snap_width(width: int) -> int:
+    """요청 너비를 허용 너비 중 가장 가까운 상위 값으로 (최대값 초과 시 최대값)"""
+    for allowed in VARIANT_WIDTHS:
+        if width <= allowed:
+            return allowed
+    return VARIANT_WIDTHS[-1]
+
+
+def _variant_path(source: Path, width: int, ext: str) -> Path:
+    return source.parent / VARIANT_DIR_NAME / str(width) / f"{source.name}{ext}"
+
+
+def _render_variant(source: Path, width: int, prefer_webp: bool) -> Optional[Path]:
+    """변형 파일을 만들어 경로 반환. 축소할 필요가 없으면 None"""
+    with Image.open(source) as im:
+        if getattr(im, "is_animated", False):
+            return None
+        # JPEG는 디코딩 단계에서 미리 축소 (회전 후에도 너비가 부족하지 않도록 정사각형으로 요청)
+        im.draft("RGB", (width, width))
+        im = ImageOps.exif_transpose(im)
+        if im.width <= width:
+            return None
+        has_alpha = im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info)
+        im = im.convert("RGBA" if has_alpha else "RGB")
+        im.thumbnail((width, im.height), Image.LANCZOS)
+
+        if prefer_webp:
+            ext, save_kwargs = ".webp", {"format": "WEBP", "quality": _WEBP_QUALITY, "method": 4}
+        elif has_alpha:
+            ext, save_kwargs = ".png", {"format": "PNG", "optimize": True}
+        else:
+            ext, save_kwargs = ".jpg", {"format": "JPEG", "quality": _JPEG_QUALITY, "optimize": True, "progressive": True}
+
+        dest = _variant_path(source, width, ext)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=dest.parent, prefix=".variant-", suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                im.save(out, **save_kwargs)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, dest)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return dest
+
+
+def _cached_variant(source: Path, width: int, prefer_webp: bool) -> Optional[Path]:
+    exts = (".webp",) if prefer_webp else (".jpg", ".png")
+    for ext in exts:
+        path = _variant_path(source, width, ext)
+        if path.is_file():
+            return path
+    return None
+
+
+async def get_image_variant(source: Path, width: Optional[int], accept: Optional[str]) -> Path:
+    """요청에 맞는 파일 경로 반환 (변형 또는 원본). 생성 실패 시 원본"""
+    if not width or not _PIL_AVAILABLE or source.suffix.lower() not in (".png", ".jpg", ".jpeg", ".webp", ".gif"):
+        return source
+    width = snap_width(width)
+    if (source, width) in _passthrough:
+        return source
+    prefer_webp = "image/webp" in (accept or "")
+    cached = _cached_variant(source, width, prefer_webp)
+    if cached is not None:
+        return cached
+
+    key = _variant_path(source, width, ".webp" if prefer_webp else "")
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(asyncio.to_thread(_render_variant, source, width, prefer_webp))
+        _inflight[key] = task
+        task.add_done_callback(lambda _t, k=key: _inflight.pop(k, None))
+    try:
+        result = await asyncio.shield(task)
+    except Exception as e:
+        logger.warning("Failed to build %dpx variant of %s: %s", width, source.name, e)
+        return source
+    if result is None:
+        _passthrough.add((source, width))
+        return source
+    return result
+
+
+def delete_image_variants(source: Path) -> None:
+    """원본 삭제 시 함께 만든 변형 파일 삭제"""
+    base = source.parent / VARIANT_DIR_NAME
+    for width in VARIANT_WIDTHS:
+        for ext in (".webp", ".jpg", ".png"):
+            path = base / str(width) / f"{source.name}{ext}"
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        _passthrough.discard((source, width))
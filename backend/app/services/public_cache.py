@@ -0,0 +1,241 @@
+"""
+공개 홈페이지 API 응답 캐시 (/public/banners, workspace-courses, page-sections, pinned-notices, /public/home 인기 게시글)
+
+관리자가 수정할 때만 바뀌는 응답을 홈페이지 요청마다 DB에서 다시 만들지 않도록, 직렬화된 JSON 바이트와
+강한 ETag(본문 SHA-256)를 보관한다. 쓰기 경로(admin_banner/admin_course/admin_page, 공지 고정 변경)는
+커밋 후 invalidate()를 호출한다. 브라우저는 매번 If-None-Match로 재검증하고 변경이 없으면 304를 받는다.
+
+- 기본: 프로세스 메모리. gunicorn 워커끼리는 PUBLIC_CACHE_DIR의 키별 표시 파일 mtime으로 무효화를 알린다
+  (조회 시 stat 한 번). 다른 컨테이너/호스트까지는 전파되지 않으므로 PUBLIC_CACHE_TTL이 상한.
+- REDIS_URL이 설정되고 redis 패키지가 있으면 Redis에 저장해 모든 인스턴스가 공유한다.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import PUBLIC_CACHE_REQUESTS
+from app.db.database import AsyncSessionLocal
+
+try:
+    import redis.asyncio as _redis
+except ImportError:
+    _redis = None
+
+logger = logging.getLogger(__name__)
+
+BANNERS = "banners"
+WORKSPACE_COURSES = "workspace-courses"
+PAGE_SECTIONS = "page-sections"
+PINNED_NOTICES = "pinned-notices"
+POPULAR_POSTS = "popular-posts"  # /public/home 인기 게시글 (PUBLIC_POPULAR_POSTS_TTL, 게시글 삭제 시 무효화)
+
+# 브라우저는 저장하되 매번 재검증 (관리자 수정이 바로 보이도록). 재검증은 304라 본문 전송 없음
+PUBLIC_CACHE_CONTROL = "public, no-cache"
+
+_REDIS_PREFIX = "public-cache:"
+
+
+class CachedEntry(NamedTuple):
+    body: bytes  # 직렬화된 JSON
+    etag: str
+    built_at: float  # 생성 시각 (epoch 초)
+    version: int
+    expires_at: float
+
+
+class _LocalBackend:
+    def __init__(self, marker_dir: Path):
+        self._entries: Dict[str, CachedEntry] = {}
+        self._marker_dir = marker_dir
+
+    def version(self, key: str) -> int:
+        try:
+            return (self._marker_dir / key).stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    async def get(self, key: str) -> Optional[CachedEntry]:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic() or entry.version != self.version(key):
+            return None
+        return entry
+
+    async def set(self, key: str, entry: CachedEntry, ttl: int) -> None:
+        self._entries[key] = entry
+
+    async def invalidate(self, keys) -> None:
+        self._marker_dir.mkdir(parents=True, exist_ok=True)
+        for key in keys:
+            self._entries.pop(key, None)
+            path = self._marker_dir / key
+            # 다른 워커가 빌드 시작 시점에 읽은 값과 반드시 달라지도록 단조 증가
+            now = time.time_ns()
+            try:
+                now = max(now, path.stat().st_mtime_ns + 1)
+            except FileNotFoundError:
+                path.touch()
+            os.utime(path, ns=(now, now))
+
+
+class _RedisBackend:
+    """빌드 도중 무효화가 겹치면 이전 내용이 TTL 동안 남을 수 있다 (관리자 수정 빈도에서는 무시할 수준)"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def version(self, key: str) -> int:
+        return 0
+
+    async def get(self, key: str) -> Optional[CachedEntry]:
+        raw = await self._client.get(_REDIS_PREFIX + key)
+        if raw is None:
+            return None
+        etag, _, rest = raw.partition(b"\n")
+        built_at, _, body = rest.partition(b"\n")
+        return CachedEntry(body, etag.decode(), float(built_at), 0, 0.0)
+
+    async def set(self, key: str, entry: CachedEntry, ttl: int) -> None:
+        value = b"%s\n%r\n%s" % (entry.etag.encode(), entry.built_at, entry.body)
+        await self._client.set(_REDIS_PREFIX + key, value, ex=ttl)
+
+    async def invalidate(self, keys) -> None:
+        await self._client.delete(*(_REDIS_PREFIX + key for key in keys))
+
+    async def close(self) -> None:
+        await self._client.close()
+
+
+_backend = None
+# 같은 키를 동시에 여러 요청이 빌드하지 않도록 (워커 내)
+_build_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+def _get_backend():
+    global _backend
+    if _backend is None:
+        if settings.REDIS_URL and _redis is not None:
+            _backend = _RedisBackend(_redis.from_url(settings.REDIS_URL))
+        else:
+            if settings.REDIS_URL:
+                logger.warning("REDIS_URL is set but the redis package is not installed; using in-process cache")
+            _backend = _LocalBackend(Path(settings.PUBLIC_CACHE_DIR))
+    return _backend
+
+
+def dump_json(data: Any) -> bytes:
+    """JSONResponse와 같은 직렬화"""
+    return json.dumps(
+        jsonable_encoder(data), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def body_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+async def _build(key: str, build: Callable[[AsyncSession], Awaitable[Any]], backend, ttl: int) -> CachedEntry:
+    # 빌드 전에 읽은 버전으로 저장: 빌드 중 무효화되면 다음 조회에서 다시 빌드
+    version = backend.version(key)
+    async with AsyncSessionLocal() as db:
+        data = await build(db)
+    body = dump_json(data)
+    etag = body_etag(body)
+    entry = CachedEntry(body, etag, time.time(), version, time.monotonic() + ttl)
+    try:
+        await backend.set(key, entry, ttl)
+    except Exception as e:
+        logger.warning("Public cache store failed for %s: %s", key, e)
+    return entry
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Accept-Encoding이 gzip을 허용하는지 (q=0은 거부, gzip이 없으면 '*'의 q를 따름)"""
+    qualities: Dict[str, float] = {}
+    for item in (accept_encoding or "").split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding.lower()] = q
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+async def get_cached(
+    key: str, build: Callable[[AsyncSession], Awaitable[Any]], ttl: Optional[int] = None
+) -> CachedEntry:
+    """캐시 항목 반환. 없거나 무효화됐으면 build(db) 결과를 직렬화해 저장 (ttl 생략 시 PUBLIC_CACHE_TTL)"""
+    backend = _get_backend()
+    result = "hit"
+    try:
+        entry = await backend.get(key)
+    except Exception as e:
+        logger.warning("Public cache lookup failed for %s: %s", key, e)
+        entry = None
+    if entry is None:
+        async with _build_locks[key]:
+            try:
+                entry = await backend.get(key)
+            except Exception:
+                entry = None
+            if entry is None:
+                result = "miss"
+                entry = await _build(key, build, backend, ttl or settings.PUBLIC_CACHE_TTL)
+    PUBLIC_CACHE_REQUESTS.labels(key, result).inc()
+    return entry
+
+
+async def cached_json_response(
+    request: Request, key: str, build: Callable[[AsyncSession], Awaitable[Any]]
+) -> Response:
+    """캐시된 JSON 응답 (없으면 build(db)로 만들어 저장). If-None-Match가 일치하면 304"""
+    entry = await get_cached(key, build)
+    headers = {"ETag": entry.etag, "Cache-Control": PUBLIC_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        PUBLIC_CACHE_REQUESTS.labels(key, "not_modified").inc()
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+async def invalidate(*keys: str) -> None:
+    """커밋 후 호출. 실패해도 요청은 성공으로 두고 TTL에 맡긴다"""
+    try:
+        await _get_backend().invalidate(keys)
+    except Exception as e:
+        logger.warning("Public cache invalidation failed for %s: %s", ", ".join(keys), e)
+
+
+async def close_public_cache() -> None:
+    global _backend
+    if isinstance(_backend, _RedisBackend):
+        await _backend.close()
+    _backend = None
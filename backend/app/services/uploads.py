@@ -0,0 +1,312 @@
+"""
+업로드 파일 저장 (스트리밍) + 내용 주소(content-addressed) 저장소
+
+UploadFile 전체를 메모리로 읽지 않고 고정 크기 청크로 임시 파일에 쓰면서 크기 제한을 검사하고
+sha256을 함께 계산한 뒤, 완료되면 os.replace로 최종 경로에 원자적으로 옮긴다.
+파일 I/O는 이벤트 루프를 막지 않도록 스레드에서 수행한다.
+
+이미지 업로드는 `{sha256}{ext}` 이름의 blob으로 `root/ab/cd/`에 샤딩해 저장하므로 같은 내용은 한 번만 저장된다.
+blob은 여러 게시글/배너/코스/페이지 섹션이 공유할 수 있어 파일명별 참조 수(upload_refs)를 둔다. 해당 행을 쓰는
+트랜잭션에서 update_upload_refs로 증감하고, 삭제는 참조 수가 0인 파일만 한다.
+예전 `{timestamp}_{filename}` 파일은 root 바로 아래에 그대로 두고 같은 방식으로 조회/삭제한다.
+
+조회 응답은 upload_file_response가 만든다. UPLOADS_X_ACCEL_PREFIX가 설정되어 있으면 본문 대신
+X-Accel-Redirect 헤더만 돌려주고 실제 전송(sendfile)은 nginx 내부 location이 맡는다.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from collections import Counter
+from typing import Any, BinaryIO, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from fastapi import HTTPException, Request, UploadFile
+from fastapi.responses import FileResponse, Response
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+BLOB_NAME_RE = re.compile(r"^([0-9a-f]{64})(\.[a-z0-9]+)$")
+# 업로드 직후(아직 게시글 저장 전) blob이 다른 글 삭제에 휩쓸려 지워지지 않도록 두는 유예 시간
+BLOB_DELETE_GRACE_SECONDS = 24 * 3600
+# DB에 저장된 업로드 URL (/community/image/{name}, /admin/upload/image/{name}). 쿼리스트링(?w=)은 제외
+_UPLOAD_URL_RE = re.compile(r"/(?:community/image|admin/upload/image)/([^/\\\s\"'?#,\]]+)")
+# 참조 수를 세는 컬럼 (upload_refs 재계산용)
+_UPLOAD_REF_SOURCES = (
+    "SELECT image_url FROM posts WHERE image_url IS NOT NULL",
+    "SELECT image_url FROM banners WHERE image_url IS NOT NULL",
+    "SELECT image_url FROM workspace_courses WHERE image_url IS NOT NULL",
+    "SELECT data FROM page_sections WHERE data IS NOT NULL",
+)
+
+
+class UploadTooLargeError(Exception):
+    """업로드 크기 제한 초과"""
+
+
+class InvalidUploadPathError(ValueError):
+    """업로드 루트 밖을 가리키는 파일명 (../ 등 경로 조작)"""
+
+
+class SavedUpload(NamedTuple):
+    path: Path
+    size: int
+    sha256: str
+
+
+def _stream_to_temp(src: BinaryIO, dest_dir: Path, max_bytes: int) -> Tuple[str, int, str]:
+    """src를 dest_dir의 임시 파일로 복사. (임시 경로, 크기, sha256) 반환"""
+    src.seek(0)
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, prefix=".upload-", suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = src.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                out.write(chunk)
+        # mkstemp는 0600으로 만들므로 정적 파일 서버(nginx)가 읽을 수 있게 권한 조정
+        os.chmod(tmp_path, 0o644)
+    except BaseException:
+        _unlink_quietly(tmp_path)
+        raise
+    return tmp_path, size, digest.hexdigest()
+
+
+def _unlink_quietly(path) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _stream_to_file(src: BinaryIO, dest_dir: Path, filename: str, max_bytes: int) -> SavedUpload:
+    tmp_path, size, sha256 = _stream_to_temp(src, dest_dir, max_bytes)
+    final_path = dest_dir / filename
+    try:
+        os.replace(tmp_path, final_path)
+    except BaseException:
+        _unlink_quietly(tmp_path)
+        raise
+    return SavedUpload(final_path, size, sha256)
+
+
+def _stream_to_blob(src: BinaryIO, root: Path, ext: str, max_bytes: int) -> SavedUpload:
+    tmp_path, size, sha256 = _stream_to_temp(src, root, max_bytes)
+    final_path = blob_path(root, sha256, ext)
+    try:
+        if final_path.exists():
+            # 이미 있는 내용: 새 파일은 버리고 mtime만 갱신 (삭제 유예 시간 재시작)
+            _unlink_quietly(tmp_path)
+            os.utime(final_path)
+        else:
+            final_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, final_path)
+    except BaseException:
+        _unlink_quietly(tmp_path)
+        raise
+    return SavedUpload(final_path, size, sha256)
+
+
+def blob_path(root: Path, sha256: str, ext: str) -> Path:
+    """blob 저장 경로: root/ab/cd/abcd....ext"""
+    return root / sha256[:2] / sha256[2:4] / f"{sha256}{ext}"
+
+
+def resolve_upload_path(root: Path, filename: str) -> Path:
+    """URL의 파일명을 디스크 경로로 변환 (blob 이름이면 샤딩 경로, 아니면 예전 평면 경로).
+    예전 파일은 root 바로 아래에만 있으므로 경로 구분자/`..`가 있거나 root 밖으로 해석되면 InvalidUploadPathError"""
+    m = BLOB_NAME_RE.match(filename)
+    if m:
+        return blob_path(root, m.group(1), m.group(2))
+    if filename in ("", ".", "..") or any(c in filename for c in "/\\\0"):
+        raise InvalidUploadPathError(filename)
+    path = root / filename
+    _check_inside_root(root, path)
+    return path
+
+
+def _check_inside_root(root: Path, path: Path) -> None:
+    # 심볼릭 링크까지 따라간 실제 경로 기준
+    if not path.resolve().is_relative_to(root.resolve()):
+        raise InvalidUploadPathError(str(path))
+
+
+async def save_upload(file: UploadFile, dest_dir: Path, filename: str, max_bytes: int) -> SavedUpload:
+    """업로드 파일을 dest_dir/filename으로 저장. max_bytes 초과 시 UploadTooLargeError (부분 파일은 삭제)"""
+    _check_declared_size(file, max_bytes)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    return await asyncio.to_thread(_stream_to_file, file.file, dest_dir, filename, max_bytes)
+
+
+async def save_upload_blob(file: UploadFile, root: Path, ext: str, max_bytes: int) -> SavedUpload:
+    """업로드 파일을 내용 주소 blob으로 저장 (같은 내용이 이미 있으면 기존 blob 재사용).
+    URL에는 SavedUpload.path.name(`{sha256}{ext}`)을 쓴다."""
+    _check_declared_size(file, max_bytes)
+    root.mkdir(parents=True, exist_ok=True)
+    ext = ".jpg" if ext.lower() == ".jpeg" else ext.lower()
+    return await asyncio.to_thread(_stream_to_blob, file.file, root, ext, max_bytes)
+
+
+def _check_declared_size(file: UploadFile, max_bytes: int) -> None:
+    # multipart 파싱 시 크기를 알 수 있으면 복사 전에 바로 거절
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+
+
+def upload_names(value: Any) -> Set[str]:
+    """image_url 값(단일 URL 또는 JSON 리스트 문자열)이나 page_sections.data 같은 JSON 값이 가리키는 업로드 파일명.
+    예전 파일명(한글 등)은 URL 인코딩된 채 저장됐을 수도 있어 디코딩한 이름으로 통일한다."""
+    names: Set[str] = set()
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            names |= upload_names(item)
+    elif isinstance(value, str):
+        if value.lstrip().startswith("["):
+            try:
+                return upload_names(json.loads(value))
+            except ValueError:
+                pass
+        for m in _UPLOAD_URL_RE.finditer(value):
+            name = unquote(m.group(1))
+            if name not in (".", "..") and not any(c in name for c in "/\\\0"):
+                names.add(name)
+    return names
+
+
+async def update_upload_refs(db: AsyncSession, old: Any, new: Any) -> None:
+    """행의 참조 값이 old -> new로 바뀔 때 upload_refs 참조 수 조정 (생성은 old=None, 삭제는 new=None).
+    행을 쓰는 트랜잭션에서 커밋 전에 호출한다."""
+    from app.models.upload_ref import UploadRef
+    old_names, new_names = upload_names(old), upload_names(new)
+    added = sorted(new_names - old_names)
+    removed = sorted(old_names - new_names)
+    if added:
+        stmt = pg_insert(UploadRef).values([{"name": name, "ref_count": 1} for name in added])
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[UploadRef.name], set_={"ref_count": UploadRef.ref_count + 1}
+        ))
+    if removed:
+        await db.execute(
+            update(UploadRef)
+            .where(UploadRef.name.in_(removed))
+            .values(ref_count=func.greatest(UploadRef.ref_count - 1, 0))
+            .execution_options(synchronize_session=False)
+        )
+
+
+def count_upload_refs(conn) -> Counter:
+    """posts/banners/workspace_courses/page_sections 전체를 읽어 파일명별 참조 수 계산 (동기 Connection).
+    마이그레이션 백필과 scripts/reconcile_upload_refs.py에서 쓴다."""
+    counts: Counter = Counter()
+    for sql in _UPLOAD_REF_SOURCES:
+        for value in conn.execute(text(sql).execution_options(stream_results=True)).scalars():
+            counts.update(upload_names(value))
+    return counts
+
+
+async def delete_unreferenced_uploads(db: AsyncSession, root: Path, filenames: Iterable[str]) -> List[Path]:
+    """참조 수가 0인(upload_refs에 없거나 0) 업로드 파일만 삭제하고 삭제한 경로 반환.
+    참조를 없애는 변경(게시글 삭제 등)이 커밋된 뒤에 호출해야 한다."""
+    from app.models.upload_ref import UploadRef
+    from app.services.image_variants import delete_image_variants
+    candidates: Dict[str, Path] = {}
+    for filename in dict.fromkeys(filenames):
+        try:
+            path = resolve_upload_path(root, filename)
+        except InvalidUploadPathError:
+            continue
+        if not path.is_file():
+            continue
+        if BLOB_NAME_RE.match(filename) and time.time() - path.stat().st_mtime < BLOB_DELETE_GRACE_SECONDS:
+            # 최근 업로드된 blob: 작성 중인 다른 글이 곧 참조할 수 있으므로 남겨둠 (scripts/gc_uploads.py가 정리)
+            continue
+        candidates[filename] = path
+    if not candidates:
+        return []
+
+    referenced = set(await db.scalars(
+        select(UploadRef.name).where(UploadRef.name.in_(list(candidates)), UploadRef.ref_count > 0)
+    ))
+    deleted = []
+    for filename, path in candidates.items():
+        if filename in referenced:
+            continue
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+        delete_image_variants(path)
+        deleted.append(path)
+    if deleted:
+        # 그 사이 다시 참조된 이름(ref_count > 0)은 남긴다
+        await db.execute(
+            delete(UploadRef)
+            .where(UploadRef.name.in_([path.name for path in deleted]), UploadRef.ref_count <= 0)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+    return deleted
+
+
+def _upload_etag(st: os.stat_result) -> str:
+    # nginx 정적 파일 ETag와 같은 형식("mtime-size" 16진수)이라 어느 쪽이 응답해도 재검증이 맞는다
+    return f'"{int(st.st_mtime):x}-{st.st_size:x}"'
+
+
+def _not_modified(request: Request, etag: str, st: os.stat_result) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        from email.utils import parsedate_to_datetime
+        try:
+            return int(st.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def upload_file_response(request: Request, root: Path, path: Path, media_type: Optional[str] = None,
+                         headers: Optional[Dict[str, str]] = None) -> Response:
+    """업로드 파일 응답 (ETag/Last-Modified/304 처리, 가능하면 nginx X-Accel-Redirect로 위임).
+    path(원본 또는 변형)가 root 안의 파일이 아니면 404 (nginx 위임/직접 전송 모두 확인된 경로로만)"""
+    import mimetypes
+    from email.utils import formatdate
+    from urllib.parse import quote
+    path = path.resolve()
+    if not path.is_relative_to(root.resolve()) or not path.is_file():
+        raise HTTPException(status_code=404, detail="File not found")
+    st = path.stat()
+    headers = dict(headers or {})
+    headers["ETag"] = _upload_etag(st)
+    headers["Last-Modified"] = formatdate(st.st_mtime, usegmt=True)
+    if _not_modified(request, headers["ETag"], st):
+        return Response(status_code=304, headers=headers)
+
+    media_type = media_type or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    prefix = settings.UPLOADS_X_ACCEL_PREFIX
+    if prefix:
+        try:
+            relative = path.relative_to(Path(settings.UPLOADS_ROOT).resolve())
+        except ValueError:
+            relative = None  # nginx가 볼 수 없는 경로(로컬 UPLOAD_DIR 등)는 직접 전송
+        if relative is not None:
+            headers["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + quote(relative.as_posix())
+            return Response(media_type=media_type, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers, stat_result=st)
@@ -0,0 +1,122 @@
+"""
+@멘션 해석용 사용자 디렉토리 (프로세스 메모리)
+
+게시글/댓글 작성 시 멘션마다 User를 최대 3번(이메일, 이름, 이메일 앞부분) 조회하던 것을
+전체 사용자(id, email, name) 스냅샷의 dict 조회로 바꾼다.
+- 스냅샷은 한 번의 쿼리로 만들고 USER_DIRECTORY_TTL마다 다시 읽는다.
+- auth.callback에서 사용자가 생성되거나 이메일/이름이 바뀌면 invalidate_user_directory()로 버린다.
+  다른 워커는 TTL까지 이전 스냅샷을 쓰지만, 스냅샷에 없는 핸들은 한 번의 쿼리로 한꺼번에 다시 찾는다.
+"""
+import asyncio
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.user import User
+
+
+class DirectoryUser(NamedTuple):
+    id: int
+    email: str
+    name: str
+
+
+class MentionTarget(NamedTuple):
+    email: str
+    name: Optional[str]  # 가입하지 않은 이메일 멘션이면 None
+
+
+class _Directory:
+    def __init__(self, users: Iterable[DirectoryUser]):
+        self.by_email: Dict[str, DirectoryUser] = {}
+        self.by_name: Dict[str, DirectoryUser] = {}
+        self.by_local_part: Dict[str, DirectoryUser] = {}
+        self.loaded_at = time.monotonic()
+        for user in users:
+            self.add(user)
+
+    def add(self, user: DirectoryUser) -> None:
+        # 이름/이메일 앞부분이 겹치면 먼저 가입한(id가 작은) 사용자
+        self.by_email[user.email] = user
+        self.by_name.setdefault(user.name, user)
+        self.by_local_part.setdefault(user.email.split("@", 1)[0], user)
+
+    def lookup(self, handle: str) -> Optional[DirectoryUser]:
+        if _is_email_handle(handle):
+            return self.by_email.get(handle)
+        return self.by_name.get(handle.replace("_", " ")) or self.by_local_part.get(handle)
+
+
+_directory: Optional[_Directory] = None
+_load_lock = asyncio.Lock()
+
+
+def _is_email_handle(handle: str) -> bool:
+    return "@" in handle and "." in handle.split("@", 1)[1]
+
+
+def _rows_to_users(rows) -> List[DirectoryUser]:
+    return [DirectoryUser(row.id, row.email, row.name) for row in rows]
+
+
+async def _get_directory(db: AsyncSession) -> _Directory:
+    global _directory
+    directory = _directory
+    if directory is not None and time.monotonic() - directory.loaded_at < settings.USER_DIRECTORY_TTL:
+        return directory
+    async with _load_lock:
+        if _directory is directory:
+            rows = await db.execute(select(User.id, User.email, User.name).order_by(User.id))
+            _directory = _Directory(_rows_to_users(rows))
+        return _directory
+
+
+async def resolve_mentions(db: AsyncSession, handles: Iterable[str]) -> List[MentionTarget]:
+    """멘션 핸들(이메일, 이름(공백은 _), 이메일 앞부분) 목록을 멘션 대상 목록으로 (이메일 기준 중복 제거).
+    이메일 핸들은 가입 전이어도 그대로 대상이 되고(name=None), 못 찾은 이름 핸들은 제외한다.
+    디렉토리에 없는 핸들만 한 번의 쿼리로 조회한다."""
+    handles = list(handles)
+    directory = await _get_directory(db)
+    found: Dict[str, DirectoryUser] = {}
+    missing = []
+    for handle in handles:
+        user = directory.lookup(handle)
+        if user is None:
+            missing.append(handle)
+        else:
+            found[handle] = user
+
+    if missing:
+        emails = [h for h in missing if _is_email_handle(h)]
+        others = [h for h in missing if not _is_email_handle(h)]
+        conditions = []
+        if emails:
+            conditions.append(User.email.in_(emails))
+        if others:
+            conditions.append(User.name.in_([h.replace("_", " ") for h in others]))
+            conditions.append(func.split_part(User.email, "@", 1).in_(others))
+        rows = await db.execute(select(User.id, User.email, User.name).where(or_(*conditions)).order_by(User.id))
+        for user in _rows_to_users(rows):
+            directory.add(user)
+        for handle in missing:
+            user = directory.lookup(handle)
+            if user is not None:
+                found[handle] = user
+
+    targets: Dict[str, MentionTarget] = {}
+    for handle in handles:
+        user = found.get(handle)
+        if user is not None:
+            targets[user.email] = MentionTarget(user.email, user.name)
+        elif _is_email_handle(handle):
+            targets.setdefault(handle, MentionTarget(handle, None))
+    return list(targets.values())
+
+
+def invalidate_user_directory() -> None:
+    """사용자 생성/이메일·이름 변경 후 호출 (다음 멘션 해석 시 다시 읽음)"""
+    global _directory
+    _directory = None
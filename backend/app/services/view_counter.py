@@ -0,0 +1,106 @@
+"""
+게시글 조회수 write-behind 카운터
+
+상세 조회마다 UPDATE + COMMIT을 하지 않도록 조회수를 프로세스 메모리에 모아 두고,
+백그라운드 태스크가 주기적으로 한 번의 UPDATE(view_count = view_count + n)로 일괄 반영한다.
+같은 조회자(사용자 ID 또는 IP)의 반복 조회는 VIEW_COUNT_DEDUPE_SECONDS 동안 한 번만 센다 (0이면 비활성화).
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import Integer, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.core.config import settings
+from app.db.database import async_engine
+
+logger = logging.getLogger(__name__)
+
+_pending: Dict[int, int] = {}
+_recent_viewers: Dict[Tuple[int, str], float] = {}
+_flush_task: Optional[asyncio.Task] = None
+
+_FLUSH_SQL = text("""
+    UPDATE posts p
+    SET view_count = COALESCE(p.view_count, 0) + v.n
+    FROM unnest(:ids, :counts) AS v(id, n)
+    WHERE p.id = v.id
+""").bindparams(
+    bindparam("ids", type_=ARRAY(Integer)),
+    bindparam("counts", type_=ARRAY(Integer)),
+)
+
+
+def record_view(post_id: int, viewer_key: Optional[str] = None) -> bool:
+    """조회 1회 기록. 중복 제거 창 안의 재조회면 False"""
+    window = settings.VIEW_COUNT_DEDUPE_SECONDS
+    if viewer_key and window > 0:
+        now = time.monotonic()
+        key = (post_id, viewer_key)
+        last = _recent_viewers.get(key)
+        if last is not None and now - last < window:
+            return False
+        _recent_viewers[key] = now
+    _pending[post_id] = _pending.get(post_id, 0) + 1
+    return True
+
+
+def pending_views(post_id: int) -> int:
+    """아직 DB에 반영되지 않은 조회수 (응답의 view_count 보정용)"""
+    return _pending.get(post_id, 0)
+
+
+def _prune_recent_viewers() -> None:
+    window = settings.VIEW_COUNT_DEDUPE_SECONDS
+    if not _recent_viewers:
+        return
+    cutoff = time.monotonic() - window
+    for key in [k for k, ts in _recent_viewers.items() if ts < cutoff]:
+        del _recent_viewers[key]
+
+
+async def flush_views() -> int:
+    """모아 둔 조회수를 DB에 일괄 반영. 실패하면 다음 주기에 다시 시도하도록 되돌려 놓는다."""
+    global _pending
+    _prune_recent_viewers()
+    if not _pending:
+        return 0
+    batch, _pending = _pending, {}
+    ids = list(batch.keys())
+    try:
+        async with async_engine.begin() as conn:
+            await conn.execute(_FLUSH_SQL, {"ids": ids, "counts": [batch[i] for i in ids]})
+    except Exception as e:
+        logger.warning("View count flush failed, will retry: %s", e)
+        for post_id, n in batch.items():
+            _pending[post_id] = _pending.get(post_id, 0) + n
+        return 0
+    return len(ids)
+
+
+async def _flush_loop() -> None:
+    while True:
+        await asyncio.sleep(settings.VIEW_COUNT_FLUSH_INTERVAL)
+        await flush_views()
+
+
+async def start_view_counter() -> None:
+    """앱 startup 훅에서 호출"""
+    global _flush_task
+    if _flush_task is None or _flush_task.done():
+        _flush_task = asyncio.create_task(_flush_loop())
+
+
+async def stop_view_counter() -> None:
+    """앱 shutdown 훅에서 호출 (남은 조회수 반영 후 종료)"""
+    global _flush_task
+    if _flush_task is not None:
+        _flush_task.cancel()
+        try:
+            await _flush_task
+        except asyncio.CancelledError:
+            pass
+        _flush_task = None
+    await flush_views()
@@ -0,0 +1,79 @@
+"""
+운영 서버 설정 (gunicorn + uvicorn 워커)
+
+사용법:
+  gunicorn app.main:app -c gunicorn.conf.py
+
+워커 수는 WEB_CONCURRENCY로 지정하고, 없으면 컨테이너에 할당된 CPU 수(cgroup 제한 반영)만큼 띄운다.
+워커마다 DB 커넥션 풀을 따로 가지므로 워커 수 × (DB_POOL_SIZE + DB_MAX_OVERFLOW)가
+Postgres max_connections(기본 100)보다 충분히 작게 유지되도록 조정할 것.
+"""
+import math
+import os
+import shutil
+
+
+def _available_cpus() -> int:
+    """프로세스가 쓸 수 있는 CPU 수 (affinity와 cgroup v2/v1 CPU 할당량 중 작은 값)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = None
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            limit, period = f.read().split()
+            if limit != "max":
+                quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                limit = int(f.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = int(f.read())
+            if limit > 0:
+                quota = limit / period
+        except (OSError, ValueError):
+            pass
+    if quota:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+# 비동기 워커는 코어당 1개면 충분 (I/O 대기는 이벤트 루프가 처리)
+workers = int(os.getenv("WEB_CONCURRENCY", str(_available_cpus())))
+
+# Google API 호출/업로드가 느릴 수 있으므로 여유 있게. 종료 시에는 조회수 flush 등 shutdown 훅 대기
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+# nginx upstream keep-alive보다 길게
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "75"))
+# 메모리 누수 완화: 일정 요청 수마다 워커 재시작 (동시에 재시작하지 않도록 jitter)
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "500"))
+
+# nginx가 넘겨주는 X-Forwarded-* 신뢰 (같은 docker 네트워크)
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "*")
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+# preload_app은 쓰지 않음: DB 엔진/httpx 클라이언트를 fork 전에 만들면 워커끼리 커넥션을 공유하게 된다
+preload_app = False
+
+# Prometheus 다중 프로세스 모드: 워커별 지표 파일을 모아 /metrics에서 합산 (워커 import 전에 설정되어야 함)
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+
+
+def on_starting(server):
+    # 이전 실행의 워커 지표 파일 제거
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
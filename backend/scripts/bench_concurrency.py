@@ -0,0 +1,85 @@
+"""
+동시성 부하 벤치마크 (혼합 부하에서 엔드포인트별 p50/p95/p99 지연시간 측정)
+
+사용법:
+  cd backend
+  python -m scripts.bench_concurrency [--base-url http://localhost:8000] [--concurrency 32] [--duration 15]
+
+실행 중인 서버에 게시글 목록/상세, 공개 배너, /health 요청을 섞어서 동시에 보낸다.
+DB 쿼리가 이벤트 루프를 블로킹하면 /health 같은 가벼운 요청의 p99가 함께 튀므로,
+동기 세션 vs 비동기 세션 비교에 사용한다.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = max(0, min(len(values) - 1, int(round(pct / 100.0 * len(values) + 0.5)) - 1))
+    return values[k]
+
+
+async def _worker(client: httpx.AsyncClient, deadline: float, post_ids: List[int],
+                  latencies: Dict[str, List[float]], errors: Dict[str, int]) -> None:
+    routes = [
+        ("GET /community/posts", lambda: ("/community/posts", {"page_size": 100})),
+        ("GET /community/posts/{id}", lambda: (f"/community/posts/{random.choice(post_ids)}", None)),
+        ("GET /public/banners", lambda: ("/public/banners", None)),
+        ("GET /health", lambda: ("/health", None)),
+    ]
+    while time.perf_counter() < deadline:
+        name, build = random.choice(routes)
+        path, params = build()
+        start = time.perf_counter()
+        try:
+            r = await client.get(path, params=params)
+            if r.status_code >= 400:
+                errors[name] += 1
+        except httpx.HTTPError:
+            errors[name] += 1
+            continue
+        latencies[name].append((time.perf_counter() - start) * 1000)
+
+
+async def run(base_url: str, concurrency: int, duration: float) -> None:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+        r = await client.get("/community/posts", params={"page_size": 50})
+        r.raise_for_status()
+        post_ids = [p["id"] for p in r.json().get("posts", [])] or [1]
+
+        latencies: Dict[str, List[float]] = defaultdict(list)
+        errors: Dict[str, int] = defaultdict(int)
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*[
+            _worker(client, deadline, post_ids, latencies, errors) for _ in range(concurrency)
+        ])
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"base_url={base_url} concurrency={concurrency} duration={duration}s requests={total} rps={total / duration:.1f}")
+    print(f"{'route':<28}{'count':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'errors':>8}")
+    for name in sorted(latencies):
+        vals = latencies[name]
+        print(f"{name:<28}{len(vals):>8}{_percentile(vals, 50):>10.1f}{_percentile(vals, 95):>10.1f}"
+              f"{_percentile(vals, 99):>10.1f}{errors[name]:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mixed-load concurrency benchmark")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.concurrency, args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+좋아요 토글 동시성 점검 (한 게시글에 여러 사용자의 토글을 동시에 몰아서 보낸 뒤 정합성 확인)
+
+사용법:
+  cd backend
+  python scripts/check_like_concurrency.py [--post-id 1] [--users 20] [--requests 400] [--concurrency 64]
+
+앱을 프로세스 안에서(httpx ASGITransport) 실행해 실제 DB에 POST /community/posts/{id}/like를 동시에 보낸다.
+사용자는 기존 users 앞에서부터 --users명, 한 사용자의 토글도 겹치도록 무작위로 고른다. 끝난 뒤
+  1) 모든 응답이 200인지
+  2) post_likes에 (post_id, user_id) 중복 행이 없는지
+  3) posts.like_count가 실제 좋아요 행 수와 같은지
+를 확인하고 실패하면 종료 코드 1. 마지막에 각 사용자의 좋아요 상태를 시작 전으로 되돌린다.
+운영 DB가 아닌 개발/스테이징 DB에서 실행한다.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import Counter
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import text
+
+from app.core.security import create_access_token
+from app.db.database import engine, async_engine
+from app.main import app
+
+
+def _like_state(post_id: int, user_ids):
+    with engine.connect() as conn:
+        liked = set(conn.execute(
+            text("SELECT user_id FROM post_likes WHERE post_id = :post_id AND user_id = ANY(:user_ids)"),
+            {"post_id": post_id, "user_ids": list(user_ids)},
+        ).scalars())
+        duplicates = conn.execute(text(
+            "SELECT count(*) FROM (SELECT 1 FROM post_likes WHERE post_id = :post_id "
+            "GROUP BY user_id HAVING count(*) > 1) d"
+        ), {"post_id": post_id}).scalar()
+        rows = conn.execute(text("SELECT count(*) FROM post_likes WHERE post_id = :post_id"), {"post_id": post_id}).scalar()
+        like_count = conn.execute(text("SELECT like_count FROM posts WHERE id = :post_id"), {"post_id": post_id}).scalar()
+    return liked, duplicates, rows, like_count
+
+
+async def _hammer(post_id: int, tokens: dict, n_requests: int, concurrency: int):
+    statuses: Counter = Counter()
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    user_ids = list(tokens)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        async def toggle(user_id: int):
+            async with semaphore:
+                start = time.perf_counter()
+                r = await client.post(f"/community/posts/{post_id}/like", params={"token": tokens[user_id]})
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses[r.status_code] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[toggle(random.choice(user_ids)) for _ in range(n_requests)])
+        elapsed = time.perf_counter() - started
+    return statuses, sorted(latencies), elapsed
+
+
+async def _restore(post_id: int, tokens: dict, user_ids):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        for user_id in user_ids:
+            await client.post(f"/community/posts/{post_id}/like", params={"token": tokens[user_id]})
+
+
+async def _run(args) -> bool:
+    with engine.connect() as conn:
+        post_id = args.post_id or conn.execute(text("SELECT id FROM posts ORDER BY id DESC LIMIT 1")).scalar()
+        users = conn.execute(text("SELECT id, email FROM users ORDER BY id LIMIT :n"), {"n": args.users}).all()
+    if not post_id or not users:
+        print("posts/users 데이터가 필요합니다")
+        return False
+    tokens = {u.id: create_access_token({"sub": str(u.id), "email": u.email}) for u in users}
+
+    before, _, _, _ = _like_state(post_id, tokens)
+    statuses, latencies, elapsed = await _hammer(post_id, tokens, args.requests, args.concurrency)
+    after, duplicates, rows, like_count = _like_state(post_id, tokens)
+
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"post_id={post_id} users={len(users)} requests={args.requests} concurrency={args.concurrency} "
+          f"elapsed={elapsed:.2f}s rps={args.requests / elapsed:.0f} p50={p50:.1f}ms p99={p99:.1f}ms")
+    print(f"status={dict(statuses)} duplicates={duplicates} like_rows={rows} like_count={like_count}")
+
+    ok = set(statuses) == {200} and duplicates == 0 and rows == like_count
+    print("OK" if ok else "FAIL")
+
+    # 시작 전 상태로 되돌리기 (상태가 바뀐 사용자만 한 번 더 토글)
+    await _restore(post_id, tokens, before ^ after)
+    await async_engine.dispose()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hammer one post's like toggle and verify consistency")
+    parser.add_argument("--post-id", type=int, default=None, help="Target post (default: latest)")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(_run(args)) else 1)
+
+
+if __name__ == "__main__":
+    main()
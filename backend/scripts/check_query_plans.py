@@ -0,0 +1,217 @@
+"""
+커뮤니티 목록/상세 쿼리 실행 계획 점검 (인덱스 회귀 확인용)
+
+사용법:
+  cd backend
+  python scripts/check_query_plans.py --seed 20000   # 임시 데이터 N건 생성 후 점검, 끝나면 삭제
+  python scripts/check_query_plans.py                # 현재 DB 데이터 그대로 점검
+
+실제 API 엔드포인트(TestClient)를 호출하면서 실행된 SELECT 문을 그대로 수집해 EXPLAIN 하고,
+커뮤니티 테이블에 Seq Scan이 있으면 해당 쿼리와 계획을 출력하고 종료 코드 1로 끝난다.
+작은 테이블은 플래너가 Seq Scan을 고르는 게 정상이므로 데이터가 충분한 DB(또는 --seed)에서 실행할 것.
+운영 DB가 아닌 개발/스테이징 DB에서 실행한다.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from app.core.security import create_access_token
+from app.db.database import engine, async_engine
+from app.main import app
+
+# Seq Scan이 나오면 안 되는 테이블
+CHECKED_TABLES = {"posts", "comments", "post_likes", "post_tags", "post_mentions", "comment_mentions"}
+# 목록 total 계산(count(*))은 조건에 맞는 행을 모두 세야 하므로 선택도가 낮으면 Seq Scan이 최적 → 제외 (정규식)
+ALLOWED_FULL_SCANS = [
+    re.compile(r"^SELECT count\(\*\) AS count_1 FROM \(SELECT .*? FROM posts\b.*\) AS anon_1$"),
+]
+
+SEED_EMAIL = "plancheck@example.invalid"
+SEED_TAG = "plancheck"
+
+
+def _seed(n_posts: int) -> int:
+    """임시 사용자/게시글/댓글/좋아요/태그/멘션 생성. 사용자 ID 반환"""
+    with engine.begin() as conn:
+        user_id = conn.execute(text("""
+            INSERT INTO users (google_id, email, name, is_active)
+            VALUES ('plancheck', :email, 'Plan Check', true)
+            RETURNING id
+        """), {"email": SEED_EMAIL}).scalar()
+        conn.execute(text("""
+            INSERT INTO tags (name)
+            SELECT :name || CASE WHEN k = 0 THEN '' ELSE k::text END FROM generate_series(0, 19) AS k
+            ON CONFLICT (name) DO NOTHING
+        """), {"name": SEED_TAG})
+        conn.execute(text("""
+            INSERT INTO posts (post_type, title, content, author_id, author_email, author_name,
+                               is_pinned, view_count, like_count, comment_count, is_resolved, created_at)
+            SELECT (ARRAY['NOTICE','FORUM','REQUEST'])[1 + g % 3]::posttype,
+                   'plan check ' || g, 'content ' || g, :uid, :email, 'Plan Check',
+                   g % 500 = 0, 0, 0, 3, false, now() - (g || ' minutes')::interval
+            FROM generate_series(1, :n) AS g
+        """), {"uid": user_id, "email": SEED_EMAIL, "n": n_posts})
+        conn.execute(text("""
+            INSERT INTO comments (post_id, content, author_id, author_email, author_name, created_at)
+            SELECT p.id, 'c' || k, :uid, :email, 'Plan Check', now()
+            FROM posts p CROSS JOIN generate_series(1, 3) AS k
+            WHERE p.author_email = :email
+        """), {"uid": user_id, "email": SEED_EMAIL})
+        conn.execute(text("""
+            INSERT INTO post_likes (post_id, user_id)
+            SELECT id, :uid FROM posts WHERE author_email = :email AND id % 2 = 0
+        """), {"uid": user_id, "email": SEED_EMAIL})
+        # 게시글마다 태그 2개 (20개 태그에 분산)
+        conn.execute(text("""
+            INSERT INTO post_tags (post_id, tag_id)
+            SELECT p.id, t.id FROM posts p
+            JOIN tags t ON t.name IN (:name || CASE WHEN p.id % 20 = 0 THEN '' ELSE (p.id % 20)::text END,
+                                      :name || ((p.id + 7) % 20 + 1)::text)
+            WHERE p.author_email = :email
+        """), {"name": SEED_TAG, "email": SEED_EMAIL})
+        # 게시글/댓글마다 멘션 1개 (1%는 점검용 사용자 멘션)
+        conn.execute(text("""
+            INSERT INTO post_mentions (post_id, mentioned_email, mentioned_name)
+            SELECT id, CASE WHEN id % 100 = 0 THEN :email ELSE 'someone' || (id % 300) || '@example.invalid' END, NULL
+            FROM posts WHERE author_email = :email
+        """), {"email": SEED_EMAIL})
+        conn.execute(text("""
+            INSERT INTO comment_mentions (comment_id, mentioned_email, mentioned_name)
+            SELECT c.id, 'someone' || (c.id % 300) || '@example.invalid', NULL FROM comments c
+            JOIN posts p ON p.id = c.post_id
+            WHERE p.author_email = :email
+        """), {"email": SEED_EMAIL})
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE"))
+    return user_id
+
+
+def _cleanup() -> None:
+    with engine.begin() as conn:
+        post_ids = "SELECT id FROM posts WHERE author_email = :email"
+        conn.execute(text(f"DELETE FROM comment_mentions WHERE comment_id IN (SELECT id FROM comments WHERE post_id IN ({post_ids}))"), {"email": SEED_EMAIL})
+        for table in ("comments", "post_likes", "post_tags", "post_mentions"):
+            conn.execute(text(f"DELETE FROM {table} WHERE post_id IN ({post_ids})"), {"email": SEED_EMAIL})
+        conn.execute(text("DELETE FROM posts WHERE author_email = :email"), {"email": SEED_EMAIL})
+        conn.execute(text("DELETE FROM tags WHERE name LIKE :name AND NOT EXISTS (SELECT 1 FROM post_tags WHERE tag_id = tags.id)"), {"name": SEED_TAG + "%"})
+        conn.execute(text("DELETE FROM users WHERE email = :email"), {"email": SEED_EMAIL})
+
+
+def _capture_statements(user_id: int) -> list:
+    """대표 커뮤니티 엔드포인트를 호출하며 실행된 (라벨, SQL, 파라미터) 수집"""
+    captured = []
+    current = {"label": None}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and current["label"]:
+            captured.append((current["label"], statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    token = create_access_token({"sub": str(user_id), "email": SEED_EMAIL})
+    try:
+        with TestClient(app) as client:
+            first = client.get("/community/posts", params={"page_size": 1}).json()["posts"]
+            post_id = first[0]["id"] if first else 1
+            calls = [
+                ("posts list", "/community/posts", {"page_size": 20, "token": token}),
+                ("posts list page 5", "/community/posts", {"page_size": 20, "page": 5}),
+                ("posts by type", "/community/posts", {"post_type": "forum", "page_size": 20}),
+                ("posts by tag", "/community/posts", {"tag": SEED_TAG, "page_size": 20}),
+                ("posts search", "/community/posts", {"search": "1234", "page_size": 20}),
+                ("posts search (hangul)", "/community/posts", {"search": "검색", "page_size": 20}),
+                ("post detail", f"/community/posts/{post_id}", {"token": token}),
+                ("comments", f"/community/posts/{post_id}/comments", {}),
+                ("popular posts", "/community/popular-posts", {"limit": 5}),
+                ("mentioned posts", "/community/mentioned-posts", {"token": token}),
+            ]
+            for label, path, params in calls:
+                current["label"] = label
+                r = client.get(path, params=params)
+                if r.status_code != 200:
+                    print(f"[WARN] {label}: {path} -> {r.status_code}")
+                current["label"] = None
+
+            # 키셋 커서 모드: 첫 페이지 + 커서로 이어지는 페이지
+            current["label"] = "posts cursor"
+            r = client.get("/community/posts", params={"page_size": 20, "use_cursor": True, "include_total": True})
+            next_cursor = r.json().get("next_cursor")
+            if next_cursor:
+                current["label"] = "posts cursor page 2"
+                client.get("/community/posts", params={"page_size": 20, "cursor": next_cursor})
+                current["label"] = "posts by type cursor page 2"
+                client.get("/community/posts", params={"page_size": 20, "post_type": "notice", "cursor": next_cursor})
+            current["label"] = None
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def _to_psycopg2(statement: str, parameters) -> tuple:
+    """asyncpg 형식($1)의 SQL을 psycopg2 형식으로 변환"""
+    params = {}
+    sql = statement.replace("%", "%%")
+    for i, value in enumerate(parameters or (), start=1):
+        params[f"p{i}"] = value.value if hasattr(value, "value") and not isinstance(value, (int, str)) else value
+    sql = re.sub(r"\$(\d+)", lambda m: f"%(p{m.group(1)})s", sql)
+    return sql, params
+
+
+def _seq_scans(plan: dict) -> list:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in CHECKED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="EXPLAIN community queries and fail on sequential scans")
+    parser.add_argument("--seed", type=int, default=0, help="Insert N temporary posts (removed afterwards)")
+    args = parser.parse_args()
+
+    if args.seed:
+        _cleanup()
+        user_id = _seed(args.seed)
+    else:
+        with engine.connect() as conn:
+            user_id = conn.execute(text("SELECT id FROM users ORDER BY id LIMIT 1")).scalar() or 1
+
+    failures = 0
+    try:
+        statements = _capture_statements(user_id)
+        raw = engine.raw_connection()
+        try:
+            cur = raw.cursor()
+            for label, statement, parameters in statements:
+                sql, params = _to_psycopg2(statement, parameters)
+                cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+                plan = cur.fetchone()[0][0]["Plan"]
+                scans = _seq_scans(plan)
+                one_line = " ".join(statement.split())
+                if scans and not any(p.match(one_line) for p in ALLOWED_FULL_SCANS):
+                    failures += 1
+                    print(f"[FAIL] {label}: Seq Scan on {', '.join(sorted(set(scans)))}")
+                    print(f"       {one_line[:300]}")
+                    print(json.dumps(plan, indent=1)[:2000])
+                else:
+                    print(f"[OK]   {label}: {one_line[:100]}")
+            raw.rollback()
+        finally:
+            raw.close()
+    finally:
+        if args.seed:
+            _cleanup()
+
+    print(f"{len(statements)} statement(s) checked, {failures} with sequential scans")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
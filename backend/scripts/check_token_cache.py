@@ -0,0 +1,99 @@
+"""
+사용자별 Google access token 캐시 동작 확인 (로컬 스텁 토큰 엔드포인트 사용)
+
+사용법:
+  cd backend
+  python -m scripts.check_token_cache
+
+oauth2.googleapis.com 대신 로컬 스레드에서 띄운 스텁 서버로 GOOGLE_TOKEN_URL을 바꾼 뒤
+  1) 같은 사용자의 동시 요청 20개가 토큰 요청 1회로 합쳐지는지
+  2) 캐시가 유효한 동안 재요청하지 않는지
+  3) expires_in이 짧으면(갱신 여유 시간 이내) 다시 교환하는지
+  4) refresh token이 바뀌면 캐시를 버리는지
+를 확인한다.
+"""
+import asyncio
+import json
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services import google_api
+
+_calls = []
+_expires_in = {"value": 3600}
+
+
+class _StubTokenHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode())
+        refresh_token = form.get("refresh_token", [""])[0]
+        _calls.append(refresh_token)
+        # 동시 요청이 겹치도록 약간 지연
+        threading.Event().wait(0.2)
+        body = json.dumps({
+            "access_token": f"access-{refresh_token}-{len(_calls)}",
+            "expires_in": _expires_in["value"],
+            "token_type": "Bearer",
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def _run() -> None:
+    # 1) 동시 요청 합치기
+    tokens = await asyncio.gather(*[google_api.get_user_access_token(1, "rt-a") for _ in range(20)])
+    assert len(set(tokens)) == 1 and tokens[0], tokens
+    assert len(_calls) == 1, f"expected 1 token request, got {len(_calls)}"
+    print(f"[OK] 20 concurrent calls -> {len(_calls)} token request")
+
+    # 2) 캐시 적중
+    again = await google_api.get_user_access_token(1, "rt-a")
+    assert again == tokens[0] and len(_calls) == 1
+    print("[OK] cached token reused")
+
+    # 다른 사용자는 별도 캐시
+    await google_api.get_user_access_token(2, "rt-b")
+    assert len(_calls) == 2
+    print("[OK] separate cache entry per user")
+
+    # 3) 갱신 여유 시간 이내로 만료되는 토큰은 매번 갱신
+    _expires_in["value"] = 30
+    google_api.invalidate_user_access_token(3)
+    await google_api.get_user_access_token(3, "rt-c")
+    await google_api.get_user_access_token(3, "rt-c")
+    assert len(_calls) == 4, len(_calls)
+    print("[OK] token inside refresh skew is refreshed ahead of expiry")
+
+    # 4) refresh token 변경 시 재교환
+    _expires_in["value"] = 3600
+    rotated = await google_api.get_user_access_token(1, "rt-a2")
+    assert rotated != tokens[0] and len(_calls) == 5
+    print("[OK] rotated refresh token bypasses cache")
+
+
+def main() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubTokenHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.GOOGLE_TOKEN_URL = f"http://127.0.0.1:{server.server_address[1]}/token"
+    try:
+        asyncio.run(_run())
+    finally:
+        server.shutdown()
+    print("All token cache checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+참조되지 않는 업로드 이미지 정리
+
+사용법:
+  cd backend
+  python scripts/gc_uploads.py            # 참조 없는 파일 삭제
+  python scripts/gc_uploads.py --dry-run  # 삭제 없이 대상만 출력
+
+게시글 삭제/수정 시에는 참조 수(upload_refs)가 0이 된 이미지만 바로 지우지만, 업로드 직후 유예 시간 안의
+blob이나 글 작성 없이 업로드만 된 파일은 남는다. 관리자 업로드 디렉토리와 Community 업로드 디렉토리의
+blob(`ab/cd/{sha256}.ext`)과 예전 `{timestamp}_{filename}` 파일 중 upload_refs의 참조 수가 0(또는 행 없음)이고
+유예 시간이 지난 파일을 삭제한다. 파일은 _BATCH_SIZE개씩 upload_refs 기본 키로 조회한다.
+참조 수가 어긋났다고 의심되면 먼저 scripts/reconcile_upload_refs.py를 실행한다.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.database import engine
+from app.api.admin_upload import UPLOAD_DIR
+from app.api.community import _get_community_upload_dir
+from app.services.image_variants import delete_image_variants
+from app.services.uploads import BLOB_DELETE_GRACE_SECONDS
+
+_SHARD_RE = re.compile(r"^[0-9a-f]{2}$")
+_BATCH_SIZE = 500
+
+
+def _referenced(conn, names) -> set:
+    """names 중 참조 수가 남아 있는 이름"""
+    return set(conn.execute(
+        text("SELECT name FROM upload_refs WHERE name = ANY(:names) AND ref_count > 0"), {"names": list(names)}
+    ).scalars())
+
+
+def _batches(paths):
+    batch = []
+    for path in paths:
+        batch.append(path)
+        if len(batch) >= _BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _upload_files(root):
+    """root 바로 아래의 예전 파일과 샤딩된 blob 파일"""
+    if not root.is_dir():
+        return
+    for entry in root.iterdir():
+        if entry.is_file() and not entry.name.startswith("."):
+            yield entry
+        elif entry.is_dir() and _SHARD_RE.match(entry.name):
+            for sub in entry.iterdir():
+                if sub.is_dir() and _SHARD_RE.match(sub.name):
+                    yield from (f for f in sub.iterdir() if f.is_file() and not f.name.startswith("."))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete uploaded images that are no longer referenced")
+    parser.add_argument("--dry-run", action="store_true", help="Only report unreferenced files")
+    parser.add_argument("--grace-seconds", type=int, default=BLOB_DELETE_GRACE_SECONDS,
+                        help="Keep files modified within this many seconds")
+    args = parser.parse_args()
+
+    cutoff = time.time() - args.grace_seconds
+    removed = 0
+    freed = 0
+    for root in (UPLOAD_DIR, _get_community_upload_dir()):
+        old_files = ((path, path.stat()) for path in _upload_files(root))
+        for batch in _batches((path, stat) for path, stat in old_files if stat.st_mtime <= cutoff):
+            with engine.begin() as conn:
+                referenced = _referenced(conn, {path.name for path, _ in batch})
+                deleted = []
+                for path, stat in batch:
+                    if path.name in referenced:
+                        continue
+                    print(f"{'would delete' if args.dry_run else 'delete'} {path} ({stat.st_size} bytes)")
+                    if not args.dry_run:
+                        path.unlink(missing_ok=True)
+                        delete_image_variants(path)
+                        deleted.append(path.name)
+                    removed += 1
+                    freed += stat.st_size
+                if deleted:
+                    # 참조 수 0으로 남은 행 정리 (그 사이 다시 참조된 이름은 유지)
+                    conn.execute(
+                        text("DELETE FROM upload_refs WHERE name = ANY(:names) AND ref_count <= 0"),
+                        {"names": deleted},
+                    )
+    print(f"{removed} unreferenced file(s), {freed / 1024 / 1024:.1f}MB" + (" (dry run, nothing deleted)" if args.dry_run else " deleted"))
+
+
+if __name__ == "__main__":
+    main()
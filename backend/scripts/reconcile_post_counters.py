@@ -0,0 +1,63 @@
+"""
+posts.like_count / posts.comment_count 카운터 재계산 (드리프트 복구)
+
+사용법:
+  cd backend
+  python scripts/reconcile_post_counters.py            # 어긋난 게시글만 수정
+  python scripts/reconcile_post_counters.py --dry-run  # 수정 없이 어긋난 게시글만 출력
+
+카운터는 좋아요 토글/댓글 작성 시 같은 트랜잭션에서 증감되지만, 수동 데이터 수정이나
+컬럼 추가 전 데이터 등으로 실제 행 수와 달라질 수 있다.
+"""
+import argparse
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.database import engine
+
+_DRIFT_CTE = """
+    WITH actual AS (
+        SELECT p.id,
+               COALESCE(l.cnt, 0) AS like_count,
+               COALESCE(c.cnt, 0) AS comment_count
+        FROM posts p
+        LEFT JOIN (SELECT post_id, COUNT(*) AS cnt FROM post_likes GROUP BY post_id) l ON l.post_id = p.id
+        LEFT JOIN (SELECT post_id, COUNT(*) AS cnt FROM comments GROUP BY post_id) c ON c.post_id = p.id
+    )
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile posts.like_count / posts.comment_count")
+    parser.add_argument("--dry-run", action="store_true", help="Only report drifted posts")
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        drifted = conn.execute(text(_DRIFT_CTE + """
+            SELECT p.id, p.like_count, a.like_count, p.comment_count, a.comment_count
+            FROM posts p JOIN actual a ON a.id = p.id
+            WHERE p.like_count IS DISTINCT FROM a.like_count
+               OR p.comment_count IS DISTINCT FROM a.comment_count
+            ORDER BY p.id
+        """)).all()
+        for post_id, like_count, actual_likes, comment_count, actual_comments in drifted:
+            print(f"post {post_id}: like_count {like_count} -> {actual_likes}, comment_count {comment_count} -> {actual_comments}")
+
+        if args.dry_run or not drifted:
+            print(f"{len(drifted)} post(s) drifted" + (" (dry run, nothing changed)" if args.dry_run else ""))
+            return
+
+        result = conn.execute(text(_DRIFT_CTE + """
+            UPDATE posts p SET like_count = a.like_count, comment_count = a.comment_count
+            FROM actual a
+            WHERE a.id = p.id
+              AND (p.like_count IS DISTINCT FROM a.like_count
+                   OR p.comment_count IS DISTINCT FROM a.comment_count)
+        """))
+        print(f"Reconciled {result.rowcount} post(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+upload_refs 참조 수 재계산 (드리프트 복구)
+
+사용법:
+  cd backend
+  python scripts/reconcile_upload_refs.py            # 어긋난 파일명만 수정
+  python scripts/reconcile_upload_refs.py --dry-run  # 수정 없이 어긋난 파일명만 출력
+
+참조 수는 게시글/배너/코스/페이지 섹션을 쓰는 트랜잭션에서 증감되지만, 수동 데이터 수정 등으로
+실제 참조와 달라질 수 있다. posts/banners/workspace_courses/page_sections 전체를 한 번 읽어 다시 센다.
+재계산 중 참조 수가 바뀌지 않도록 upload_refs를 잠그므로, 그동안 이미지가 바뀌는 쓰기는 잠시 대기한다.
+"""
+import argparse
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.db.database import engine
+from app.services.uploads import count_upload_refs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile upload_refs reference counts")
+    parser.add_argument("--dry-run", action="store_true", help="Only report drifted names")
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        conn.execute(text("LOCK TABLE upload_refs IN SHARE ROW EXCLUSIVE MODE"))
+        actual = count_upload_refs(conn)
+        stored = dict(conn.execute(text("SELECT name, ref_count FROM upload_refs")).all())
+        drifted = sorted(name for name in actual.keys() | stored.keys() if actual.get(name, 0) != stored.get(name, 0))
+        for name in drifted:
+            print(f"{name}: ref_count {stored.get(name, 0)} -> {actual.get(name, 0)}")
+
+        if args.dry_run or not drifted:
+            print(f"{len(drifted)} name(s) drifted" + (" (dry run, nothing changed)" if args.dry_run else ""))
+            return
+
+        referenced = [{"name": name, "ref_count": actual[name]} for name in drifted if actual.get(name)]
+        if referenced:
+            conn.execute(
+                text("""
+                    INSERT INTO upload_refs (name, ref_count) VALUES (:name, :ref_count)
+                    ON CONFLICT (name) DO UPDATE SET ref_count = EXCLUDED.ref_count
+                """),
+                referenced,
+            )
+        # 참조가 없는 이름은 행을 지운다 (행 없음 = 참조 수 0)
+        unreferenced = [name for name in drifted if not actual.get(name)]
+        if unreferenced:
+            conn.execute(text("DELETE FROM upload_refs WHERE name = ANY(:names)"), {"names": unreferenced})
+        print(f"Reconciled {len(drifted)} name(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -385,7 +385,8 @@ const Classroom: React.FC = () => {
                           const encodedFilename = encodeURIComponent(filename)
                           const encodedUrl = url.replace(filename, encodedFilename)
                           
-                          const fullUrl = `${apiUrl}${encodedUrl}`
+                          // 카드 썸네일(높이 180px)용 640px 변형 요청
+                          const fullUrl = `${apiUrl}${encodedUrl}?w=640`
                           console.log(`[Image URL] Converting: ${url} -> ${fullUrl}`)
                           return fullUrl
                         }
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react'
 import { Link, useSearchParams } from 'react-router-dom'
 import { useAuth } from '../contexts/AuthContext'
-import { communityApi, Post, Comment, Tag } from '../services/api'
+import { communityApi, Post, Comment, CommentTreeNode, Tag } from '../services/api'
 import { getApiBase } from '../utils/apiBase'
 import './Community.css'
 
@@ -27,8 +27,18 @@ function parseImageUrl(url: string): string {
   return s
 }
 
-/** Convert post image URL to absolute src for <img> */
-function getPostImageSrc(url: string): string {
+/** 이미지 크기 옵션별 요청 너비 (original은 원본) */
+const IMAGE_SIZE_WIDTHS: Record<string, number | undefined> = { small: 640, full: 1280, original: undefined }
+
+/** Convert post image URL to absolute src for <img> (width 지정 시 서버 축소 변형 요청) */
+function getPostImageSrc(url: string, width?: number): string {
+  const src = getPostImageBaseSrc(url)
+  if (!width || !src || src.startsWith('blob:')) return src
+  if (!src.includes('/community/image/') && !src.includes('/admin/upload/image/')) return src
+  return `${src}${src.includes('?') ? '&' : '?'}w=${width}`
+}
+
+function getPostImageBaseSrc(url: string): string {
   const raw = parseImageUrl(url)
   if (!raw) return ''
   if (raw.startsWith('http://') || raw.startsWith('https://')) return raw
@@ -71,7 +81,9 @@ const Community: React.FC = () => {
   const [activeBoard, setActiveBoard] = useState<BoardType>('all')
   const [posts, setPosts] = useState<Post[]>([])
   const [selectedPost, setSelectedPost] = useState<Post | null>(null)
-  const [comments, setComments] = useState<Comment[]>([])
+  const [comments, setComments] = useState<CommentTreeNode[]>([])
+  const [commentsCursor, setCommentsCursor] = useState<string | null>(null)
+  const [commentTotal, setCommentTotal] = useState(0)
   const [tags, setTags] = useState<Tag[]>([])
   const [loading, setLoading] = useState(false)
   const [searchQuery, setSearchQuery] = useState('')
@@ -84,6 +96,8 @@ const Community: React.FC = () => {
   const [popularPosts, setPopularPosts] = useState<Post[]>([])
   const [mentionedPosts, setMentionedPosts] = useState<Post[]>([])
   const [showMentions, setShowMentions] = useState(false)
+  const [mentionUnreadCount, setMentionUnreadCount] = useState(0)
+  const [unreadMentionPostIds, setUnreadMentionPostIds] = useState<Set<number>>(new Set())
   const [imageLightboxUrl, setImageLightboxUrl] = useState<string | null>(null)
   const pageSize = 20
 
@@ -121,6 +135,7 @@ const Community: React.FC = () => {
       // URL에 post 파라미터가 없으면 게시글 선택 해제
       setSelectedPost(null)
       setComments([])
+      setCommentsCursor(null)
       setShowCommentForm(false)
     }
   }, [searchParams])
@@ -145,6 +160,9 @@ const Community: React.FC = () => {
   useEffect(() => {
     if (!selectedPost && !showMentions && token) {
       loadMentionedPosts(false)
+      communityApi.getMentionUnreadCount()
+        .then(setMentionUnreadCount)
+        .catch(err => console.error('Error loading mention unread count:', err))
     }
   }, [token])
 
@@ -273,6 +291,15 @@ const Community: React.FC = () => {
       // Mentions 페이지에서는 항상 새 데이터로 교체 (중복 방지)
       setMentionedPosts(uniquePosts)
       setTotal(response.total || uniquePosts.length)
+
+      // Mentions 페이지를 열었을 때: 이번에 새로 온 멘션을 표시하고 읽음 처리
+      if (showLoading) {
+        const unreadIds = response.unread_post_ids || []
+        setUnreadMentionPostIds(new Set(unreadIds))
+        if (unreadIds.length > 0) {
+          setMentionUnreadCount(await communityApi.markMentionsRead(unreadIds))
+        }
+      }
     } catch (err) {
       console.error('Error loading mentioned posts:', err)
       setMentionedPosts([])
@@ -286,13 +313,43 @@ const Community: React.FC = () => {
 
   const loadComments = async (postId: number) => {
     try {
-      const data = await communityApi.getComments(postId)
-      setComments(data)
+      const data = await communityApi.getCommentTree(postId)
+      setComments(data.comments)
+      setCommentsCursor(data.next_cursor || null)
+      setCommentTotal(data.total)
     } catch (err) {
       console.error('Error loading comments:', err)
     }
   }
 
+  const loadMoreComments = async (postId: number) => {
+    if (!commentsCursor) return
+    try {
+      const data = await communityApi.getCommentTree(postId, commentsCursor)
+      setComments(prev => [...prev, ...data.comments])
+      setCommentsCursor(data.next_cursor || null)
+      setCommentTotal(data.total)
+    } catch (err) {
+      console.error('Error loading more comments:', err)
+    }
+  }
+
+  // 트리에서 펼치지 않은 답글 이어서 로드 (해당 노드의 replies 뒤에 붙임)
+  const loadMoreReplies = async (target: CommentTreeNode) => {
+    try {
+      const data = await communityApi.getCommentReplies(
+        target.id, target.replies.length > 0 ? target.replies_cursor : null
+      )
+      const appendReplies = (nodes: CommentTreeNode[]): CommentTreeNode[] =>
+        nodes.map(node => node.id === target.id
+          ? { ...node, replies: [...node.replies, ...data.comments], replies_cursor: data.next_cursor || null }
+          : { ...node, replies: appendReplies(node.replies) })
+      setComments(prev => appendReplies(prev))
+    } catch (err) {
+      console.error('Error loading replies:', err)
+    }
+  }
+
   const loadPostById = async (postId: number) => {
     try {
       const detailedPost = await communityApi.getPost(postId)
@@ -334,6 +391,7 @@ const Community: React.FC = () => {
   const handleBackToList = () => {
     setSelectedPost(null)
     setComments([])
+    setCommentsCursor(null)
     setShowCommentForm(false)
     // URL 파라미터 제거
     setSearchParams({})
@@ -485,7 +543,7 @@ const Community: React.FC = () => {
                     : 'No mentions'
                   }
                 >
-                  🔔 Mentions
+                  🔔 Mentions{mentionUnreadCount > 0 ? ` (${mentionUnreadCount})` : ''}
                 </button>
               )
             })()}
@@ -640,6 +698,7 @@ const Community: React.FC = () => {
                           <div className="post-card-header-left">
                             <span className="post-type-badge">{post.post_type.toUpperCase()}</span>
                             {post.is_pinned && <span className="pinned-badge">📌</span>}
+                            {unreadMentionPostIds.has(post.id) && <span className="mention-new-badge">NEW</span>}
                             <h3 className="post-card-title">{post.title}</h3>
                           </div>
                           {post.post_type === 'request' && post.is_resolved && (
@@ -748,18 +807,19 @@ const Community: React.FC = () => {
                 {((selectedPost.image_urls && selectedPost.image_urls.length > 0) || selectedPost.image_url) && (
                   <div className="post-images-container">
                     {(selectedPost.image_urls || (selectedPost.image_url ? [selectedPost.image_url] : [])).slice(0, MAX_IMAGES).map((url, idx) => {
-                      const src = getPostImageSrc(url)
                       const size = selectedPost.image_sizes?.[idx] || 'full'
+                      const src = getPostImageSrc(url, IMAGE_SIZE_WIDTHS[size])
+                      const originalSrc = getPostImageSrc(url)
                       return (
                         <div key={idx} className={`post-image-container post-image-clickable post-image--${size}`}>
                           <img
                             src={src}
                             alt={`Post attachment ${idx + 1}`}
                             className={`post-image post-image--${size}`}
-                            onClick={(e) => { e.stopPropagation(); setImageLightboxUrl(src) }}
+                            onClick={(e) => { e.stopPropagation(); setImageLightboxUrl(originalSrc) }}
                             role="button"
                             tabIndex={0}
-                            onKeyDown={(e) => { if (e.key === 'Enter') setImageLightboxUrl(src) }}
+                            onKeyDown={(e) => { if (e.key === 'Enter') setImageLightboxUrl(originalSrc) }}
                           />
                         </div>
                       )
@@ -865,7 +925,7 @@ const Community: React.FC = () => {
 
                 <div className="comments-section">
                   <h3 className="comments-title">
-                    Comments ({comments.length})
+                    Comments ({commentTotal})
                   </h3>
                   <CommentForm
                     postId={selectedPost.id}
@@ -875,27 +935,24 @@ const Community: React.FC = () => {
                     onCancel={() => {}}
                   />
                   <div className="comments-list">
-                    {comments
-                      .filter(c => !c.parent_id)
-                      .map((comment) => (
-                        <div key={comment.id}>
-                          <CommentItem 
-                            comment={comment} 
-                            postId={selectedPost.id}
-                            onReply={() => loadComments(selectedPost.id)}
-                          />
-                          {comments
-                            .filter(c => c.parent_id === comment.id)
-                            .map((reply) => (
-                              <CommentItem 
-                                key={reply.id} 
-                                comment={reply} 
-                                postId={selectedPost.id}
-                              />
-                            ))}
-                        </div>
-                      ))}
+                    {comments.map((comment) => (
+                      <CommentThread
+                        key={comment.id}
+                        node={comment}
+                        postId={selectedPost.id}
+                        onReply={() => loadComments(selectedPost.id)}
+                        onLoadMoreReplies={loadMoreReplies}
+                      />
+                    ))}
                   </div>
+                  {commentsCursor && (
+                    <button
+                      className="load-more-comments-btn"
+                      onClick={() => loadMoreComments(selectedPost.id)}
+                    >
+                      Load more comments
+                    </button>
+                  )}
                 </div>
               </div>
             ) : (
@@ -1533,7 +1590,7 @@ const PostForm: React.FC<{
                 {imageItems.map((item, idx) => (
                   <div key={item.id || item.serverUrl || idx} className="post-form-image-item">
                     <img
-                      src={(item.id && blobUrlsRef.current.get(item.id)) || getPostImageSrc(item.serverUrl)}
+                      src={(item.id && blobUrlsRef.current.get(item.id)) || getPostImageSrc(item.serverUrl, 640)}
                       alt={`Preview ${idx + 1}`}
                     />
                     <div className="post-form-image-controls">
@@ -1849,6 +1906,38 @@ const CommentForm: React.FC<{
   )
 }
 
+// Comment Thread Component (댓글 + 답글 트리, 펼치지 않은 답글은 버튼으로 이어서 로드)
+const CommentThread: React.FC<{
+  node: CommentTreeNode
+  postId: number
+  onReply?: () => void
+  onLoadMoreReplies: (node: CommentTreeNode) => void
+}> = ({ node, postId, onReply, onLoadMoreReplies }) => {
+  const remaining = node.reply_count - node.replies.length
+  return (
+    <div>
+      <CommentItem comment={node} postId={postId} onReply={onReply} />
+      {(node.replies.length > 0 || remaining > 0) && (
+        <div className="comment-replies">
+          {node.replies.map((reply) => (
+            <CommentThread
+              key={reply.id}
+              node={reply}
+              postId={postId}
+              onLoadMoreReplies={onLoadMoreReplies}
+            />
+          ))}
+          {remaining > 0 && (
+            <button className="more-replies-btn" onClick={() => onLoadMoreReplies(node)}>
+              Show {remaining} more {remaining > 1 ? 'replies' : 'reply'}
+            </button>
+          )}
+        </div>
+      )}
+    </div>
+  )
+}
+
 // Comment Item Component
 const CommentItem: React.FC<{ comment: Comment; postId: number; onReply?: () => void }> = ({ comment, postId, onReply }) => {
   const [showReplyForm, setShowReplyForm] = useState(false)
@@ -127,17 +127,18 @@ const Home: React.FC = () => {
   ]
 
   useEffect(() => {
-    loadBanners()
-    loadPinnedNotices()
-    loadCalendarEventDates()
+    loadHome()
   }, [])
 
-  const loadCalendarEventDates = async () => {
+  // 배너/고정 공지/캘린더 날짜를 /public/home 한 번으로 조회
+  const loadHome = async () => {
     try {
-      const { dates } = await publicApi.getCalendarEventDates()
-      setCalendarEventDates(new Set(dates || []))
-    } catch {
-      setCalendarEventDates(new Set())
+      const data = await publicApi.getHome()
+      setBanners(data.banners || [])
+      setPinnedNotices(data.pinned_notices || [])
+      setCalendarEventDates(new Set(data.calendar_event_dates || []))
+    } catch (err) {
+      console.error('Error loading home data:', err)
     }
   }
 
@@ -161,30 +162,13 @@ const Home: React.FC = () => {
     return () => clearInterval(interval)
   }, [])
 
-  const loadBanners = async () => {
-    try {
-      const data = await publicApi.getBanners()
-      setBanners(data)
-    } catch (err) {
-      console.error('Error loading banners:', err)
-    }
-  }
-
-  const loadPinnedNotices = async () => {
-    try {
-      const data = await publicApi.getPinnedNotices()
-      setPinnedNotices(data || [])
-    } catch (err) {
-      console.error('Error loading pinned notices:', err)
-    }
-  }
-
 
   const apiBase = getApiBase()
   const getImageUrl = (url: string): string => {
     if (!url) return ''
     if (url.startsWith('http://') || url.startsWith('https://')) return url
-    if (url.startsWith('/admin/upload/image/')) return `${apiBase}${url}`
+    // 배너는 화면 폭 이미지이므로 원본 대신 1920px 변형 요청
+    if (url.startsWith('/admin/upload/image/')) return `${apiBase}${url}?w=1920`
     return url
   }
 
@@ -182,7 +182,27 @@ export interface PinnedNotice {
   created_at: string
 }
 
+export interface HomeSectionMeta {
+  etag: string
+  updated_at: string | null
+}
+
+export interface HomeData {
+  banners: Banner[]
+  workspace_courses: Course[]
+  page_sections: any[]
+  pinned_notices: PinnedNotice[]
+  calendar_event_dates: string[]
+  popular_posts: Post[]
+  meta: Record<string, HomeSectionMeta>
+}
+
 export const publicApi = {
+  // 홈 화면 데이터 한 번에 (배너/고정 공지/캘린더 날짜 등)
+  getHome: async (): Promise<HomeData> => {
+    const response = await apiClient.get('/public/home')
+    return response.data
+  },
   getBanners: async (): Promise<Banner[]> => {
     const response = await apiClient.get('/public/banners')
     return response.data
@@ -218,6 +238,7 @@ export interface Post {
   tags: Array<{ id: number; name: string }>
   mentions: Array<{ mentioned_email: string; mentioned_name?: string }>
   comment_count: number
+  search_snippet?: string | null
 }
 
 export interface Comment {
@@ -232,11 +253,30 @@ export interface Comment {
   mentions: Array<{ mentioned_email: string; mentioned_name?: string }>
 }
 
+export interface CommentTreeNode extends Comment {
+  reply_count: number
+  replies: CommentTreeNode[]
+  // reply_count > replies.length면 나머지는 getCommentReplies(id, replies_cursor)로 (replies가 비어 있으면 cursor 없이)
+  replies_cursor?: string | null
+}
+
+export interface CommentTreeResponse {
+  comments: CommentTreeNode[]
+  next_cursor?: string | null
+  total: number
+}
+
 export interface PostListResponse {
   posts: Post[]
   total: number
   page: number
   page_size: number
+  next_cursor?: string | null
+  total_is_estimate?: boolean
+}
+
+export interface MentionedPostListResponse extends PostListResponse {
+  unread_post_ids: number[]  // 이 페이지 중 안 읽은 멘션이 있는 게시글
 }
 
 export interface Tag {
@@ -256,6 +296,9 @@ export const communityApi = {
     search?: string
     page?: number
     page_size?: number
+    cursor?: string
+    use_cursor?: boolean
+    include_total?: boolean
   }, adminToken?: string): Promise<PostListResponse> => {
     const token = adminToken || getAuthToken()
     const response = await apiClient.get('/community/posts', {
@@ -329,6 +372,21 @@ export const communityApi = {
     const response = await apiClient.get(`/community/posts/${postId}/comments`)
     return response.data
   },
+
+  // 최상위 댓글 커서 페이지 + 답글 트리 (깊거나 많은 답글은 getCommentReplies로 이어서)
+  getCommentTree: async (postId: number, cursor?: string | null): Promise<CommentTreeResponse> => {
+    const response = await apiClient.get(`/community/posts/${postId}/comments/tree`, {
+      params: cursor ? { cursor } : undefined
+    })
+    return response.data
+  },
+
+  getCommentReplies: async (commentId: number, cursor?: string | null): Promise<CommentTreeResponse> => {
+    const response = await apiClient.get(`/community/comments/${commentId}/replies`, {
+      params: cursor ? { cursor } : undefined
+    })
+    return response.data
+  },
   
   createComment: async (postId: number, comment: {
     content: string
@@ -371,7 +429,7 @@ export const communityApi = {
     return response.data
   },
   
-  getMentionedPosts: async (page: number = 1, pageSize: number = 20): Promise<PostListResponse> => {
+  getMentionedPosts: async (page: number = 1, pageSize: number = 20): Promise<MentionedPostListResponse> => {
     const token = getAuthToken()
     if (!token) {
       throw new Error('Authentication required')
@@ -381,6 +439,29 @@ export const communityApi = {
     })
     return response.data
   },
+
+  getMentionUnreadCount: async (): Promise<number> => {
+    const token = getAuthToken()
+    if (!token) {
+      throw new Error('Authentication required')
+    }
+    const response = await apiClient.get('/community/mentions/unread-count', {
+      params: { token }
+    })
+    return response.data.unread_count
+  },
+
+  // postIds를 생략하면 전체 읽음 처리. 남은 안 읽은 수 반환
+  markMentionsRead: async (postIds?: number[]): Promise<number> => {
+    const token = getAuthToken()
+    if (!token) {
+      throw new Error('Authentication required')
+    }
+    const response = await apiClient.post('/community/mentions/read', { post_ids: postIds ?? null }, {
+      params: { token }
+    })
+    return response.data.unread_count
+  },
 }
 
 export const driveApi = {